@@ -0,0 +1,74 @@
+"""
+Throughput (líneas/s) del ADF de release notes: el render por línea de antes (re.sub
+encadenados, tres re.findall, dicts armados nodo por nodo y json de la stdlib) contra
+note_paragraph + dumps_adf. Verifica que los dos produzcan el mismo JSON.
+
+    python -m bench.adf_emitter [--lines 20000]
+"""
+import re
+import json
+import time
+import argparse
+from bench.synthetic import release_body
+from release_ai_dashboard import adf_utils
+from release_ai_dashboard.notes_parser import parse_release_notes
+
+BROWSE_URL = "https://televisaunivision.atlassian.net/browse/"
+
+
+def _link(text, url):
+    return {"type": "text", "text": text, "marks": [{"type": "link", "attrs": {"href": url}}]}
+
+
+def _paragraph_like_before(text):
+    tickets = re.findall(r"\[(WEBTV-\d+|CWB-\d+)\]", text)
+    commit_links = re.findall(r"\((https:\/\/github\.com\/[^\s]+\/commit\/[a-f0-9]{7,40})\)", text)
+    pr_links = re.findall(r"\((https:\/\/github\.com\/[^\s]+\/(?:pull|issues)\/\d+)\)", text)
+    clean_text = re.sub(r"\*\*(.*?)\*\*", r"\1", text)
+    clean_text = re.sub(r"\[(WEBTV-\d+|CWB-\d+)\]", "", clean_text)
+    clean_text = re.sub(r"\(https?:\/\/[^\s)]+\)", "", clean_text)
+    clean_text = re.sub(r"https?:\/\/[^\s]+", "", clean_text)
+    clean_text = re.sub(r"[\[\]()]", "", clean_text)
+    clean_text = re.sub(r"^[•\-\.\s:—]+", "", clean_text).strip()
+    if not clean_text.endswith("."):
+        clean_text += "."
+    paragraph = {"type": "paragraph", "content": [{"type": "text", "text": f"• {clean_text} "}]}
+    for t in tickets:
+        paragraph["content"].append(_link(f"🔗 {t}", BROWSE_URL + t))
+    if pr_links:
+        paragraph["content"].append({"type": "text", "text": " – "})
+        paragraph["content"].append(_link("[PR]", pr_links[0]))
+    if commit_links:
+        paragraph["content"].append({"type": "text", "text": " "})
+        paragraph["content"].append(_link("[Code]", commit_links[0]))
+    return paragraph
+
+
+def _lines_per_second(render, dump, lines, runs=3):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        dump({"type": "doc", "version": 1, "content": [render(line) for line in lines]})
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(lines) / best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=20000)
+    args = parser.parse_args()
+
+    lines = [line for line in parse_release_notes(release_body(args.lines)).lines if line.section]
+    before = [_paragraph_like_before(line.text) for line in lines[:200]]
+    after = [adf_utils.note_paragraph(line) for line in lines[:200]]
+    assert json.loads(json.dumps(before)) == json.loads(adf_utils.dumps_adf(after)), "el ADF no coincide"
+
+    old = _lines_per_second(lambda line: _paragraph_like_before(line.text), lambda d: json.dumps(d).encode("utf-8"), lines)
+    new = _lines_per_second(adf_utils.note_paragraph, adf_utils.dumps_adf, lines)
+    encoder = "orjson" if adf_utils.orjson is not None else "json (stdlib)"
+    print(f"{len(lines)} lines: before {old:,.0f} lines/s, after {new:,.0f} lines/s (dumps_adf with {encoder})")
+
+
+if __name__ == "__main__":
+    main()
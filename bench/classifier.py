@@ -0,0 +1,87 @@
+"""
+Clasificación feature/bug de 100k mensajes de commit y 100k resúmenes de tickets:
+los loops any(kw in texto) de antes contra el regex combinado de classifier.
+También cuenta en cuántos textos difieren (los falsos positivos por substring,
+"ui" en "build" o "add" en "address", son la mayoría).
+
+    python -m bench.classifier [--count 100000]
+"""
+import time
+import random
+import argparse
+from release_ai_dashboard.classifier import COMMIT_CLASSIFIER, TICKET_CLASSIFIER
+
+COMMIT_BUG_KEYWORDS = ("fix", "bug", "resolve", "patch", "error", "issue", "correct")
+COMMIT_FEATURE_KEYWORDS = ("add", "implement", "migrate", "refactor", "feature", "create")
+TICKET_FEATURE_KEYWORDS = (
+    "add", "rsc", "migrate", "move", "create", "implement", "profile", "modal", "pill", "tab", "ui", "gate",
+    "flow", "state machine", "component", "split screen", "login", "logout", "subscribe",
+)
+TICKET_BUG_KEYWORDS = ("fix", "bug", "error", "issue", "broken", "not working")
+
+VOCABULARY = (
+    "update build address player video stream ads guide schedule layout header footer button "
+    "carousel analytics tracking consent prefix table suite default"
+).split() + [f"w{n}" for n in range(300)]
+
+
+def _commit_like_before(message):
+    lowered = message.lower()
+    if any(k in lowered for k in COMMIT_BUG_KEYWORDS):
+        return "bug"
+    return "feature"
+
+
+def _ticket_like_before(summary):
+    lowered = summary.lower()
+    if any(k in lowered for k in TICKET_FEATURE_KEYWORDS):
+        return "feature"
+    if any(k in lowered for k in TICKET_BUG_KEYWORDS):
+        return "bug"
+    return "feature"
+
+
+def _commit_messages(rng, count):
+    prefixes = ("feat", "fix", "chore", "refactor", "perf", "docs", "test", "build", "ci")
+    keywords = COMMIT_BUG_KEYWORDS + COMMIT_FEATURE_KEYWORDS + ("fixed", "resolves", "added")
+    messages = []
+    for i in range(count):
+        words = rng.choices(VOCABULARY, k=rng.randint(6, 14))
+        if rng.random() < 0.5:
+            words.insert(rng.randrange(len(words)), rng.choice(keywords))
+        messages.append(f"{rng.choice(prefixes)}(scope): [CWB-{i}] " + " ".join(words))
+    return messages
+
+
+def _ticket_summaries(rng, count):
+    subjects = ("Player", "Guide", "Schedule", "Build", "Address form", "Table")
+    return [
+        f"{rng.choice(subjects)} " + " ".join(rng.choices(VOCABULARY, k=8))
+        + (" " + rng.choice(TICKET_BUG_KEYWORDS) if rng.random() < 0.4 else "")
+        for _ in range(count)
+    ]
+
+
+def _compare(label, texts, before, after):
+    start = time.perf_counter()
+    old = [before(t) for t in texts]
+    old_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    new = [after(t) for t in texts]
+    new_ms = (time.perf_counter() - start) * 1000
+    changed = sum(a != b for a, b in zip(old, new))
+    print(f"{len(texts)} {label}: substring loops {old_ms:.0f} ms, combined regex {new_ms:.0f} ms, {changed} labels differ")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    _compare("commit messages", _commit_messages(rng, args.count), _commit_like_before, COMMIT_CLASSIFIER.classify)
+    _compare("ticket summaries", _ticket_summaries(rng, args.count), _ticket_like_before, TICKET_CLASSIFIER.classify)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Rango de commits grande contra la API REST local (bench.stubs.GithubStub, demora fija por
+request): compare materializado en una lista página por página en serie, como antes,
+contra RestBackend.iter_commits, que recorre las páginas del final hacia atrás con
+prefetch acotado (http_utils.prefetch) y entrega commits mientras bajan las siguientes.
+Mide requests, tiempo hasta clasificar todo y hasta el primer commit clasificado.
+
+    python -m bench.commit_stream [--commits 2500] [--delay 0.08]
+"""
+import io
+import time
+import hashlib
+import argparse
+import tempfile
+import contextlib
+from bench.stubs import GithubStub, serve
+from release_ai_dashboard import cache_utils, github_cache, http_utils, release_utils
+from release_ai_dashboard.range_analysis import classify_commit
+
+REPO_NAME = "televisa-univision/client-web"
+
+
+def _history(count):
+    commits = []
+    for i in range(count + 1):
+        sha = hashlib.sha1(f"commit-{i}".encode("utf-8")).hexdigest()
+        message = "chore: bump dependencies" if i % 4 == 3 else f"feat: [CWB-{i}] change {i}"
+        commits.append((sha, message))
+    return commits
+
+
+def _like_before(repo, base_sha, head_sha):
+    # compare(...).commits entero en memoria (páginas en serie) y después la clasificación
+    commits = list(repo.compare(base_sha, head_sha, comparison_commits_per_page=release_utils.COMMIT_PAGE_SIZE).commits)
+    for commit in reversed(commits):
+        yield commit.sha, commit.commit.message
+
+
+def _run(commits):
+    """(ms hasta el primer commit clasificado, ms total, registros)."""
+    start = time.perf_counter()
+    first = None
+    records = []
+    for sha, message in commits:
+        record = classify_commit(sha, message)
+        if first is None:
+            first = (time.perf_counter() - start) * 1000
+        if record:
+            records.append(record)
+    return first, (time.perf_counter() - start) * 1000, records
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--commits", type=int, default=2500)
+    parser.add_argument("--delay", type=float, default=0.08)
+    args = parser.parse_args()
+
+    commits = _history(args.commits)
+    base_sha, head_sha = commits[0][0], commits[-1][0]
+    GithubStub.load(commits, {"v1.0.0": base_sha, "v1.1.0": head_sha})
+    GithubStub.delay = args.delay
+    server, base_url = serve(GithubStub)
+    github_cache.GITHUB_API_URL = base_url
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache_utils.CACHE_DIR = cache_dir
+        backend = release_utils.RestBackend("token", REPO_NAME)
+        results = {}
+        for name, stream in (
+            ("before", lambda: _like_before(backend.repo, base_sha, head_sha)),
+            ("after", lambda: backend.iter_commits(base_sha, head_sha)),
+        ):
+            GithubStub.requests = 0
+            with contextlib.redirect_stdout(io.StringIO()):
+                results[name] = _run(stream()) + (GithubStub.requests,)
+    server.shutdown()
+
+    before, after = results["before"][2], results["after"][2]
+    assert [r["sha"] for r in before] == [r["sha"] for r in after], "los commits no coinciden"
+    print(f"{args.commits:,}-commit range, {args.delay * 1000:.0f} ms per request, "
+          f"prefetch depth {http_utils.HTTP_PREFETCH_PAGES}:")
+    for name, (first, total, records, requests) in results.items():
+        print(f"  {name:6s} {requests:3d} GETs  {total:7.0f} ms total  {first:7.0f} ms to the first commit")
+
+
+if __name__ == "__main__":
+    main()
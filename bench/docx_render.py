@@ -0,0 +1,113 @@
+"""
+Throughput (docs/s) de los cuatro generadores de Word sobre docx_template: better_word
+(main), professional (gpt_utils), texto plano (word_utils) y el documento estructurado
+(document_generator_ai), con datos sintéticos y sin llamadas a OpenAI. Como referencia
+mide también Document() vacío y guardado, el piso de python-docx sin plantillas.
+Con --budget-ms sale con código 1 si el documento estructurado tarda más que eso
+(objetivo: 2000 filas de tickets muy por debajo de un segundo).
+
+    python -m bench.docx_render [--rows 60] [--seconds 2]
+    python -m bench.docx_render --rows 2000 --budget-ms 1000
+"""
+import os
+import io
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+
+# Los generadores no llaman a OpenAI, pero main crea el cliente al importarse.
+os.environ.setdefault("OPENAI_API_KEY", "bench-offline")
+
+from docx import Document
+from release_ai_dashboard import gpt_utils, word_utils, document_generator_ai
+from release_ai_dashboard.models import Ticket, ReleaseItem
+import main as release_main
+
+BROWSE_URL = "https://televisaunivision.atlassian.net/browse/"
+
+
+def _inputs(rows):
+    tickets = [
+        Ticket(key=f"CWB-{i}", summary=f"Change {i}", status="Done", url=f"{BROWSE_URL}CWB-{i}")
+        for i in range(rows)
+    ]
+    markdown = (
+        ["Features"] + [f"- [CWB-{i}] feat: change {i}" for i in range(rows)]
+        + ["bug fixes", "- [WEBTV-1] fix player", "known issues", "nothing"]
+    )
+    professional = (
+        "# Overview\n## Changes\n"
+        + "\n".join(f"- [CWB-{i}]({BROWSE_URL}CWB-{i}): description {i}" for i in range(rows))
+        + "\n\n### Notes\n- plain bullet\ntext line"
+    )
+    text = "# Title\n## Sub\n" + "\n".join(f"line {i}" for i in range(rows))
+    structured = {
+        "project_name": "Web", "version": "v1.2.0", "release_date": "2025-01-01", "prepared_by": "QA",
+        "summary": ["Added profile page"], "checklist": ["Tests passed"], "stakeholders": ["Owner: QA"],
+        "details": [
+            ReleaseItem(type="feature", title=f"Change {i}", description=f"desc {i}", ticket_id=f"CWB-{i}", status="Done")
+            for i in range(rows)
+        ],
+        "known_issues": ["none"], "links": [("Docs", "https://docs.example.com/release")],
+    }
+    return tickets, markdown, professional, text, structured
+
+
+def _generators(rows, out_dir):
+    tickets, markdown, professional, text, structured = _inputs(rows)
+    return {
+        "empty Document()": lambda: Document().save(os.path.join(out_dir, "empty.docx")),
+        "better_word": lambda: release_main.generate_better_word(
+            markdown, os.path.join(out_dir, "better.docx"), tickets, "v1.2.0", "2025-01-01", "QA"
+        ),
+        "professional": lambda: gpt_utils.generate_professional_word("v1.2.0", professional, out_dir),
+        "plain_text": lambda: word_utils.save_word_from_text(text, os.path.join(out_dir, "text.docx")),
+        "structured": lambda: document_generator_ai.generate_structured_release_doc("structured.docx", structured),
+    }
+
+
+def _docs_per_second(render, seconds):
+    render()  # arma la plantilla del hilo
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        render()
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=60)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        cwd = os.getcwd()
+        os.chdir(out_dir)  # el documento estructurado se guarda en static/
+        os.makedirs("static", exist_ok=True)
+        try:
+            results = {}
+            for name, render in _generators(args.rows, out_dir).items():
+                with contextlib.redirect_stdout(io.StringIO()):
+                    results[name] = _docs_per_second(render, args.seconds)
+        finally:
+            os.chdir(cwd)
+
+    print(f"{args.rows} rows per document:")
+    for name, rate in results.items():
+        print(f"  {name:17s} {rate:8.1f} docs/s  ({1000 / rate:7.1f} ms/doc)")
+
+    if args.budget_ms is not None:
+        structured_ms = 1000 / results["structured"]
+        if structured_ms >= args.budget_ms:
+            print(f"❌ structured: {structured_ms:.1f} ms/doc, over the {args.budget_ms:.0f} ms budget")
+            sys.exit(1)
+        print(f"✅ structured: {structured_ms:.1f} ms/doc, within the {args.budget_ms:.0f} ms budget")
+
+
+if __name__ == "__main__":
+    main()
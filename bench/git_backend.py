@@ -0,0 +1,138 @@
+"""
+Descubrimiento de tags y commits de un rango: GitBackend sobre un repo sintético de 10k
+commits (git fast-import, 13 tags) contra RestBackend sobre un stub de la API REST con
+el mismo historial (demora fija por request). Todo offline; verifica que los dos
+backends den los mismos tickets.
+
+    python -m bench.git_backend [--commits 10000] [--delay 0.05]
+"""
+import os
+import io
+import time
+import argparse
+import tempfile
+import subprocess
+import contextlib
+from bench.stubs import GithubStub, serve
+from release_ai_dashboard import cache_utils, git_local, github_cache, release_utils, tag_index
+from release_ai_dashboard.range_analysis import classify_commit
+
+REPO_NAME = "televisa-univision/client-web"
+RANGES = (("v1.10.0-beta.1", "v1.9.0"), ("v1.10.0", "v1.1.0"))
+
+
+def _message(i):
+    if i % 4 == 3:
+        return "chore: bump dependencies"
+    return f"{'fix' if i % 5 == 0 else 'feat'}: [CWB-{i}] change {i}"
+
+
+def _tag_positions(count):
+    # v1.1.0 ... v1.10.0 cada count/10 commits (v1.10.0 es el último), v1.0.0 a la mitad
+    # del primer tramo y beta.1 / rc.1 entre v1.9.0 y v1.10.0
+    step = count // 10
+    tags = {"v1.0.0": step // 2 - 1}
+    for minor in range(1, 10):
+        tags[f"v1.{minor}.0"] = step * minor - 1
+    tags["v1.10.0-beta.1"] = step * 9 - 1 + step * 2 // 5
+    tags["v1.10.0-rc.1"] = step * 9 - 1 + step * 7 // 10
+    tags["v1.10.0"] = count - 1
+    return tags
+
+
+def _build_repo(path, count):
+    """Repo bare con `count` commits lineales y tags livianos; devuelve [(sha, message)] y {tag: sha}."""
+    subprocess.run(["git", "init", "--quiet", "--bare", path], check=True)
+    subprocess.run(["git", "-C", path, "config", "uploadpack.allowFilter", "true"], check=True)
+    stream = io.StringIO()
+    for i in range(count):
+        message = _message(i)
+        stream.write(f"commit refs/heads/main\nmark :{i + 1}\n")
+        stream.write(f"committer Bench <bench@example.com> {1700000000 + i * 60} +0000\n")
+        stream.write(f"data {len(message.encode('utf-8'))}\n{message}\n")
+        if i:
+            stream.write(f"from :{i}\n")
+        stream.write("\n")
+    positions = _tag_positions(count)
+    for tag, position in positions.items():
+        stream.write(f"reset refs/tags/{tag}\nfrom :{position + 1}\n\n")
+    subprocess.run(["git", "-C", path, "fast-import", "--quiet"], input=stream.getvalue(), text=True, check=True)
+
+    shas = subprocess.run(
+        ["git", "-C", path, "rev-list", "--reverse", "main"], capture_output=True, text=True, check=True
+    ).stdout.split()
+    commits = [(sha, _message(i)) for i, sha in enumerate(shas)]
+    return commits, {tag: shas[position] for tag, position in positions.items()}
+
+
+def _fresh_caches(cache_dir):
+    # Índice de tags y cache HTTP vacíos: cada backend arranca en frío
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_utils.CACHE_DIR = cache_dir
+    tag_index._indexes.clear()
+    github_cache._conn = None
+
+
+def _run(backend, tag, base_tag):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        head_sha, _, base_sha = backend.resolve(tag, base_tag)
+        records = [
+            record for record in (classify_commit(sha, message) for sha, message in backend.iter_commits(base_sha, head_sha))
+            if record
+        ]
+    return (time.perf_counter() - start) * 1000, records
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--commits", type=int, default=10000)
+    parser.add_argument("--delay", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = os.path.join(tmp, REPO_NAME)
+        start = time.perf_counter()
+        commits, tags = _build_repo(repo_path, args.commits)
+        print(f"Synthetic repo: {len(commits):,} commits, {len(tags)} tags "
+              f"({(time.perf_counter() - start) * 1000:.0f} ms with fast-import)")
+
+        GithubStub.load(commits, tags)
+        GithubStub.delay = args.delay
+        server, base_url = serve(GithubStub)
+        github_cache.GITHUB_API_URL = base_url
+
+        for tag, base_tag in RANGES:
+            _fresh_caches(os.path.join(tmp, f"git-{tag}"))
+            git = git_local.GitBackend(REPO_NAME, path=repo_path)
+            git_cold, git_records = _run(git, tag, base_tag)
+            git_warm, _ = _run(git, tag, base_tag)
+
+            _fresh_caches(os.path.join(tmp, f"rest-{tag}"))
+            GithubStub.requests = 0
+            rest = release_utils.RestBackend("token", REPO_NAME)
+            rest_cold, rest_records = _run(rest, tag, base_tag)
+            cold_requests = GithubStub.requests
+            rest_warm, _ = _run(rest, tag, base_tag)
+
+            assert [r["tickets"] for r in git_records] == [r["tickets"] for r in rest_records], "los backends no coinciden"
+            print(f"{base_tag}..{tag} ({len(git_records):,} commits with tickets):")
+            print(f"  git   {git_cold:8.0f} ms cold  {git_warm:8.0f} ms warm")
+            print(f"  REST  {rest_cold:8.0f} ms cold  {rest_warm:8.0f} ms warm  "
+                  f"({cold_requests} GETs cold, {GithubStub.requests - cold_requests} warm; {args.delay * 1000:.0f} ms each)")
+
+        # Sin checkout: clone sin blobs desde file:// en el cache (lo que hace GIT_REPO_URL)
+        tag, base_tag = RANGES[-1]
+        _fresh_caches(os.path.join(tmp, "clone"))
+        git_local.GIT_REPO_URL = f"file://{repo_path}"
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            clone = git_local.GitBackend(REPO_NAME)
+        clone_ms = (time.perf_counter() - start) * 1000
+        clone_run, _ = _run(clone, tag, base_tag)
+        print(f"{base_tag}..{tag} from a blob:none file:// clone: {clone_ms:.0f} ms clone + {clone_run:.0f} ms")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Enriquecimiento de tickets contra un Jira local (demora fija por request):
+GET por ticket en serie con requests.get (como antes de http_utils), GET por ticket
+en el pool compartido y búsqueda JQL en bloque.
+
+    python -m bench.jira_transport [--delay 0.02] [--sizes 10,100,500]
+"""
+import re
+import time
+import argparse
+import requests
+from bench.stubs import JsonHandler, serve
+from release_ai_dashboard import fetchers, http_utils
+
+
+def _fields(key):
+    return {"summary": f"Summary {key}", "status": {"name": "Done"}, "customfield_10014": None,
+            "updated": "2026-01-01T00:00:00.000+0000"}
+
+
+class JiraStub(JsonHandler):
+    def do_GET(self):
+        key = re.search(r"/issue/([A-Z]+-\d+)", self.path).group(1)
+        self.send_json(200, {"key": key, "fields": _fields(key)})
+
+    def do_POST(self):
+        keys = re.findall(r"[A-Z]+-\d+", self.read_json().get("jql", ""))
+        self.send_json(200, {"issues": [{"key": k, "fields": _fields(k)} for k in keys]})
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--delay", type=float, default=0.02)
+    parser.add_argument("--sizes", default="10,100,500")
+    args = parser.parse_args()
+
+    JiraStub.delay = args.delay
+    server, base_url = serve(JiraStub)
+    fetchers.JIRA_URL = base_url
+
+    print(f"{'tickets':>8}  {'serial GET':>11}  {'pooled GET':>11}  {'bulk search':>11}")
+    for size in map(int, args.sizes.split(",")):
+        keys = [f"CWB-{10000 + i}" for i in range(size)]
+        serial = _timed(lambda: [requests.get(f"{base_url}/rest/api/3/issue/{k}").json() for k in keys])
+        pooled = _timed(lambda: http_utils.map_concurrently(fetchers.fetch_jira_ticket_details, keys))
+        bulk = _timed(lambda: fetchers.fetch_jira_tickets_details(keys, base_url=base_url, use_cache=False))
+        print(f"{size:>8}  {serial:>8.0f} ms  {pooled:>8.0f} ms  {bulk:>8.0f} ms")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Parseo de release notes: los recorridos que hacía cada consumidor por su cuenta
+(extract_sections, las dos copias de parse_github_release_notes, las dos de
+build_rich_adf_description y el clasificador de create_jira_issue) contra un solo
+parse_release_notes compartido.
+
+    python -m bench.notes_parser [--lines 10000]
+"""
+import re
+import time
+import argparse
+from bench.synthetic import release_body
+from release_ai_dashboard.notes_parser import parse_release_notes, release_items
+
+
+def _scan_like_before(body):
+    # Cada consumidor recorría el body con lower()/in y regex sin compilar
+    for _ in range(5):
+        section = None
+        for line in body.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            lowered = line.lower()
+            if "features" in lowered:
+                section = "feature"
+                continue
+            if "bug fixes" in lowered:
+                section = "bug"
+                continue
+            re.search(r"\b([A-Z]+-\d+)\b", line)
+            re.findall(r"\[(WEBTV-\d+|CWB-\d+)\]", line)
+            re.findall(r"\((https:\/\/github\.com\/[^\s]+\/commit\/[a-f0-9]{7,40})\)", line)
+            re.findall(r"\((https:\/\/github\.com\/[^\s]+\/issues\/\d+)\)", line)
+    return section
+
+
+def _parse_once(body):
+    parse_release_notes.cache_clear()
+    parsed = parse_release_notes(body)
+    release_items(parsed)
+    parsed.section("feature")
+    parsed.section("bug")
+    return parsed.section_by_ticket
+
+
+def _best_of(fn, body, runs=3):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(body)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=10000)
+    args = parser.parse_args()
+
+    body = release_body(args.lines)
+    before = _best_of(_scan_like_before, body)
+    after = _best_of(_parse_once, body)
+    print(f"{args.lines} lines: five per-consumer scans {before:.0f} ms, one shared parse {after:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Backfill de un release con 10k items: la lista de dicts de antes contra ReleaseItem
+(frozen + __slots__), con los mismos strings, en memoria y tiempo de armado. Después el
+resto del camino de store_release con los records: status de Jira en bloque contra un
+Jira local (bench.stubs), guardar, leer y diff contra el release anterior.
+
+    python -m bench.records_backfill [--items 10000] [--delay 0.02]
+"""
+import gc
+import time
+import argparse
+import tempfile
+import tracemalloc
+from bench.synthetic import release_body
+from bench.stubs import serve
+from bench.jira_transport import JiraStub
+from release_ai_dashboard import cache_utils, fetchers, release_store
+from release_ai_dashboard.models import Release, ReleaseItem
+from release_ai_dashboard.notes_parser import parse_release_notes, release_items
+
+
+def _dicts(rows):
+    # Como antes: un dict por item, con las claves que iba agregando cada consumidor
+    return [{"type": t, "title": title, "description": d, "ticket_id": k, "status": ""} for t, title, d, k in rows]
+
+
+def _records(rows):
+    return [ReleaseItem(t, title, d, k) for t, title, d, k in rows]
+
+
+def _measure(build, rows):
+    """(lista, KiB que ocupa, ms del mejor de 3 armados). Los strings son los mismos en los dos casos."""
+    gc.collect()
+    tracemalloc.start()
+    items = build(rows)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        build(rows)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return items, size / 1024, best
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--delay", type=float, default=0.02)
+    args = parser.parse_args()
+
+    body = release_body(args.items)
+    rows = [(i.type, i.title, i.description, i.ticket_id) for i in release_items(parse_release_notes(body))]
+    _, dict_kib, dict_ms = _measure(_dicts, rows)
+    items, item_kib, item_ms = _measure(_records, rows)
+    print(f"{len(items):,} items: dicts {dict_kib:,.0f} KiB / {dict_ms:.1f} ms, "
+          f"ReleaseItem {item_kib:,.0f} KiB / {item_ms:.1f} ms")
+
+    JiraStub.delay = args.delay
+    server, base_url = serve(JiraStub)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache_utils.CACHE_DIR = cache_dir
+        ticket_ids = [i.ticket_id for i in items]
+
+        # Igual que app.store_release: status real de Jira en bloque y un Release nuevo
+        def with_statuses():
+            tickets, _ = fetchers.fetch_jira_tickets_details(ticket_ids, base_url=base_url, use_cache=False)
+            statuses = {t.key: t.status for t in tickets}
+            return [item.with_status(statuses.get(item.ticket_id, "")) for item in items]
+
+        JiraStub.requests = 0
+        updated, status_ms = _timed(with_statuses)
+        current = Release(version="v1.200.0", body=body, items=tuple(updated))
+        # Anterior: sin el último 10% de los items y con el status viejo
+        previous = Release(version="v1.199.0", items=tuple(items[: len(items) * 9 // 10]))
+
+        _, save_ms = _timed(lambda: (release_store.save_release(previous), release_store.save_release(current)))
+        (loaded_a, loaded_b), load_ms = _timed(
+            lambda: (release_store.get_release("v1.199.0"), release_store.get_release("v1.200.0"))
+        )
+        diff, diff_ms = _timed(lambda: release_store.diff_releases(loaded_a, loaded_b))
+    server.shutdown()
+
+    print(f"  status update {status_ms:6.0f} ms ({JiraStub.requests} Jira searches, {args.delay * 1000:.0f} ms each)")
+    print(f"  save x2       {save_ms:6.0f} ms")
+    print(f"  load x2       {load_ms:6.0f} ms")
+    print(f"  diff          {diff_ms:6.0f} ms ({len(diff['added']):,} added, {len(diff['status_changes']):,} status changes)")
+    print(f"  total         {status_ms + save_ms + load_ms + diff_ms:6.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, urlencode
+
+# Servidores HTTP locales para los benchmarks: responden JSON con una demora fija
+# por request para simular la latencia de la API real.
+
+
+class JsonHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers y body en un solo write (sin buffer, Nagle + delayed ACK suman ~40 ms)
+    wbufsize = 65536
+    delay = 0.0
+    requests = 0
+
+    def log_message(self, *args):
+        pass
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def parse_request(self):
+        # Se cuenta y se demora cada request antes de despacharlo a do_GET / do_POST
+        type(self).requests += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return super().parse_request()
+
+
+def serve(handler):
+    """Levanta handler en un puerto libre en un hilo daemon; devuelve (server, base_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+class GithubStub(JsonHandler):
+    """
+    API REST de GitHub sobre un historial lineal: `commits` es [(sha, message), ...] del
+    más viejo al más nuevo y `tags` {nombre: sha} en el mismo orden; cada tag tiene su
+    release (listados del más nuevo al más viejo, como GitHub). Sirve lo que piden
+    RestBackend y tag_index: repo, tags, releases, compare y commits paginados.
+    """
+    owner_repo = "televisa-univision/client-web"
+    commits = []
+    tags = {}
+    _positions = None
+
+    @classmethod
+    def load(cls, commits, tags):
+        cls.commits, cls.tags = commits, tags
+        cls._positions = {sha: i for i, (sha, _) in enumerate(commits)}
+
+    def _page(self, items, query):
+        """(página pedida, headers con el Link rel="next"/"last" que usa PaginatedList)."""
+        per_page = int(query.get("per_page", ["30"])[0])
+        page = int(query.get("page", ["1"])[0])
+        last = max(1, -(-len(items) // per_page))
+        links = []
+        if page < last:
+            params = {key: values[0] for key, values in query.items()}
+            for rel, number in (("next", page + 1), ("last", last)):
+                params.update(page=str(number), per_page=str(per_page))
+                links.append(f'<http://{self.headers["Host"]}{urlparse(self.path).path}?{urlencode(params)}>; rel="{rel}"')
+        return items[(page - 1) * per_page:page * per_page], {"Link": ", ".join(links)} if links else {}
+
+    def _commit(self, sha, message):
+        return {"sha": sha, "commit": {"message": message}}
+
+    def _release(self, tag):
+        return {"id": int(self.tags[tag][:8], 16), "tag_name": tag, "body": f"Release {tag}",
+                "published_at": "2026-01-01T00:00:00Z", "updated_at": "2026-01-01T00:00:00Z"}
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        path = url.path.removeprefix(f"/repos/{self.owner_repo}")
+        if path in ("", "/"):
+            self.send_json(200, {"id": 1, "full_name": self.owner_repo, "name": self.owner_repo.split("/")[1]})
+        elif path == "/tags":
+            tags = [{"name": n, "commit": {"sha": s}} for n, s in self.tags.items()]
+            self.send_json(200, *self._page(tags, query))
+        elif path == "/releases":
+            self.send_json(200, *self._page([self._release(t) for t in reversed(list(self.tags))], query))
+        elif path.startswith("/releases/tags/"):
+            tag = path.rsplit("/", 1)[-1]
+            if tag in self.tags:
+                self.send_json(200, self._release(tag))
+            else:
+                self.send_json(404, {"message": "Not Found"})
+        elif path.startswith("/compare/"):
+            base, head = path.removeprefix("/compare/").split("...")
+            start, end = self._positions[base], self._positions[head]
+            commits = [self._commit(*c) for c in self.commits[start + 1:end + 1]]
+            page, headers = self._page(commits, query)
+            self.send_json(200, {"status": "ahead" if start < end else "identical",
+                                 "total_commits": len(commits), "commits": page}, headers)
+        elif path == "/commits":
+            end = self._positions[query["sha"][0]]
+            history = [self._commit(*c) for c in reversed(self.commits[:end + 1])]
+            self.send_json(200, *self._page(history, query))
+        else:
+            self.send_json(404, {"message": "Not Found"})
@@ -0,0 +1,24 @@
+import random
+
+# Datos sintéticos con el formato de las release notes reales (release-please / conventional commits)
+
+SCOPES = ("webapp", "player", "guide", "auth", "ads", "analytics")
+VERBS = ("fix", "add", "improve", "migrate", "remove", "update")
+NOUNS = ("login flow", "video player", "live guide", "paywall", "deep link", "carousel", "consent modal")
+
+
+def release_body(lines, seed=1):
+    """Body de un release con `lines` items repartidos en Features y Bug Fixes."""
+    rng = random.Random(seed)
+    out = ["## [1.200.0](https://github.com/televisa-univision/client-web/compare/v1.199.0...v1.200.0) (2025-06-23)", "", "### Features", ""]
+    for i in range(lines):
+        if i == lines // 2:
+            out += ["", "### Bug Fixes", ""]
+        ticket = f"CWB-{10000 + i}"
+        sha = f"{rng.getrandbits(160):040x}"
+        out.append(
+            f"* **{rng.choice(SCOPES)}:** [{ticket}] {rng.choice(VERBS)} {rng.choice(NOUNS)} on Safari "
+            f"([#{20000 + i}](https://github.com/televisa-univision/client-web/issues/{20000 + i})) "
+            f"([{sha[:7]}](https://github.com/televisa-univision/client-web/commit/{sha}))"
+        )
+    return "\n".join(out)
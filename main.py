@@ -1,18 +1,22 @@
 import os
 import re
-import requests
 import datetime
 from dotenv import load_dotenv
 from requests.auth import HTTPBasicAuth
-from docx import Document
 from docx.shared import Pt, Inches
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
-from github import Github
 from jira import JIRA
 from openai import OpenAI
 from typing import List, Dict
+from release_ai_dashboard import http_utils, ticket_cache, github_cache, release_utils, range_analysis, docx_template
+from release_ai_dashboard.github_cache import get_github
+from release_ai_dashboard.llm_cache import chat_completion
+from release_ai_dashboard.fetchers import fetch_jira_tickets_details as _fetch_jira_tickets_bulk
+from release_ai_dashboard.notes_parser import parse_release_notes, release_items
+from release_ai_dashboard.docx_template import add_hyperlink
+from release_ai_dashboard.adf_utils import note_paragraph, block_card_node, dumps_adf
+from release_ai_dashboard.models import Ticket, ReleaseItem, format_tickets
+from release_ai_dashboard.classifier import TICKET_CLASSIFIER
 
 # === CARGAR VARIABLES DE ENTORNO ===
 load_dotenv()
@@ -29,7 +33,7 @@ JIRA_ISSUE_TYPE = os.getenv("JIRA_ISSUE_TYPE")
 
 
 def fetch_release_notes(tag):
-    g = Github(GITHUB_TOKEN)
+    g = get_github(GITHUB_TOKEN)
     repo = g.get_repo(GITHUB_REPO)
     try:
         release = repo.get_release(tag)
@@ -39,18 +43,19 @@ def fetch_release_notes(tag):
         if release.body and release.body.strip():
             return release.body
 
-        print("⚠️ No hay release notes. Buscando commits relacionados al tag...")
-        tag_obj = repo.get_git_ref(f"tags/{tag}")
-        tag_sha = tag_obj.object.sha
-        tag_commit = repo.get_commit(tag_sha)
-        commits = repo.get_commits(since=tag_commit.commit.author.date)
+        # Sin body: notas armadas con los commits entre el tag anterior y este tag
+        print("⚠️ No hay release notes. Recorriendo los commits desde el tag anterior...")
+        calls_before = release_utils.github_api_calls()
+        backend = release_utils.get_backend(GITHUB_TOKEN, GITHUB_REPO)
+        current_sha, prev_tag, prev_sha = backend.resolve(tag)
+        records = range_analysis.analyze_range(backend, GITHUB_REPO, tag, current_sha, prev_tag, prev_sha)
+        print(f"📡 {prev_tag or 'historial'}..{tag}: {len(records)} commits con tickets, "
+              f"{release_utils.github_api_calls() - calls_before} llamadas a la API")
 
-        release_notes = ""
-        for commit in commits:
-            if tag in commit.commit.message:
-                release_notes += f"- {commit.commit.message}\n"
-
-        return release_notes or f"No release notes or matching commits found for tag {tag}."
+        if not records:
+            return f"No release notes or matching commits found for tag {tag}."
+        release_notes, _ = release_utils.build_release_body(records)
+        return release_notes
 
     except Exception as e:
         print("❌ Error al obtener el release de GitHub:", str(e))
@@ -58,23 +63,10 @@ def fetch_release_notes(tag):
 
 
 def extract_sections(content):
-    bug_fixes, known_issues, other_lines = [], [], []
-    current_section = None
-    for line in content.splitlines():
-        stripped = line.strip().lower()
-        if "bug fixes" in stripped:
-            current_section = "bug"
-        elif "known issues" in stripped:
-            current_section = "issues"
-        elif not stripped:
-            continue
-        else:
-            if current_section == "bug":
-                bug_fixes.append(line)
-            elif current_section == "issues":
-                known_issues.append(line)
-            else:
-                other_lines.append(line)
+    parsed = parse_release_notes(content)
+    bug_fixes = [line.text for line in parsed.section("bug")]
+    known_issues = [line.text for line in parsed.section("known_issues")]
+    other_lines = [line.text for line in parsed.lines if line.section not in ("bug", "known_issues")]
     return bug_fixes, known_issues, other_lines
 
 
@@ -82,24 +74,15 @@ def fetch_jira_ticket_details(ticket_id):
     url = f"{JIRA_URL}/rest/api/3/issue/{ticket_id}"
     auth = HTTPBasicAuth(JIRA_EMAIL, JIRA_TOKEN)
     headers = {"Accept": "application/json"}
-    response = requests.get(url, headers=headers, auth=auth)
+    response = http_utils.get(url, headers=headers, auth=auth)
     if response.status_code == 200:
         data = response.json()
-        fields = data["fields"]
-        return {
-            "id": ticket_id,
-            "summary": fields.get("summary", ""),
-            "status": fields.get("status", {}).get("name", ""),
-            "url": f"{JIRA_URL}/browse/{ticket_id}",
-            "epic": fields.get("customfield_10014", "Other") or "Other"
-        }
-    return {
-        "id": ticket_id,
-        "summary": "No encontrado",
-        "status": "Desconocido",
-        "url": f"{JIRA_URL}/browse/{ticket_id}",
-        "epic": "Other"
-    }
+        return Ticket.from_jira(ticket_id, data["fields"], JIRA_URL)
+    return Ticket(key=ticket_id, summary="No encontrado", status="Desconocido", url=f"{JIRA_URL}/browse/{ticket_id}")
+
+def fetch_jira_tickets_details(ticket_ids):
+    # Misma forma que fetch_jira_ticket_details, pero con búsquedas JQL en bloque
+    return _fetch_jira_tickets_bulk(ticket_ids, base_url=JIRA_URL, email=JIRA_EMAIL, token=JIRA_TOKEN)
 
 def build_rich_adf_description(release_body, tickets, summary_text=None):
     import re
@@ -120,39 +103,22 @@ def build_rich_adf_description(release_body, tickets, summary_text=None):
         "content": [{"type": "text", "text": "📦 Release Notes"}]
     })
 
+    parsed = parse_release_notes(release_body or "")
+
     # Optional compare URL
-    first_line = release_body.splitlines()[0] if release_body else ""
-    match = re.search(r"\[(.*?)\]\((https:\/\/github\.com\/[^)]+)\)\s*\((\d{4}-\d{2}-\d{2})\)", first_line)
-    if match:
-        _, compare_url, date = match.groups()
+    if parsed.compare_url:
         content.append({
             "type": "paragraph",
             "content": [
                 {"type": "text", "text": "🔍 "},
-                make_link("View Code Changes", compare_url),
-                {"type": "text", "text": f" – {date}"}
+                make_link("View Code Changes", parsed.compare_url),
+                {"type": "text", "text": f" – {parsed.compare_date}"}
             ]
         })
 
-    # Extract sections
-    lines = release_body.splitlines()
-    features, bugs = [], []
-    current = None
-
-    for line in lines:
-        line = line.strip()
-        if not line or line == first_line:
-            continue
-        if line.lower().startswith("### features"):
-            current = "features"
-            continue
-        elif line.lower().startswith("### bug fixes"):
-            current = "bugs"
-            continue
-        if current == "features":
-            features.append(line)
-        elif current == "bugs":
-            bugs.append(line)
+    # Sections (ya parseadas)
+    features = parsed.section("feature")
+    bugs = parsed.section("bug")
 
     def render_section(title, lines):
         content.append({
@@ -162,52 +128,14 @@ def build_rich_adf_description(release_body, tickets, summary_text=None):
         })
 
         for line in lines:
-            paragraph = {"type": "paragraph", "content": []}
-
-            ticket_matches = re.findall(r"\[(WEBTV-\d+|CWB-\d+)\]", line)
-            commit_links = re.findall(r"\((https:\/\/github\.com\/[^\s]+\/commit\/[a-f0-9]{7,40})\)", line)
-            pr_links = re.findall(r"\((https:\/\/github\.com\/[^\s]+\/issues\/\d+)\)", line)
-
-            # Clean visible text
-            clean_text = re.sub(r"\*\*(.*?)\*\*", r"\1", line)
-            clean_text = re.sub(r"\[(WEBTV-\d+|CWB-\d+)\]", "", clean_text)
-            clean_text = re.sub(r"\(https?:\/\/[^\s)]+\)", "", clean_text)
-            clean_text = re.sub(r"https?:\/\/[^\s]+", "", clean_text)
-            clean_text = re.sub(r"\(\s*\[+\s*\]+\s*\)", "", clean_text)
-            clean_text = re.sub(r"[\[\]()]", "", clean_text)
-            clean_text = re.sub(r"^[•\-\.\s:—]+", "", clean_text).strip()
-
-            if not clean_text:
+            paragraph = note_paragraph(line)
+            if paragraph is None:
                 continue
-
-            if not clean_text.endswith("."):
-                clean_text += "."
-
-            paragraph["content"].append({"type": "text", "text": f"• {clean_text} "})
-
-            # Add ticket links
-            if ticket_matches:
-                for t in ticket_matches:
-                    paragraph["content"].append(make_link(f"🔗 {t}", f"https://televisaunivision.atlassian.net/browse/{t}"))
-
-            # Add PR/commit links
-            if pr_links:
-                paragraph["content"].append({"type": "text", "text": " – "})
-                paragraph["content"].append(make_link("[PR]", pr_links[0]))
-            if commit_links:
-                paragraph["content"].append({"type": "text", "text": " "})
-                paragraph["content"].append(make_link("[Code]", commit_links[0]))
-
             content.append(paragraph)
 
             # Optional blockCard
-            for t in ticket_matches:
-                content.append({
-                    "type": "blockCard",
-                    "attrs": {
-                        "url": f"https://televisaunivision.atlassian.net/browse/{t}"
-                    }
-                })
+            for t in line.ticket_ids:
+                content.append(block_card_node(t))
 
     if features:
         render_section("🚀 Features", features)
@@ -330,56 +258,14 @@ def parse_github_release_notes(release_notes):
     Transforma el release.body plano de GitHub en una lista estructurada
     para usarla en generate_friendly_summary y otras funciones.
     """
-    import re
-
-    structured = []
-    lines = release_notes.splitlines()
-
-    current_section = None  # puede ser "feature" o "bug"
-
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
+    return release_items(parse_release_notes(release_notes))
 
-        # Detectar sección (Features o Bug Fixes)
-        if "features" in line.lower():
-            current_section = "feature"
-            continue
-        elif "bug fixes" in line.lower():
-            current_section = "bug"
-            continue
-
-        # Saltar líneas de encabezado
-        if line.startswith("#"):
-            continue
-
-        # Extrae el ticket si hay
-        match = re.search(r'\b([A-Z]+-\d+)\b', line)
-        ticket_id = match.group(1) if match else "UNKNOWN"
-
-        # Si no hay sección detectada, hacer heurística
-        l = line.lower()
-        if current_section:
-            item_type = current_section
-        elif any(w in l for w in ['fix', 'bug', 'resolve']):
-            item_type = 'bug'
-        elif any(w in l for w in ['add', 'implement', 'migrate', 'move', 'create', 'remove gate', 'rsc']):
-            item_type = 'feature'
-        else:
-            item_type = 'feature'
-
-        structured.append({
-            "type": item_type,
-            "title": line[:80],
-            "description": line,
-            "ticket_id": ticket_id
-        })
 
-    return structured
-
-
-def create_jira_issue(summary, adf_description, tickets, release_notes):
+def create_jira_issue(summary, adf_description, tickets, release_notes, items=None):
+    """
+    tickets: lista de Ticket de Jira; items: ReleaseItem ya clasificados (si el
+    llamador los tiene, se usan directo y no se reclasifica nada).
+    """
     url = f"{JIRA_URL}/rest/api/3/issue"
     headers = {"Accept": "application/json", "Content-Type": "application/json"}
     auth = HTTPBasicAuth(JIRA_EMAIL, JIRA_TOKEN)
@@ -387,40 +273,32 @@ def create_jira_issue(summary, adf_description, tickets, release_notes):
     # ✅ Construir structured_release_notes correctamente
     structured_release_notes = []
 
-    if not tickets or len(tickets) < 5:
+    if items is not None:
+        structured_release_notes = list(items)
+    elif not tickets or len(tickets) < 5:
         structured_release_notes = parse_github_release_notes(release_notes)
     else:
+        # La sección de las release notes manda; las palabras clave solo si el ticket no aparece ahí
+        section_by_ticket = parse_release_notes(release_notes or "").section_by_ticket
+
         for ticket in tickets:
-            raw_summary = ticket.get("summary", "").strip()
-            ticket_id = ticket.get("key", ticket.get("id", "")).strip()
+            raw_summary = ticket.summary.strip()
+            ticket_id = ticket.key
             if not ticket_id:
                 continue
 
-            issue_type_raw = raw_summary.lower()
-
-            # Palabras clave para detectar features
-            feature_keywords = [
-                "add", "rsc", "migrate", "move", "create", "implement",
-                "profile", "modal", "pill", "tab", "ui", "gate", "flow",
-                "state machine", "component", "split screen", "login", "logout", "subscribe"
-            ]
-
-            is_feature = any(word in issue_type_raw for word in feature_keywords)
-            is_bug = any(word in issue_type_raw for word in ["fix", "bug", "error", "issue", "broken", "not working"])
-
-            if is_feature:
-                issue_type = "feature"
-            elif is_bug:
-                issue_type = "bug"
+            if ticket_id in section_by_ticket:
+                issue_type = section_by_ticket[ticket_id]
             else:
-                issue_type = "feature"  # Default
+                issue_type = TICKET_CLASSIFIER.classify(raw_summary)  # feature por default
 
-            structured_release_notes.append({
-                "type": issue_type,
-                "title": raw_summary,
-                "description": raw_summary,
-                "ticket_id": ticket_id
-            })
+            structured_release_notes.append(ReleaseItem(
+                type=issue_type,
+                title=raw_summary,
+                description=raw_summary,
+                ticket_id=ticket_id,
+                status=ticket.status
+            ))
 
     # ✅ Generar resumen amigable con GPT-4
     version_tag = summary.replace("Release Document for ", "").strip()
@@ -451,7 +329,7 @@ def create_jira_issue(summary, adf_description, tickets, release_notes):
         }
     }
 
-    response = requests.post(url, headers=headers, auth=auth, json=payload)
+    response = http_utils.post(url, headers=headers, auth=auth, data=dumps_adf(payload))
     if response.status_code == 201:
         key = response.json().get("key")
         print("✅ Ticket creado:", key)
@@ -460,43 +338,27 @@ def create_jira_issue(summary, adf_description, tickets, release_notes):
         print("❌ Error al crear ticket Jira:", response.status_code, response.text)
         return None
 
-def add_hyperlink(paragraph, text, url):
-    part = paragraph.part
-    r_id = part.relate_to(url, "http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink", is_external=True)
-    hyperlink = OxmlElement("w:hyperlink")
-    hyperlink.set(qn("r:id"), r_id)
-
-    new_run = OxmlElement("w:r")
-    rPr = OxmlElement("w:rPr")
-    color = OxmlElement("w:color")
-    color.set(qn("w:val"), "0000FF")
-    rPr.append(color)
-    underline = OxmlElement("w:u")
-    underline.set(qn("w:val"), "single")
-    rPr.append(underline)
-    new_run.append(rPr)
-
-    text_elem = OxmlElement("w:t")
-    text_elem.text = text
-    new_run.append(text_elem)
-    hyperlink.append(new_run)
-    paragraph._p.append(hyperlink)
-
 
-def generate_better_word(markdown_lines, output_path, tickets_info, version_tag, release_date, release_owner):
-    doc = Document()
+@docx_template.template("better_word")
+def _better_word_template(doc):
     title = doc.add_paragraph()
-    title_run = title.add_run(f"📄 Release Management Document - {version_tag}")
+    title_run = title.add_run("📄 Release Management Document - {version_tag}")
     title_run.bold = True
     title_run.font.size = Pt(24)
     title.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
 
     doc.add_paragraph()
-    doc.add_paragraph(f"📦 Release Version: {version_tag}").bold = True
-    doc.add_paragraph(f"📅 Release Date: {release_date}").bold = True
-    doc.add_paragraph(f"👤 Release Owner: {release_owner}").bold = True
+    doc.add_paragraph("📦 Release Version: {version_tag}")
+    doc.add_paragraph("📅 Release Date: {release_date}")
+    doc.add_paragraph("👤 Release Owner: {release_owner}")
     doc.add_paragraph()
 
+
+def generate_better_word(markdown_lines, output_path, tickets_info, version_tag, release_date, release_owner):
+    doc = docx_template.new_document(
+        "better_word", version_tag=version_tag, release_date=release_date, release_owner=release_owner
+    )
+
     summary_added = False
     detail_added = False
     seen_lines = set()
@@ -504,10 +366,10 @@ def generate_better_word(markdown_lines, output_path, tickets_info, version_tag,
     for line in markdown_lines:
         line = line.strip()
         if line.lower() == "bug fixes":
-            doc.add_paragraph("🐞 Bug Fixes", style="Heading 2")
+            docx_template.add_paragraph(doc, "🐞 Bug Fixes", "Heading 2")
             continue
         if line.lower() == "known issues":
-            doc.add_paragraph("⚠️ Known Issues", style="Heading 2")
+            docx_template.add_paragraph(doc, "⚠️ Known Issues", "Heading 2")
             continue
 
         if "[CWB-" in line or "[WEBTV-" in line:
@@ -517,33 +379,25 @@ def generate_better_word(markdown_lines, output_path, tickets_info, version_tag,
             seen_lines.add(clean)
 
             if not summary_added:
-                doc.add_paragraph("🔹 Summary of Changes", style="Heading 2")
+                docx_template.add_paragraph(doc, "🔹 Summary of Changes", "Heading 2")
                 summary_added = True
-            doc.add_paragraph(clean, style='List Bullet')
+            docx_template.add_paragraph(doc, clean, "List Bullet")
 
             if not detail_added:
-                doc.add_paragraph("📋 Detailed Release Notes", style="Heading 2")
+                docx_template.add_paragraph(doc, "📋 Detailed Release Notes", "Heading 2")
                 detail_added = True
 
-            p = doc.add_paragraph(style='List Number')
-            found = False
-            for t in tickets_info:
-                if t["id"] in clean:
-                    add_hyperlink(p, f"🔗 {clean}", t["url"])
-                    found = True
-                    break
-            if not found:
+            p = docx_template.add_paragraph(doc, style="List Number")
+            ticket_data = next((t for t in tickets_info if t.key in clean), None)
+            if ticket_data:
+                add_hyperlink(p, f"🔗 {clean}", ticket_data.url)
+            else:
                 p.add_run(clean)
 
-            ticket_data = next((t for t in tickets_info if t["id"] in clean), None)
             if ticket_data:
-                p_status = doc.add_paragraph(f"Status: {ticket_data['status']}")
+                p_status = docx_template.add_paragraph(doc, f"Status: {ticket_data.status}")
                 p_status.paragraph_format.left_indent = Inches(0.25)
 
-                if ticket_data.get("description"):
-                    p_desc = doc.add_paragraph(f"Description: {ticket_data['description']}")
-                    p_desc.paragraph_format.left_indent = Inches(0.25)
-
     doc.save(output_path)
     print(f"📄 Documento Word guardado: {output_path}")
 
@@ -562,9 +416,10 @@ GitHub Release Notes:
 {release_notes}
 
 Jira Ticket Details:
-{tickets_info}
+{format_tickets(tickets_info)}
 """
-    response = client.chat.completions.create(
+    response_text = chat_completion(
+        client,
         model="gpt-3.5-turbo",
         messages=[
             {"role": "system", "content": "You are a helpful assistant who writes release documentation."},
@@ -572,7 +427,7 @@ Jira Ticket Details:
         ],
         temperature=0.4
     )
-    return response.choices[0].message.content
+    return response_text
 
 
 def answer_question_with_gpt(question, release_notes, tickets_info):
@@ -581,7 +436,7 @@ Release Notes:
 {release_notes}
 
 Jira Tickets:
-{tickets_info}
+{format_tickets(tickets_info)}
 """
     prompt = f"""
 Context:
@@ -607,13 +462,13 @@ def generate_friendly_summary(version_tag, structured_release_notes):
     bugs = []
 
     for item in structured_release_notes:
-        title = item["title"].strip(" -•:—.")
-        description = item["description"].strip(" -•:—.")
-        ticket_id = item["ticket_id"]
+        title = item.title.strip(" -•:—.")
+        description = item.description.strip(" -•:—.")
+        ticket_id = item.ticket_id
 
         sentence = f"{title}: {description}" if description and description != title else title
         line = f"- {sentence} ({ticket_id})"
-        if item["type"] == "feature":
+        if item.type == "feature":
             features.append(line)
         else:
             bugs.append(line)
@@ -644,7 +499,8 @@ Guidelines:
 - Use proper punctuation and polish grammar.
 """
 
-    response = client.chat.completions.create(
+    response_text = chat_completion(
+        client,
         model="gpt-4",
         messages=[
             {"role": "system", "content": "You are a helpful assistant that writes clean Jira summaries."},
@@ -653,7 +509,7 @@ Guidelines:
         temperature=0.5
     )
 
-    summary_text = response.choices[0].message.content.strip()
+    summary_text = response_text.strip()
 
     # ✅ Convert the AI summary to proper ADF with bold titles
     return markdown_to_adf_paragraphs(summary_text)
@@ -686,7 +542,8 @@ if __name__ == "__main__":
         markdown_lines.extend(known_issues)
 
     ticket_ids = list(set(re.findall(r'(CWB-\d+|WEBTV-\d+)', release_notes)))
-    tickets_info = [fetch_jira_ticket_details(tid) for tid in ticket_ids]
+    tickets_info, missing_tickets = fetch_jira_tickets_details(ticket_ids)
+    print(ticket_cache.format_stats())
 
     ai_generated_text = generate_release_doc_with_gpt(version_tag, release_notes, tickets_info)
 
@@ -697,8 +554,9 @@ if __name__ == "__main__":
     generate_better_word(markdown_lines, word_filename, tickets_info, version_tag, release_date, JIRA_EMAIL)
 
 
-    friendly_summary = generate_friendly_summary(version_tag, structured_release_notes)
-    create_jira_issue(f"Release Management Document - {version_tag}", friendly_summary, tickets_info)
+    adf_description = build_rich_adf_description(release_notes, tickets_info)
+    create_jira_issue(f"Release Management Document - {version_tag}", adf_description, tickets_info, release_notes)
+    print(github_cache.format_stats())
 
 
     while True:
@@ -1,95 +1,111 @@
 import re
+import json
+from release_ai_dashboard.notes_parser import parse_release_notes
+from release_ai_dashboard.models import JIRA_BROWSE_URL
 
-def build_rich_adf_description(release_body, tickets_info):
-    def make_link(text, url):
-        return {
-            "type": "text",
-            "text": text,
-            "marks": [{"type": "link", "attrs": {"href": url}}]
-        }
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Emisor de ADF para las release notes:
+# - el texto visible se limpia en un solo scan por línea (un regex con alternativas, sin pasadas encadenadas),
+# - los nodos fijos (separadores, espaciado, marks) son plantillas compartidas que no se mutan,
+# - el payload se serializa directo a bytes (orjson si está instalado).
+
+# Todo lo que no se muestra: "**", "[CWB-1]", "(https://...)", URLs sueltas y corchetes/paréntesis
+CLEAN_TEXT_PATTERN = re.compile(
+    r"\*\*"
+    r"|\[(?:WEBTV|CWB)-\d+\]"
+    r"|\(https?://[^\s)]+\)"
+    r"|https?://\S+"
+    r"|[\[\]()]"
+)
+LEADING_PUNCTUATION = "•-.:— \t"
+
+# Plantillas inmutables por convención: se comparten entre documentos, no modificarlas
+PR_SEPARATOR = {"type": "text", "text": " – "}
+CODE_SEPARATOR = {"type": "text", "text": " "}
+EMPTY_PARAGRAPH = {"type": "paragraph", "content": ()}
+
+
+def clean_note_text(text):
+    """Texto visible de una línea de release notes (sin links, tickets ni markdown), terminado en punto."""
+    clean_text = CLEAN_TEXT_PATTERN.sub("", text).lstrip(LEADING_PUNCTUATION).strip()
+    if clean_text and not clean_text.endswith("."):
+        clean_text += "."
+    return clean_text
+
+
+def text_node(text):
+    return {"type": "text", "text": text}
+
+
+def link_node(text, url):
+    return {"type": "text", "text": text, "marks": ({"type": "link", "attrs": {"href": url}},)}
+
+
+def ticket_link_node(ticket_id):
+    return link_node(f"🔗 {ticket_id}", JIRA_BROWSE_URL + ticket_id)
+
+
+def block_card_node(ticket_id):
+    return {"type": "blockCard", "attrs": {"url": JIRA_BROWSE_URL + ticket_id}}
 
+
+def heading_node(text, level):
+    return {"type": "heading", "attrs": {"level": level}, "content": (text_node(text),)}
+
+
+def note_paragraph(line):
+    """Párrafo ADF de una NoteLine: bullet + links a tickets, PR y commit. None si no queda texto."""
+    clean_text = clean_note_text(line.text)
+    if not clean_text:
+        return None
+    nodes = [text_node(f"• {clean_text} ")]
+    nodes.extend(ticket_link_node(t) for t in line.ticket_ids)
+    if line.pr_links:
+        nodes.append(PR_SEPARATOR)
+        nodes.append(link_node("[PR]", line.pr_links[0]))
+    if line.commit_links:
+        nodes.append(CODE_SEPARATOR)
+        nodes.append(link_node("[Code]", line.commit_links[0]))
+    return {"type": "paragraph", "content": nodes}
+
+
+def dumps_adf(payload):
+    """Serializa un payload (p. ej. el issue de Jira con su ADF) directo a bytes UTF-8."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def build_rich_adf_description(release_body, tickets_info):
     content = []
 
     # Header
-    content.append({
-        "type": "heading",
-        "attrs": {"level": 2},
-        "content": [{"type": "text", "text": "📦 Release Notes"}]
-    })
-
-    lines = release_body.splitlines()
-    features, bugs = [], []
-    current = None
-
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        if line.lower().startswith("### features"):
-            current = "features"
-            continue
-        elif line.lower().startswith("### bug fixes"):
-            current = "bugs"
-            continue
-        if current == "features":
-            features.append(line)
-        elif current == "bugs":
-            bugs.append(line)
+    content.append(heading_node("📦 Release Notes", 2))
+
+    parsed = parse_release_notes(release_body or "")
+    features = parsed.section("feature")
+    bugs = parsed.section("bug")
 
     def render_section(title, lines):
-        content.append({
-            "type": "heading",
-            "attrs": {"level": 3},
-            "content": [{"type": "text", "text": title}]
-        })
+        content.append(heading_node(title, 3))
 
         seen_blockcards = set()
 
         for line in lines:
-            paragraph = {"type": "paragraph", "content": []}
-
-            ticket_matches = re.findall(r"\b(WEBTV-\d+|CWB-\d+)\b", line)
-            commit_links = re.findall(r"\((https:\/\/github\.com\/[^\s]+\/commit\/[a-f0-9]{7,40})\)", line)
-            pr_links = re.findall(r"\((https:\/\/github\.com\/[^\s]+\/pull\/\d+)\)", line)
-
-            # Clean text
-            clean_text = re.sub(r"\*\*(.*?)\*\*", r"\1", line)
-            clean_text = re.sub(r"\[(WEBTV-\d+|CWB-\d+)\]", "", clean_text)
-            clean_text = re.sub(r"\(https?:\/\/[^\s)]+\)", "", clean_text)
-            clean_text = re.sub(r"https?:\/\/[^\s]+", "", clean_text)
-            clean_text = re.sub(r"[\[\]()]", "", clean_text)
-            clean_text = re.sub(r"^[•\-\.\s:—]+", "", clean_text).strip()
-
-            if not clean_text:
+            paragraph = note_paragraph(line)
+            if paragraph is None:
                 continue
-            if not clean_text.endswith("."):
-                clean_text += "."
-
-            # Bullet
-            paragraph["content"].append({"type": "text", "text": f"• {clean_text} "})
-
-            # Links
-            for t in ticket_matches:
-                paragraph["content"].append(make_link(f"🔗 {t}", f"https://televisaunivision.atlassian.net/browse/{t}"))
-            if pr_links:
-                paragraph["content"].append({"type": "text", "text": " – "})
-                paragraph["content"].append(make_link("[PR]", pr_links[0]))
-            if commit_links:
-                paragraph["content"].append({"type": "text", "text": " "})
-                paragraph["content"].append(make_link("[Code]", commit_links[0]))
-
             content.append(paragraph)
 
             # Add blockCards with spacing (no duplicates)
-            for t in ticket_matches:
+            for t in line.ticket_ids:
                 if t not in seen_blockcards:
-                    content.append({"type": "paragraph", "content": []})  # spacing
-                    content.append({
-                        "type": "blockCard",
-                        "attrs": {
-                            "url": f"https://televisaunivision.atlassian.net/browse/{t}"
-                        }
-                    })
+                    content.append(EMPTY_PARAGRAPH)  # spacing
+                    content.append(block_card_node(t))
                     seen_blockcards.add(t)
 
     if features:
@@ -98,23 +114,10 @@ def build_rich_adf_description(release_body, tickets_info):
         render_section("🐞 Bug Fixes", bugs)
 
     # Summary block
-    content.append({
-        "type": "heading",
-        "attrs": {"level": 3},
-        "content": [{"type": "text", "text": "📌 Summary"}]
-    })
-    content.append({
-        "type": "paragraph",
-        "content": [{"type": "text", "text": f"• {len(features)} features delivered 🚀"}]
-    })
-    content.append({
-        "type": "paragraph",
-        "content": [{"type": "text", "text": f"• {len(bugs)} bugs resolved 🐞"}]
-    })
-    content.append({
-        "type": "paragraph",
-        "content": [{"type": "text", "text": "• 0 known issues ⚠️"}]
-    })
+    content.append(heading_node("📌 Summary", 3))
+    content.append({"type": "paragraph", "content": (text_node(f"• {len(features)} features delivered 🚀"),)})
+    content.append({"type": "paragraph", "content": (text_node(f"• {len(bugs)} bugs resolved 🐞"),)})
+    content.append({"type": "paragraph", "content": (text_node("• 0 known issues ⚠️"),)})
 
     return {
         "type": "doc",
@@ -1,69 +1,184 @@
-from flask import Flask, request, render_template, session, redirect, url_for
+from flask import Flask, request, render_template, session, redirect, url_for, jsonify, Response
 from datetime import timedelta
 import os
 import sys
+import json
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from gpt_utils import answer_question_with_gpt, compare_releases_with_gpt
-from document_generator_ai import generate_structured_release_doc
-from github_utils import get_release_data
+# Todo el paquete se importa como release_ai_dashboard.*: importado también como módulo
+# suelto (release_utils, jobs...) quedaría cargado dos veces, cada copia con sus caches,
+# locks y contadores
+from release_ai_dashboard.gpt_utils import answer_question_with_gpt, stream_answer_with_gpt, compare_releases_with_gpt
+from release_ai_dashboard.document_generator_ai import generate_structured_release_doc
+from release_ai_dashboard.release_utils import get_release_data
+from release_ai_dashboard.jobs import submit_job, get_job, iter_events
+from release_ai_dashboard.session_store import SqliteSessionInterface
+from release_ai_dashboard import release_index, release_store, fetchers, github_cache
 from main import create_jira_issue, build_rich_adf_description, generate_friendly_summary
+from release_ai_dashboard.notes_parser import parse_release_notes, release_items
+from release_ai_dashboard.models import Release
 
 def parse_github_release_notes(release_notes):
     """
     Transforma el release.body plano de GitHub en una lista estructurada
     para usarla en generate_friendly_summary y otras funciones.
     """
-    import re
-
-    structured = []
-    lines = release_notes.splitlines()
-
-    current_section = None  # puede ser "feature" o "bug"
-
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-
-        # Detectar sección (Features o Bug Fixes)
-        if "features" in line.lower():
-            current_section = "feature"
-            continue
-        elif "bug fixes" in line.lower():
-            current_section = "bug"
-            continue
-
-        # Saltar líneas de encabezado
-        if line.startswith("#"):
-            continue
-
-        # Extrae el ticket si hay
-        match = re.search(r'\b([A-Z]+-\d+)\b', line)
-        ticket_id = match.group(1) if match else "UNKNOWN"
-
-        # Si no hay sección detectada, hacer heurística
-        l = line.lower()
-        if current_section:
-            item_type = current_section
-        elif any(w in l for w in ['fix', 'bug', 'resolve']):
-            item_type = 'bug'
-        else:
-            item_type = 'feature'
-
-        structured.append({
-            "type": item_type,
-            "title": line[:80],
-            "description": line,
-            "ticket_id": ticket_id
-        })
-
-    return structured
+    return release_items(parse_release_notes(release_notes))
+
+def run_generate_pipeline(version_tag, progress):
+    """Pipeline completo de generación; corre dentro de un job (ver jobs.py)."""
+    release_date = "2025-06-23"
+    github_link = f"https://github.com/televisa-univision/client-web/releases/tag/{version_tag}"
+
+    # Crear subcarpeta si no existe
+    release_dir = os.path.join("static", "releases")
+    word_filename = f"{version_tag.replace('/', '-')}.docx"
+    word_path = os.path.abspath(os.path.join(release_dir, word_filename))
+    os.makedirs(os.path.dirname(word_path), exist_ok=True)
+
+    # Obtener release notes reales desde GitHub
+    progress("github", "Obteniendo release notes desde GitHub...")
+    github_cache.reset_stats()
+    real_notes, ticket_ids = get_release_data(version_tag)
+    print(github_cache.format_stats())
+
+    # 🧩 Procesar tickets desde release notes
+    structured_release_notes = parse_github_release_notes(real_notes)
+
+    # 🧠 Generar resumen amigable con AI
+    progress("summary", f"Generando resumen con AI ({len(structured_release_notes)} items)...")
+    summary_text = generate_friendly_summary(version_tag, structured_release_notes)
+
+    # 🧾 Construir descripción ADF con summary incluido
+    description_adf = build_rich_adf_description(real_notes, structured_release_notes, summary_text=summary_text)
+
+    # 🏷️ Crear documento Word
+    progress("docx", "Generando documento Word...")
+    generate_structured_release_doc(word_path, {
+        "project_name": "Client WebApp",
+        "version": version_tag,
+        "release_date": release_date,
+        "prepared_by": "Yoseph Benchimol",
+        "summary": [summary_text],
+        "details": structured_release_notes,
+        "known_issues": [],
+        "checklist": [
+            "Código mergeado en rama main",
+            "Pruebas pasadas en staging",
+            "Lanzamiento a producción confirmado"
+        ],
+        "stakeholders": [
+            "Product Owner: Juan Pérez ✅",
+            "QA Lead: Ana Torres ✅",
+            "DevOps: Miguel Díaz ✅"
+        ],
+        "links": [
+            ("Release en GitHub", github_link),
+            ("Documentación técnica", "https://confluence.televisaunivision.com/display/PROJECTDOCS"),
+            ("Jira Board", "https://televisaunivision.atlassian.net/jira/software/c/projects/CWB/boards/34")
+        ]
+    })
+
+    # 🔎 Guardar e indexar el release para el chat y las comparaciones
+    release = store_release(version_tag, real_notes, structured_release_notes, ticket_ids, summary=(summary_text,))
+    release_index.index_docx(word_path)
+
+    # 🪄 Crear ticket en Jira (los items ya vienen clasificados)
+    progress("jira", "Creando ticket en Jira...")
+    jira_key = create_jira_issue(f"Release Document for {version_tag}", description_adf, None, real_notes, items=release.items)
+
+    return {
+        # La sesión guarda JSON: el release se convierte a dict solo acá
+        "release": {
+            **release.to_dict(),
+            "text": version_tag,
+            "tag": version_tag,
+            "word": f"releases/{word_filename}",
+            "ticket_url": f"https://televisaunivision.atlassian.net/browse/{jira_key}" if jira_key else None
+        },
+        "history_entry": {
+            "version": version_tag,
+            "file": f"releases/{word_filename}",
+            "date": release_date
+        }
+    }
 
 app = Flask(__name__)
 app.secret_key = 'supersecretkey'
 app.permanent_session_lifetime = timedelta(hours=1)
+# Sesión del lado del servidor: la cookie solo guarda el id
+app.session_interface = SqliteSessionInterface()
+
+def get_stored_release(version_tag):
+    """Release estructurado desde el store local; si no está se trae una vez de GitHub/Jira."""
+    release = release_store.get_release(version_tag)
+    if release:
+        return release
+
+    body, ticket_ids = get_release_data(version_tag)
+    return store_release(version_tag, body, parse_github_release_notes(body), ticket_ids)
+
+def store_release(version_tag, body, items, ticket_ids, summary=()):
+    """
+    Arma el Release con el status real de Jira de cada item (bulk + cache), lo guarda
+    en el store local y lo indexa para el chat (notas, items y summaries de los tickets).
+    Generar y comparar pasan los dos por acá, así diff_releases no ve cambios de status
+    falsos según quién guardó el release.
+    """
+    tickets = None
+    if fetchers.JIRA_URL and ticket_ids:
+        tickets, _ = fetchers.fetch_jira_tickets_details(ticket_ids)
+        statuses = {t.key: t.status for t in tickets}
+        items = [item.with_status(statuses.get(item.ticket_id, "")) for item in items]
+
+    release = Release(version=version_tag, body=body, items=tuple(items), summary=tuple(summary))
+    # No guardar respuestas de error de GitHub
+    if not body.startswith("⚠️"):
+        release_store.save_release(release)
+        release_index.add_release(version_tag, body, release.items, tickets)
+    return release
+
+def finish_pending_job(job_id):
+    """
+    Cierra el job pendiente de la sesión: si terminó guarda el resultado, si falló o ya
+    no existe deja el error para mostrarlo. Un job que sigue corriendo queda pendiente.
+    """
+    job = get_job(job_id)
+    if job is None:
+        session['job_error'] = "La generación ya no está disponible; volvé a generar el release."
+    elif job["status"] == "error":
+        session['job_error'] = f"Falló la generación: {job['error']}"
+    elif job["status"] == "done":
+        # 💾 Guardar en sesión
+        session['release'] = job["result"]["release"]
+        session.setdefault('release_history', [])
+        session['release_history'].append(job["result"]["history_entry"])
+    else:
+        return
+    session.pop('pending_job', None)
+    session.modified = True
+
+def prepare_chat_question(question):
+    """Agrega la pregunta al chat de la sesión y arma el Release para GPT."""
+    chat = session.get("chat_history", [])
+    release = session.get('release', {})
+
+    last_version = session.get("chat_release_version")
+    current_version = release.get("version")
+
+    if last_version and last_version != current_version:
+        chat.append({
+            "role": "assistant",
+            "content": f"🆕 You are now discussing release **{current_version}**."
+        })
+
+    session["chat_release_version"] = current_version
+    chat.append({"role": "user", "content": question})
+    session['chat_history'] = chat
+    session.modified = True
+
+    return chat, Release.from_dict(release)
 
 @app.route('/', methods=['GET', 'POST'])
 def index():
@@ -78,111 +193,23 @@ def index():
         action = request.form.get("action")
 
         if action == "generate":
+            # 🧵 El pipeline corre en background; devolvemos el job id al instante
             version_tag = request.form["tag"]
-            release_date = "2025-06-23"
-            github_link = f"https://github.com/televisa-univision/client-web/releases/tag/{version_tag}"
-
-            # Crear subcarpeta si no existe
-            release_dir = os.path.join("static", "releases")
-            word_filename = f"{version_tag.replace('/', '-')}.docx"
-            word_path = os.path.abspath(os.path.join(release_dir, word_filename))
-            os.makedirs(os.path.dirname(word_path), exist_ok=True)
-
-            # Obtener release notes reales desde GitHub
-            real_notes = get_release_data(version_tag)
-
-            # 🧩 Procesar tickets desde release notes
-            structured_release_notes = parse_github_release_notes(real_notes)
-
-            # 🧠 Generar resumen amigable con AI
-            summary_text = generate_friendly_summary(version_tag, structured_release_notes)
-
-            # 🧩 Preparar tickets para descripción ADF
-            tickets_info = []
-            for item in structured_release_notes:
-                tickets_info.append({
-                    "id": item["ticket_id"],
-                    "summary": item["title"] + ": " + item["description"],
-                    "status": "Ready",  # Este campo es opcional
-                    "url": f"https://televisaunivision.atlassian.net/browse/{item['ticket_id']}"
-                })
-
-            # 🧾 Construir descripción ADF con summary incluido
-            description_adf = build_rich_adf_description(real_notes, tickets_info, summary_text=summary_text)
-
-            # 🏷️ Crear documento Word
-            generate_structured_release_doc(word_path, {
-                "project_name": "Client WebApp",
-                "version": version_tag,
-                "release_date": release_date,
-                "prepared_by": "Yoseph Benchimol",
-                "summary": [summary_text],
-                "details": structured_release_notes,
-                "known_issues": [],
-                "checklist": [
-                    "Código mergeado en rama main",
-                    "Pruebas pasadas en staging",
-                    "Lanzamiento a producción confirmado"
-                ],
-                "stakeholders": [
-                    "Product Owner: Juan Pérez ✅",
-                    "QA Lead: Ana Torres ✅",
-                    "DevOps: Miguel Díaz ✅"
-                ],
-                "links": [
-                    ("Release en GitHub", github_link),
-                    ("Documentación técnica", "https://confluence.televisaunivision.com/display/PROJECTDOCS"),
-                    ("Jira Board", "https://televisaunivision.atlassian.net/jira/software/c/projects/CWB/boards/34")
-                ]
-            })
-
-            # 🪄 Crear ticket en Jira
-            jira_key = create_jira_issue(f"Release Document for {version_tag}", description_adf, tickets_info, real_notes)
-
-            # 💾 Guardar en sesión
-            session['release'] = {
-                "text": version_tag,
-                "tag": version_tag,
-                "word": f"releases/{word_filename}",
-                "version": version_tag,
-                "body": real_notes,
-                "summary": [summary_text],
-                "details": structured_release_notes,
-                "known_issues": [],
-                "ticket_url": f"https://televisaunivision.atlassian.net/browse/{jira_key}" if jira_key else None
-            }
-
-            session.setdefault('release_history', [])
-            session['release_history'].append({
-                "version": version_tag,
-                "file": f"releases/{word_filename}",
-                "date": release_date
-            })
+            job_id = submit_job(run_generate_pipeline, version_tag)
+            session['pending_job'] = job_id
             session.modified = True
 
+            if request.accept_mimetypes.best == "application/json":
+                return jsonify({
+                    "job_id": job_id,
+                    "events_url": url_for("job_events", job_id=job_id),
+                    "complete_url": url_for("job_complete", job_id=job_id),
+                }), 202
+            return redirect(url_for("index", job=job_id))
+
         elif action == "ask":
             question = request.form["question"]
-            chat = session.get("chat_history", [])
-
-            last_version = session.get("chat_release_version")
-            current_version = session['release'].get("version")
-
-            if last_version and last_version != current_version:
-                chat.append({
-                    "role": "assistant",
-                    "content": f"🆕 You are now discussing release **{current_version}**."
-                })
-
-            session["chat_release_version"] = current_version
-            chat.append({"role": "user", "content": question})
-
-            release_info = {
-                "version": session['release'].get("version", ""),
-                "summary": session['release'].get("summary", []),
-                "details": session['release'].get("details", []),
-                "known_issues": session['release'].get("known_issues", []),
-                "body": session['release'].get("body", "")
-            }
+            chat, release_info = prepare_chat_question(question)
 
             answer = answer_question_with_gpt(
                 question=question,
@@ -198,29 +225,25 @@ def index():
             tag_a = request.form["release_a"]
             tag_b = request.form["release_b"]
 
-            release_a = {
-                "version": tag_a,
-                "summary": ["Mejoras en autenticación"],
-                "details": [
-                    {"ticket": "CWB-14000", "description": "Improved login security."}
-                ],
-                "known_issues": ["Bug con token en Firefox"]
-            }
-
-            release_b = {
-                "version": tag_b,
-                "summary": ["Optimización en login", "Reducción de latencia"],
-                "details": [
-                    {"ticket": "CWB-14001", "description": "Fixed latency issue."},
-                    {"ticket": "CWB-14002", "description": "Patched Firefox token bug."}
-                ],
-                "known_issues": []
-            }
+            release_a = get_stored_release(tag_a)
+            release_b = get_stored_release(tag_b)
 
             comparison = compare_releases_with_gpt(release_a, release_b)
             session["comparison_result"] = comparison
             session.modified = True
 
+    # Un job pendiente que falló o ya no existe (vencido, server reiniciado) no se sigue mostrando
+    job_id = request.args.get("job") or session.get("pending_job")
+    job = get_job(job_id) if job_id else None
+    if job_id and (job is None or job["status"] == "error"):
+        if session.get("pending_job") == job_id:
+            finish_pending_job(job_id)
+        job_id = None
+
+    job_error = session.pop('job_error', None)
+    if job_error:
+        session.modified = True
+
     return render_template("index.html",
                            release_text=session.get('release', {}).get("text"),
                            word_filename=session.get('release', {}).get("word"),
@@ -228,7 +251,57 @@ def index():
                            chat_history=session.get("chat_history", []),
                            ticket_url=session.get('release', {}).get("ticket_url"),
                            release_history=session.get("release_history", []),
-                           comparison_result=session.get("comparison_result"))
+                           comparison_result=session.get("comparison_result"),
+                           job_id=job_id,
+                           job_error=job_error)
+
+@app.route('/ask/stream', methods=['POST'])
+def ask_stream():
+    """Respuesta del chat token por token (SSE); al terminar se guarda en el historial."""
+    question = request.form["question"]
+    chat, release_info = prepare_chat_question(question)
+    sid = session.sid
+
+    def stream():
+        parts = []
+        try:
+            for delta in stream_answer_with_gpt(question, release_info, history=chat):
+                parts.append(delta)
+                yield f"event: delta\ndata: {json.dumps({'text': delta})}\n\n"
+        except Exception as e:
+            print(f"❌ Error en streaming de GPT: {e}")
+            yield f"event: error\ndata: {json.dumps({'message': str(e)})}\n\n"
+        answer = "".join(parts)
+        if answer:
+            # La sesión ya se guardó al empezar la respuesta; agregamos la respuesta directo al store
+            app.session_interface.update_session(app, sid, {
+                "chat_history": chat + [{"role": "assistant", "content": answer}]
+            })
+        yield "event: done\ndata: {}\n\n"
+
+    return Response(stream(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """Progreso del job por Server-Sent Events."""
+    if get_job(job_id) is None:
+        return jsonify({"error": "job not found"}), 404
+
+    def stream():
+        for event in iter_events(job_id):
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+    return Response(stream(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.route('/jobs/<job_id>/complete')
+def job_complete(job_id):
+    """Guarda en sesión el resultado de un job terminado (o su error) y vuelve al dashboard."""
+    if session.get("pending_job") == job_id:
+        finish_pending_job(job_id)
+    return redirect(url_for("index"))
 
 if __name__ == '__main__':
     app.run(debug=True)
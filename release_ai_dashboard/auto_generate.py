@@ -6,7 +6,9 @@ from release_ai_dashboard.gpt_utils import (
 )
 from release_ai_dashboard.adf_utils import build_rich_adf_description
 from release_ai_dashboard.jira_utils import create_jira_ticket
-from release_ai_dashboard.fetchers import fetch_jira_ticket_details  # Asegúrate de tener este archivo
+from release_ai_dashboard.fetchers import fetch_jira_tickets_details  # Asegúrate de tener este archivo
+from release_ai_dashboard.ticket_cache import format_stats as ticket_cache_stats
+from release_ai_dashboard.github_cache import format_stats as github_cache_stats
 
 def main(version_tag=None):
     if not version_tag:
@@ -24,8 +26,9 @@ def main(version_tag=None):
         print("❌ No release notes found. Aborting.")
         sys.exit(1)
 
-    # 🔍 Get full details for each ticket from Jira
-    tickets_info = [fetch_jira_ticket_details(tid) for tid in ticket_ids]
+    # 🔍 Get full details for all tickets from Jira (bulk JQL search)
+    tickets_info, missing_tickets = fetch_jira_tickets_details(ticket_ids)
+    print(ticket_cache_stats())
 
     # 🧱 Build the ADF description for Jira
     adf_description = build_rich_adf_description(release_notes, tickets_info)
@@ -33,6 +36,7 @@ def main(version_tag=None):
     # 🧾 Create Jira ticket
     create_jira_ticket(version_tag, adf_description)
     print("✅ Jira ticket created successfully.")
+    print(github_cache_stats())
 
 if __name__ == "__main__":
     main()
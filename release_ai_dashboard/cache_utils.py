@@ -0,0 +1,34 @@
+import os
+import json
+
+# Carpeta donde se guardan los índices y caches locales (configurable por entorno)
+CACHE_DIR = os.getenv("RELEASE_CACHE_DIR") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".cache"
+)
+
+
+def cache_path(filename):
+    """Devuelve la ruta absoluta de un archivo dentro del directorio de cache."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, filename)
+
+
+def load_json(filename, default=None):
+    path = cache_path(filename)
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        print(f"⚠️ Cache corrupto, se ignora: {path}")
+        return default
+
+
+def save_json(filename, data):
+    # Escritura atómica para no dejar el índice a medias si el proceso muere
+    path = cache_path(filename)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
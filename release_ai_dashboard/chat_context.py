@@ -0,0 +1,139 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from release_ai_dashboard.llm_cache import chat_completion
+
+# Contexto del chat de Q&A con presupuesto de tokens:
+# - los últimos CHAT_KEEP_TURNS turnos van textuales,
+# - los anteriores se pliegan en un resumen acumulado (cacheado por prefijo del historial),
+# - todo el prompt se mantiene por debajo de CHAT_TOKEN_BUDGET.
+# Los turnos se pliegan en bloques (cuando hay el doble de los que se guardan), así no
+# se paga una llamada de resumen en cada pregunta y la latencia queda plana.
+
+CHAT_TOKEN_BUDGET = int(os.getenv("CHAT_TOKEN_BUDGET", "6000"))
+CHAT_KEEP_TURNS = int(os.getenv("CHAT_KEEP_TURNS", "4"))
+CHAT_SUMMARY_MODEL = os.getenv("CHAT_SUMMARY_MODEL", "gpt-3.5-turbo")
+# Parte del presupuesto que puede ocupar el contexto del release (system prompt)
+CHAT_CONTEXT_SHARE = 0.6
+MAX_CACHED_SUMMARIES = 512
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _encoding = None
+
+_lock = threading.Lock()
+_summaries = OrderedDict()
+
+
+def count_tokens(text):
+    """Cuenta tokens localmente (tiktoken si está instalado, si no ~4 caracteres por token)."""
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return len(text) // 4 + 1
+
+
+def count_message_tokens(messages):
+    # ~4 tokens extra por mensaje por el formato del chat
+    return sum(count_tokens(m.get("content", "")) + 4 for m in messages)
+
+
+def truncate_to_tokens(text, max_tokens):
+    if count_tokens(text) <= max_tokens:
+        return text
+    if _encoding is not None:
+        return _encoding.decode(_encoding.encode(text)[:max_tokens]) + "\n…[truncated]"
+    return text[:max_tokens * 4] + "\n…[truncated]"
+
+
+def _prefix_hashes(messages):
+    """hashes[i] identifica el prefijo messages[:i] del historial."""
+    hashes = []
+    digest = hashlib.sha256()
+    hashes.append(digest.hexdigest())
+    for m in messages:
+        digest.update(json.dumps([m.get("role"), m.get("content")], ensure_ascii=False).encode("utf-8"))
+        hashes.append(digest.copy().hexdigest())
+    return hashes
+
+
+def _remember_summary(prefix_hash, summary):
+    with _lock:
+        _summaries[prefix_hash] = summary
+        _summaries.move_to_end(prefix_hash)
+        while len(_summaries) > MAX_CACHED_SUMMARIES:
+            _summaries.popitem(last=False)
+
+
+def _summarize(client, previous_summary, messages):
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+    prompt = f"""
+Update the running summary of a conversation about a software release.
+Keep facts, ticket IDs, versions and open questions. Max 150 words.
+
+Current summary:
+{previous_summary or "(empty)"}
+
+New conversation turns:
+{transcript}
+"""
+    return chat_completion(
+        client,
+        model=CHAT_SUMMARY_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0,
+    ).strip()
+
+
+def build_chat_messages(client, system_prompt, history, question, budget=None, keep_turns=None):
+    """
+    Arma la lista de mensajes para el chat respetando el presupuesto de tokens.
+    history es la lista de {"role", "content"} previa a la pregunta actual.
+    """
+    budget = budget or CHAT_TOKEN_BUDGET
+    keep = (CHAT_KEEP_TURNS if keep_turns is None else keep_turns) * 2
+    history = [m for m in history if m.get("content")]
+
+    # Buscar el prefijo más largo que ya tenemos resumido
+    hashes = _prefix_hashes(history)
+    summarized = 0
+    summary = ""
+    with _lock:
+        for i in range(len(history), 0, -1):
+            if hashes[i] in _summaries:
+                summarized, summary = i, _summaries[hashes[i]]
+                _summaries.move_to_end(hashes[i])
+                break
+
+    system_prompt = truncate_to_tokens(system_prompt, int(budget * CHAT_CONTEXT_SHARE))
+    fixed_tokens = count_tokens(system_prompt) + count_tokens(question) + 8
+
+    def total_tokens(start, summary_text):
+        summary_tokens = count_tokens(summary_text) + 4 if summary_text else 0
+        return fixed_tokens + summary_tokens + count_message_tokens(history[start:])
+
+    # Plegar en bloque cuando hay demasiados turnos textuales o se pasa el presupuesto
+    fold_to = summarized
+    if len(history) - summarized > keep * 2:
+        fold_to = len(history) - keep
+    if total_tokens(fold_to, summary) > budget:
+        # Plegar con margen para no tener que resumir otra vez en la próxima pregunta
+        while fold_to < len(history) and total_tokens(fold_to, summary) > budget * 0.75:
+            fold_to += 1
+
+    if fold_to > summarized:
+        summary = _summarize(client, summary, history[summarized:fold_to])
+        _remember_summary(hashes[fold_to], summary)
+        summarized = fold_to
+
+    messages = [{"role": "system", "content": system_prompt}]
+    if summary:
+        messages.append({"role": "system", "content": f"Summary of the earlier conversation:\n{summary}"})
+    messages.extend({"role": m["role"], "content": m["content"]} for m in history[summarized:])
+    messages.append({"role": "user", "content": question})
+    return messages
@@ -0,0 +1,100 @@
+import os
+import re
+import json
+import hashlib
+
+# Clasificador feature/bug por palabras clave.
+# Todas las palabras de todas las etiquetas se compilan en un solo regex con límites
+# de palabra (así "ui" no matchea "build" ni "add" matchea "address") y cada texto se
+# recorre una sola vez. Las reglas son una lista ordenada [(etiqueta, palabras)]: si
+# aparecen varias etiquetas gana la primera de la lista.
+#
+# Las listas se pueden sobreescribir con un JSON en CLASSIFIER_RULES:
+# {"commits": {"bug": [...], "feature": [...]}, "tickets": {...}, "notes": {...}}
+
+CLASSIFIER_RULES = os.getenv("CLASSIFIER_RULES")
+
+DEFAULT_RULES = {
+    # Mensajes de commit (release_utils.get_release_data)
+    "commits": [
+        ("bug", ("fix", "bug", "resolve", "patch", "error", "issue", "correct")),
+        ("feature", ("add", "implement", "migrate", "refactor", "feature", "create")),
+    ],
+    # Resúmenes de tickets de Jira (main.create_jira_issue)
+    "tickets": [
+        ("feature", (
+            "add", "rsc", "migrate", "move", "create", "implement",
+            "profile", "modal", "pill", "tab", "ui", "gate", "flow",
+            "state machine", "component", "split screen", "login", "logout", "subscribe",
+        )),
+        ("bug", ("fix", "bug", "error", "issue", "broken", "not working")),
+    ],
+    # Líneas de release notes fuera de una sección (notes_parser.release_items)
+    "notes": [
+        ("bug", ("fix", "bug", "resolve")),
+    ],
+}
+
+
+def _keyword_pattern(keyword):
+    """Palabra clave + flexiones comunes en inglés (fix/fixes/fixed/fixing, resolve/resolved/resolving)."""
+    words = [re.escape(w) for w in keyword.lower().split()]
+    last = words[-1]
+    if keyword.endswith("e"):
+        words[-1] = f"{last[:-1]}(?:e|es|ed|ing)"
+    else:
+        words[-1] = f"{last}(?:s|es|ed|ing)?"
+    return r"\s+".join(words)
+
+
+class KeywordClassifier:
+    def __init__(self, rules, default="feature"):
+        self.labels = [label for label, _ in rules]
+        self.default = default
+        self._groups = {}
+        alternatives = []
+        for index, (label, keywords) in enumerate(rules):
+            group = f"g{index}"
+            self._groups[group] = index
+            # Las más largas primero para que "state machine" gane sobre prefijos
+            keywords = sorted(set(keywords), key=len, reverse=True)
+            alternatives.append(f"(?P<{group}>{'|'.join(_keyword_pattern(k) for k in keywords)})")
+        # Sin IGNORECASE: el texto se pasa a minúsculas una vez. El lookahead con las
+        # primeras letras deja que `re` salte rápido las posiciones que no pueden matchear.
+        first_letters = "".join(sorted({k.lower()[0] for _, keywords in rules for k in keywords}))
+        self._pattern = re.compile(
+            rf"(?=[{re.escape(first_letters)}])\b(?:" + "|".join(alternatives) + r")\b"
+        )
+
+    @property
+    def fingerprint(self):
+        """Identifica las reglas compiladas (para invalidar resultados guardados si cambian)."""
+        return hashlib.sha256(f"{self.default}|{self._pattern.pattern}".encode("utf-8")).hexdigest()[:16]
+
+    def classify(self, text, default=None):
+        """Etiqueta de mayor prioridad presente en el texto (un solo recorrido)."""
+        best = None
+        for match in self._pattern.finditer(text.lower()):
+            index = self._groups[match.lastgroup]
+            if best is None or index < best:
+                best = index
+                if best == 0:
+                    break
+        if best is None:
+            return self.default if default is None else default
+        return self.labels[best]
+
+
+def _load_rules():
+    rules = dict(DEFAULT_RULES)
+    if CLASSIFIER_RULES and os.path.exists(CLASSIFIER_RULES):
+        with open(CLASSIFIER_RULES, "r", encoding="utf-8") as f:
+            for name, labels in json.load(f).items():
+                rules[name] = [(label, tuple(keywords)) for label, keywords in labels.items()]
+    return rules
+
+
+_rules = _load_rules()
+COMMIT_CLASSIFIER = KeywordClassifier(_rules["commits"])
+TICKET_CLASSIFIER = KeywordClassifier(_rules["tickets"])
+NOTES_CLASSIFIER = KeywordClassifier(_rules["notes"])
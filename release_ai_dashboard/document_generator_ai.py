@@ -1,34 +1,26 @@
-from docx import Document
 from openai import OpenAI
 from dotenv import load_dotenv
-from gpt_utils import add_hyperlink
+from release_ai_dashboard.llm_cache import chat_completion
+from release_ai_dashboard.translation_utils import translate_lines_to_english
+from release_ai_dashboard.models import ReleaseItem
+from release_ai_dashboard import docx_template
+from release_ai_dashboard.docx_template import add_hyperlink
+from docx.shared import Pt
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor, wait
 
 load_dotenv()
 client = OpenAI()
 
+# Tiempo máximo compartido para las llamadas GPT en paralelo del documento
+GPT_DEADLINE_SECONDS = float(os.getenv("GPT_DEADLINE_SECONDS", "120"))
+
 def translate_to_english_if_needed(text_list, label):
-    """Detect and translate a list of items to English using GPT-4 if needed."""
+    """Detect and translate a list of items to English (local detection + one batched GPT call)."""
     if not text_list:
         return []
-    joined_text = "\n".join([line if isinstance(line, str) else "" for line in text_list])
-    prompt = f"""
-You are an assistant that ensures technical content is written in clear, professional English.
-
-The following is a list of items labeled '{label}'. If they are in Spanish, translate them to English. If they are already in English, keep them as is. Return each item on a new line:
-
-{joined_text}
-"""
-    response = client.chat.completions.create(
-        model="gpt-4",
-        messages=[
-            {"role": "system", "content": "You are a translation assistant."},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.1
-    )
-    return response.choices[0].message.content.strip().split("\n")
+    return translate_lines_to_english(client, {label: text_list})[label]
 
 def smart_generate_sections(raw_release_notes: str) -> dict:
     prompt = f"""
@@ -47,13 +39,14 @@ Output must be in this JSON format:
   "known_issues": ["..."]
 }}
 """
-    response = client.chat.completions.create(
+    response_text = chat_completion(
+        client,
         model="gpt-4",
         messages=[{"role": "user", "content": prompt}],
         temperature=0.2
     )
     try:
-        return json.loads(response.choices[0].message.content)
+        return json.loads(response_text)
     except Exception:
         return {"summary": "", "detailed_notes": [], "known_issues": []}
 
@@ -69,7 +62,8 @@ Release Notes:
 Jira Tickets Info:
 {jira_info}
 """
-    response = client.chat.completions.create(
+    response_text = chat_completion(
+        client,
         model="gpt-4",
         messages=[
             {"role": "system", "content": "You are a Release Management Document Assistant."},
@@ -77,12 +71,12 @@ Jira Tickets Info:
         ],
         temperature=0.3
     )
-    return response.choices[0].message.content
+    return response_text
 
 def save_to_word(content, filename):
-    doc = Document()
+    doc = docx_template.new_document()
     for line in content.split('\n'):
-        doc.add_paragraph(line)
+        docx_template.add_paragraph(doc, line)
     output_path = os.path.join("static", filename)
     doc.save(output_path)
     return output_path
@@ -105,129 +99,172 @@ def generate_summary_paragraph(summary_data: list[str]) -> str:
 
     return paragraph.strip()
 
-def generate_structured_release_doc(filename, release_info):
-    doc = Document()
+def run_gpt_calls_concurrently(tasks, deadline=None):
+    """
+    Ejecuta llamadas GPT independientes en paralelo con un deadline compartido.
+    tasks = {nombre: (funcion, args, valor_por_defecto)}. Si una llamada falla o no
+    termina antes del deadline se usa su valor por defecto.
+    """
+    deadline = GPT_DEADLINE_SECONDS if deadline is None else deadline
+    executor = ThreadPoolExecutor(max_workers=max(len(tasks), 1), thread_name_prefix="gpt")
+    futures = {name: executor.submit(fn, *args) for name, (fn, args, _) in tasks.items()}
+    wait(futures.values(), timeout=deadline)
+    # No bloquear por llamadas que siguen corriendo después del deadline
+    executor.shutdown(wait=False)
 
-    # AI Enhancement: classify and rewrite sections from release_body
+    results = {}
+    for name, future in futures.items():
+        default = tasks[name][2]
+        if not future.done():
+            print(f"⚠️ GPT '{name}' no terminó en {deadline}s. Usando valor por defecto.")
+            results[name] = default
+        elif future.exception():
+            print(f"❌ Error en GPT '{name}': {future.exception()}")
+            results[name] = default
+        else:
+            results[name] = future.result()
+    return results
+
+@docx_template.template("structured")
+def _structured_template(doc):
+    doc.add_heading('📄 Release Management Document', level=1)
+    doc.add_paragraph("Project Name: {project_name}")
+    doc.add_paragraph("Version: {version}")
+    doc.add_paragraph("Release Date: {release_date}")
+    doc.add_paragraph("Prepared By: {prepared_by}")
+    doc.add_paragraph()
+
+
+def generate_structured_release_doc(filename, release_info):
+    # AI Enhancement + translations: no dependen entre sí, se lanzan en paralelo
     release_body = release_info.get('release_body', '')
+    # Las tres listas se traducen juntas en una sola request (ver translation_utils)
+    to_translate = {
+        "Summary of Changes": release_info.get('summary', []),
+        "Deployment Checklist": release_info.get('checklist', []),
+        "Stakeholders & Approvals": release_info.get('stakeholders', []),
+    }
+    tasks = {
+        "translations": (translate_lines_to_english, (client, to_translate), to_translate),
+    }
     if release_body:
-        ai_sections = smart_generate_sections(release_body)
-        ai_summary = ai_sections.get("summary", "")
-        ai_details = ai_sections.get("detailed_notes", [])
-        ai_known = ai_sections.get("known_issues", [])
-    else:
-        ai_summary, ai_details, ai_known = "", [], []
+        tasks["sections"] = (smart_generate_sections, (release_body,), {})
+    results = run_gpt_calls_concurrently(tasks)
 
-    # Translate content to English
-    summary = translate_to_english_if_needed(release_info.get('summary', []), "Summary of Changes")
-    checklist = translate_to_english_if_needed(release_info.get('checklist', []), "Deployment Checklist")
-    stakeholders = translate_to_english_if_needed(release_info.get('stakeholders', []), "Stakeholders & Approvals")
+    ai_sections = results.get("sections", {})
+    ai_summary = ai_sections.get("summary", "")
+    ai_details = ai_sections.get("detailed_notes", [])
+    ai_known = ai_sections.get("known_issues", [])
 
-    # Title and metadata
-    doc.add_heading('📄 Release Management Document', level=1)
-    doc.add_paragraph(f"Project Name: {release_info.get('project_name', 'N/A')}")
-    doc.add_paragraph(f"Version: {release_info.get('version', 'N/A')}")
-    doc.add_paragraph(f"Release Date: {release_info.get('release_date', 'N/A')}")
-    doc.add_paragraph(f"Prepared By: {release_info.get('prepared_by', 'N/A')}")
-    doc.add_paragraph()
+    translations = results["translations"]
+    summary = translations["Summary of Changes"]
+    checklist = translations["Deployment Checklist"]
+    stakeholders = translations["Stakeholders & Approvals"]
+
+    # Title and metadata (bloque fijo de la plantilla)
+    doc = docx_template.new_document(
+        "structured",
+        project_name=release_info.get('project_name', 'N/A'),
+        version=release_info.get('version', 'N/A'),
+        release_date=release_info.get('release_date', 'N/A'),
+        prepared_by=release_info.get('prepared_by', 'N/A'),
+    )
 
     # Section 1: Summary of Changes
-    doc.add_heading("1. Summary of Changes", level=2)
+    docx_template.add_heading(doc, "1. Summary of Changes", level=2)
     if ai_summary:
-        doc.add_paragraph(ai_summary)
+        docx_template.add_paragraph(doc, ai_summary)
     elif summary:
         formatted_summary = generate_summary_paragraph(summary)
-        doc.add_paragraph(formatted_summary, style="Normal")
+        docx_template.add_paragraph(doc, formatted_summary, "Normal")
     else:
-        doc.add_paragraph("No summary available.")
-    doc.add_paragraph()
+        docx_template.add_paragraph(doc, "No summary available.")
+    docx_template.add_paragraph(doc)
 
     # Section 2: Detailed Release Notes
-    doc.add_heading("2. Detailed Release Notes", level=2)
+    docx_template.add_heading(doc, "2. Detailed Release Notes", level=2)
     details = ai_details or release_info.get('details', [])
     if details:
-        if isinstance(details[0], dict):  # structured Jira-style notes
+        if isinstance(details[0], ReleaseItem):  # structured Jira-style notes
             table = doc.add_table(rows=1, cols=4)
-            table.style = 'Table Grid'
+            docx_template.set_table_style(table, 'Table Grid')
             hdr_cells = table.rows[0].cells
             hdr_cells[0].text = 'Ticket'
             hdr_cells[1].text = 'Description'
             hdr_cells[2].text = 'Status'
             hdr_cells[3].text = 'Link'
-            for detail in details:
-                row_cells = table.add_row().cells
-                row_cells[0].text = detail.get('ticket', '')
-                row_cells[2].text = detail.get('status', '')
-
-                # Write description + inline link in same cell
-                desc = detail.get('description', '')
-                link = detail.get('link', '')
-                p = row_cells[1].paragraphs[0]
-                p.add_run(desc + " ")
-                add_hyperlink(p, "🔗 View Ticket", link)
-
-                # Leave 4th cell empty
-                row_cells[3].text = ''
+            # Filas armadas en bloque (table.add_row() por fila se vuelve cuadrático)
+            docx_template.add_table_rows(table, (
+                (
+                    detail.ticket_id,
+                    # Description + inline link in same cell
+                    (detail.description + " ", ("🔗 View Ticket", detail.url)) if detail.url else (detail.description + " ",),
+                    detail.status,
+                    # Leave 4th cell empty
+                    "",
+                )
+                for detail in details
+            ))
         else:  # AI-style list notes
             for note in details:
                 if "New Features & Improvements" in note:
-                    p = doc.add_paragraph()
+                    p = docx_template.add_paragraph(doc)
                     run = p.add_run("🚀 • New Features & Improvements —")
                     run.bold = True
                     run.font.size = Pt(13)
                 elif "Bug Fixes" in note:
-                    p = doc.add_paragraph()
+                    p = docx_template.add_paragraph(doc)
                     run = p.add_run("🛠️ • Bug Fixes —")
                     run.bold = True
                     run.font.size = Pt(13)
                 else:
-                    doc.add_paragraph(f"- {note}", style="List Bullet")
+                    docx_template.add_paragraph(doc, f"- {note}", "List Bullet")
     else:
-        doc.add_paragraph("No detailed release notes provided.")
-    doc.add_paragraph()
+        docx_template.add_paragraph(doc, "No detailed release notes provided.")
+    docx_template.add_paragraph(doc)
 
     # Section 3: Known Issues
-    doc.add_heading("3. Known Issues", level=2)
+    docx_template.add_heading(doc, "3. Known Issues", level=2)
     known_issues = ai_known or release_info.get('known_issues', [])
     if known_issues:
         for issue in known_issues:
-            doc.add_paragraph(f"- {issue}", style="List Bullet")
+            docx_template.add_paragraph(doc, f"- {issue}", "List Bullet")
     else:
-        doc.add_paragraph("No known issues reported in this release.")
-    doc.add_paragraph()
+        docx_template.add_paragraph(doc, "No known issues reported in this release.")
+    docx_template.add_paragraph(doc)
 
     # Section 4: Deployment Checklist
-    doc.add_heading("4. Deployment Checklist", level=2)
+    docx_template.add_heading(doc, "4. Deployment Checklist", level=2)
     if checklist:
         for item in checklist:
-            doc.add_paragraph(f"✅ {item}", style="List Bullet")
+            docx_template.add_paragraph(doc, f"✅ {item}", "List Bullet")
     else:
-        doc.add_paragraph("No deployment checklist provided.")
-    doc.add_paragraph()
+        docx_template.add_paragraph(doc, "No deployment checklist provided.")
+    docx_template.add_paragraph(doc)
 
     # Section 5: Stakeholders & Approvals
-    doc.add_heading("5. Stakeholders & Approvals", level=2)
+    docx_template.add_heading(doc, "5. Stakeholders & Approvals", level=2)
     if stakeholders:
         for stakeholder in stakeholders:
-            doc.add_paragraph(f"- {stakeholder}", style="List Bullet")
+            docx_template.add_paragraph(doc, f"- {stakeholder}", "List Bullet")
     else:
-        doc.add_paragraph("No stakeholder information provided.")
-    doc.add_paragraph()
+        docx_template.add_paragraph(doc, "No stakeholder information provided.")
+    docx_template.add_paragraph(doc)
 
     # Section 6: Supporting Links
-    doc.add_heading("6. Supporting Links", level=2)
+    docx_template.add_heading(doc, "6. Supporting Links", level=2)
     links = release_info.get('links', [])
     if links:
         for label, url in links:
-            p = doc.add_paragraph()
+            p = docx_template.add_paragraph(doc)
             p.add_run(f"{label}: ")
             add_hyperlink(p, url, url)
     else:
-        doc.add_paragraph("Pending technical documentation link.")
-    doc.add_paragraph()
+        docx_template.add_paragraph(doc, "Pending technical documentation link.")
+    docx_template.add_paragraph(doc)
 
     # Footer
-    doc.add_paragraph("This document was automatically generated using GPT-4 AI Release Assistant.", style="Intense Quote")
+    docx_template.add_paragraph(doc, "This document was automatically generated using GPT-4 AI Release Assistant.", "Intense Quote")
 
     # Save document
     output_path = os.path.join("static", filename)
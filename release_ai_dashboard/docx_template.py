@@ -0,0 +1,241 @@
+import copy
+import threading
+import weakref
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+from docx.document import Document as DocxDocument
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.opc.part import XmlPart
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+from docx.text.paragraph import Paragraph
+
+# Render de .docx sobre plantillas precargadas.
+# Document() vuelve a parsear estilos, numeración, settings y tema en cada llamada, y
+# pedir un estilo por nombre (style="List Bullet") recorre todos los estilos del
+# documento: ~2 ms por párrafo. Acá cada plantilla (estilos + bloque de encabezado) se
+# arma una vez por hilo; cada documento nuevo es una copia del body de la plantilla con
+# los slots ({version_tag}, ...) completados, los estilos se resuelven por id desde un
+# dict y las partes que no cambian (estilos, numeración, tema...) se serializan una vez.
+#
+# Cada módulo registra su plantilla con @template("nombre") junto al generador que la usa.
+#
+# Tablas grandes y links van por un camino rápido (add_table_rows / add_hyperlink): las
+# filas, runs e hyperlinks se clonan de elementos ya armados en vez de crearlos nodo por
+# nodo con python-docx, y el rId de cada URL se cachea por documento (relate_to busca
+# linealmente entre todas las relaciones en cada link).
+#
+# Usa internals de python-docx (part._element, blob de las partes): la versión está
+# fijada en requirements.txt.
+
+_builders = {}
+_style_ids = {}
+_local = threading.local()
+
+W_T = qn("w:t")
+W_TC_PR = qn("w:tcPr")
+W_SECT_PR = qn("w:sectPr")
+XML_SPACE = qn("xml:space")
+
+_RUN = parse_xml(f"<w:r {nsdecls('w')}><w:t/></w:r>")
+_HYPERLINK = parse_xml(
+    f"<w:hyperlink {nsdecls('w', 'r')}><w:r><w:rPr>"
+    '<w:color w:val="0000FF"/><w:u w:val="single"/>'
+    "</w:rPr><w:t/></w:r></w:hyperlink>"
+)
+_EMPTY_P = parse_xml(f"<w:p {nsdecls('w')}/>")
+_EMPTY_RUN = parse_xml(f"<w:r {nsdecls('w')}/>")
+
+_styled_paragraphs = {}
+
+# Por parte del documento: {"next": n, url: rId}
+_hyperlink_ids = weakref.WeakKeyDictionary()
+
+
+def template(name):
+    """Registra fn(doc) como la plantilla `name`: estilos y bloque fijo, con slots "{...}"."""
+    def register(fn):
+        _builders[name] = fn
+        return fn
+    return register
+
+
+@template("base")
+def _base(doc):
+    pass
+
+
+def _freeze_static_parts(doc):
+    # Las partes XML que no son el body no cambian entre documentos: se guarda el XML
+    # serializado una vez y doc.save() lo reutiliza en vez de volver a serializar.
+    for part in doc.part.package.iter_parts():
+        if isinstance(part, XmlPart) and part is not doc.part:
+            blob = part.blob
+            part.__class__ = type(f"Frozen{type(part).__name__}", (type(part),), {"blob": property(lambda self, blob=blob: blob)})
+
+
+class _Template:
+    def __init__(self, name):
+        doc = Document()
+        _builders[name](doc)
+        for style_type in (WD_STYLE_TYPE.PARAGRAPH, WD_STYLE_TYPE.TABLE):
+            default = doc.styles.default(style_type)
+            for style in doc.styles:
+                if style.type == style_type:
+                    # El estilo por defecto no se escribe (igual que python-docx)
+                    _style_ids[style.name] = None if style == default else style.style_id
+        self.part = doc.part
+        self.element = copy.deepcopy(doc.element)
+        self.rel_ids = set(doc.part.rels)
+        _freeze_static_parts(doc)
+
+
+def new_document(name="base", **slots):
+    """
+    Documento listo para llenar, copiado de la plantilla `name` con los slots completados.
+    Las partes de la plantilla se reutilizan por hilo: pedir otro documento de la misma
+    plantilla invalida el anterior (guardarlo antes).
+    """
+    templates = _local.__dict__.setdefault("templates", {})
+    tpl = templates.get(name)
+    if tpl is None:
+        tpl = templates[name] = _Template(name)
+
+    # El XML del documento anterior no se toca: queda en su propio árbol hasta que no
+    # lo referencie nadie (vaciarlo con proxies vivos obliga a lxml a mudarlo nodo por nodo)
+    part = tpl.part
+    element = copy.deepcopy(tpl.element)
+    part._element = element
+    # Hyperlinks del documento anterior
+    rels = part.rels
+    for r_id in [r_id for r_id in rels if r_id not in tpl.rel_ids]:
+        del rels[r_id]
+    _hyperlink_ids.pop(part, None)
+
+    if slots:
+        for text in element.iter(W_T):
+            if text.text and "{" in text.text:
+                text.text = text.text.format_map(slots)
+    return part.document
+
+
+def _paragraph_template(style_id):
+    # <w:p> vacío con el estilo ya puesto, uno por estilo
+    p = _styled_paragraphs.get(style_id)
+    if p is None:
+        p = copy.deepcopy(_EMPTY_P)
+        if style_id:
+            p.style = style_id
+        _styled_paragraphs[style_id] = p
+    return p
+
+
+def add_paragraph(container, text="", style=None):
+    """
+    Como container.add_paragraph(text, style) pero con el estilo resuelto por id. En el
+    body del documento el párrafo va directo antes de <w:sectPr> (python-docx lo busca
+    recorriendo todos los párrafos, cuadrático en documentos largos).
+    """
+    style_id = _style_ids[style] if style else None
+    if not isinstance(container, DocxDocument):
+        paragraph = container.add_paragraph(text)
+        if style_id:
+            paragraph._p.style = style_id
+        return paragraph
+
+    body = container.element.body
+    p = copy.deepcopy(_paragraph_template(style_id))
+    if text:
+        p.append(_run(text))
+    # body[-1] es O(1); len(body) recorre todos los hijos
+    try:
+        last = body[-1]
+    except IndexError:
+        last = None
+    if last is not None and last.tag == W_SECT_PR:
+        last.addprevious(p)
+    else:
+        body.append(p)
+    return Paragraph(p, container._body)
+
+
+def add_heading(container, text, level=1):
+    return add_paragraph(container, text, "Title" if level == 0 else f"Heading {level}")
+
+
+def set_table_style(table, style):
+    table._tbl.tblStyle_val = _style_ids[style]
+
+
+def _run(text):
+    if not text:
+        return copy.deepcopy(_EMPTY_RUN)
+    if "\t" in text or "\n" in text or "\r" in text:
+        run = copy.deepcopy(_RUN)
+        run.text = text  # python-docx convierte tabs y saltos en <w:tab/> / <w:br/>
+        return run
+    run = copy.deepcopy(_RUN)
+    t = run[0]
+    t.text = text
+    if len(text.strip()) < len(text):
+        t.set(XML_SPACE, "preserve")
+    return run
+
+
+def _hyperlink_id(part, url):
+    ids = _hyperlink_ids.get(part)
+    if ids is None:
+        # Primer link del documento: toma los que ya existan
+        ids = _hyperlink_ids[part] = {"next": 1}
+        for rel in part.rels.values():
+            if rel.is_external and rel.reltype == RT.HYPERLINK:
+                ids.setdefault(rel.target_ref, rel.rId)
+    r_id = ids.get(url)
+    if r_id is None:
+        # Misma numeración que relate_to (primer rIdN libre), pero el contador solo avanza:
+        # relate_to recorre todas las relaciones en cada URL nueva y se vuelve cuadrático
+        while f"rId{ids['next']}" in part.rels:
+            ids["next"] += 1
+        r_id = ids[url] = f"rId{ids['next']}"
+        part.rels.add_relationship(RT.HYPERLINK, url, r_id, is_external=True)
+    return r_id
+
+
+def _hyperlink(part, text, url):
+    hyperlink = copy.deepcopy(_HYPERLINK)
+    hyperlink.set(qn("r:id"), _hyperlink_id(part, url))
+    hyperlink[0][1].text = text
+    return hyperlink
+
+
+def add_hyperlink(paragraph, text, url):
+    """Link azul subrayado al final del párrafo; una sola relación por URL en el documento."""
+    paragraph._p.append(_hyperlink(paragraph.part, text, url))
+
+
+def add_table_rows(table, rows):
+    """
+    Agrega filas en bloque. Cada fila es una secuencia de celdas y cada celda es:
+    - un str: igual que cell.text = valor,
+    - una tupla de partes (str o (texto, url) para un link) que se agregan a un párrafo.
+    Las filas se clonan de un prototipo con el mismo ancho de columnas que la tabla.
+    """
+    tbl = table._tbl
+    part = table.part
+    prototype = copy.deepcopy(tbl.tr_lst[0])
+    for tc in prototype.tc_lst:
+        for child in list(tc):
+            if child.tag != W_TC_PR:
+                tc.remove(child)
+
+    for values in rows:
+        tr = copy.deepcopy(prototype)
+        for tc, value in zip(tr.tc_lst, values):
+            p = copy.deepcopy(_EMPTY_P)
+            if isinstance(value, str):
+                p.append(_run(value))
+            else:
+                for item in value:
+                    p.append(_run(item) if isinstance(item, str) else _hyperlink(part, *item))
+            tc.append(p)
+        tbl.append(tr)
@@ -1,32 +1,110 @@
 import os
-import requests
 from requests.auth import HTTPBasicAuth
+from release_ai_dashboard import http_utils, ticket_cache
+from release_ai_dashboard.models import Ticket
 
 JIRA_EMAIL = os.getenv("JIRA_EMAIL")
 JIRA_TOKEN = os.getenv("JIRA_API_TOKEN")
 JIRA_URL = os.getenv("JIRA_BASE_URL")
 
+# Solo pedimos los campos que usamos
+JIRA_FIELDS = ["summary", "status", "customfield_10014"]
+JIRA_SEARCH_CHUNK_SIZE = 100
+
+
 def fetch_jira_ticket_details(ticket_id):
     url = f"{JIRA_URL}/rest/api/3/issue/{ticket_id}"
     auth = HTTPBasicAuth(JIRA_EMAIL, JIRA_TOKEN)
     headers = {"Accept": "application/json"}
-    response = requests.get(url, headers=headers, auth=auth)
+    response = http_utils.get(url, headers=headers, auth=auth)
 
     if response.status_code == 200:
         data = response.json()
-        fields = data["fields"]
-        return {
-            "id": ticket_id,
-            "summary": fields.get("summary", ""),
-            "status": fields.get("status", {}).get("name", ""),
-            "url": f"{JIRA_URL}/browse/{ticket_id}",
-            "epic": fields.get("customfield_10014", "Other") or "Other"
+        return Ticket.from_jira(ticket_id, data["fields"], JIRA_URL)
+
+    return Ticket.not_found(ticket_id, JIRA_URL)
+
+
+def _search_jira_issues(keys, fields, base_url, auth):
+    """Busca keys con JQL `key in (...)` en chunks paralelos; devuelve {key: fields}."""
+    headers = {"Accept": "application/json", "Content-Type": "application/json"}
+    url = f"{base_url}/rest/api/3/search"
+    chunks = [
+        keys[start:start + JIRA_SEARCH_CHUNK_SIZE]
+        for start in range(0, len(keys), JIRA_SEARCH_CHUNK_SIZE)
+    ]
+
+    def search_chunk(chunk):
+        payload = {
+            "jql": f"key in ({', '.join(chunk)})",
+            "fields": fields,
+            "maxResults": len(chunk),
+            # "warn" evita que una sola key inexistente tire abajo toda la búsqueda
+            "validateQuery": "warn",
         }
+        response = http_utils.post(url, headers=headers, auth=auth, json=payload)
+        if response.status_code != 200:
+            print(f"❌ Error en búsqueda JQL de Jira: {response.status_code} {response.text}")
+            return []
+        return response.json().get("issues", [])
+
+    # Los chunks se buscan en paralelo (con límite por host)
+    found = {}
+    for issues in http_utils.map_concurrently(search_chunk, chunks):
+        for issue in issues:
+            found[issue["key"]] = issue.get("fields", {})
+    return found
+
+
+def fetch_jira_tickets_details(ticket_ids, base_url=None, email=None, token=None, use_cache=True):
+    """
+    Enriquecimiento en bloque: resuelve todos los tickets con búsquedas JQL
+    `key in (...)` de hasta JIRA_SEARCH_CHUNK_SIZE keys, en vez de un GET por ticket.
+    Los tickets pasan primero por el cache local (ver ticket_cache); los vencidos
+    se revalidan pidiendo solo `updated` y se vuelven a descargar si cambiaron.
+
+    Devuelve (tickets, missing): lista de Ticket en el mismo orden que ticket_ids;
+    missing son las keys que Jira no devolvió.
+    """
+    base_url = base_url or JIRA_URL
+    auth = HTTPBasicAuth(email or JIRA_EMAIL, token or JIRA_TOKEN)
+
+    # Sin duplicados, respetando el orden original
+    unique_ids = list(dict.fromkeys(ticket_ids))
+
+    if use_cache and not ticket_cache.JIRA_CACHE_DISABLED:
+        cached, stale, to_fetch = ticket_cache.lookup(unique_ids)
+        ticket_cache.stats["hits"] += len(cached)
+
+        if stale:
+            current = _search_jira_issues(list(stale), ["updated"], base_url, auth)
+            unchanged = [k for k, updated in stale.items() if k in current and current[k].get("updated") == updated]
+            if unchanged:
+                ticket_cache.touch(unchanged, refreshed=True)
+                fresh, _, _ = ticket_cache.lookup(unchanged)
+                cached.update(fresh)
+                ticket_cache.stats["revalidated"] += len(unchanged)
+            to_fetch += [k for k in stale if k not in cached]
+    else:
+        cached, to_fetch = {}, unique_ids
+
+    found = _search_jira_issues(to_fetch, JIRA_FIELDS + ["updated"], base_url, auth) if to_fetch else {}
+    fetched = {k: Ticket.from_jira(k, fields, base_url) for k, fields in found.items()}
+    if use_cache and not ticket_cache.JIRA_CACHE_DISABLED:
+        ticket_cache.stats["misses"] += len(to_fetch)
+        ticket_cache.store([(fetched[k], found[k].get("updated")) for k in fetched])
+
+    tickets = []
+    missing = []
+    for ticket_id in unique_ids:
+        ticket = cached.get(ticket_id) or fetched.get(ticket_id)
+        if ticket:
+            tickets.append(ticket)
+        else:
+            missing.append(ticket_id)
+            tickets.append(Ticket.not_found(ticket_id, base_url))
+
+    if missing:
+        print(f"⚠️ Tickets no encontrados en Jira ({len(missing)}): {', '.join(missing)}")
 
-    return {
-        "id": ticket_id,
-        "summary": "Not found",
-        "status": "Unknown",
-        "url": f"{JIRA_URL}/browse/{ticket_id}",
-        "epic": "Other"
-    }
+    return tickets, missing
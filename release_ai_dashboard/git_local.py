@@ -0,0 +1,127 @@
+import os
+import subprocess
+from release_ai_dashboard import tag_index
+from release_ai_dashboard.cache_utils import cache_path
+from release_ai_dashboard.github_cache import get_github
+
+# Backend sobre un clone local (GITHUB_BACKEND=git), pensado para Actions donde el
+# checkout ya está: tags con `git for-each-ref` y commits con `git log prev..cur`,
+# sin llamadas a la API. GIT_REPO_PATH es el checkout del repo de REPO_GITHUB (no el
+# del action: sus tags irían al índice compartido con REST y GraphQL). Sin
+# GIT_REPO_PATH y con GIT_REPO_URL se clona sin blobs (--filter=blob:none) en
+# RELEASE_CACHE_DIR: para los mensajes de commit alcanza con el historial.
+# Ojo con los checkouts shallow (fetch-depth: 1): sin el commit del tag anterior
+# `git log` falla; usar fetch-depth: 0 o dejar que se clone con el filtro.
+# Con GITHUB_TOKEN se valida que el tag tenga un release, igual que los otros backends.
+
+GIT_REPO_PATH = os.getenv("GIT_REPO_PATH")
+GIT_REPO_URL = os.getenv("GIT_REPO_URL")
+
+# Separadores de git log: NUL entre sha y mensaje, RS entre commits
+LOG_FORMAT = "%H%x00%B%x1e"
+
+
+def _git(path, *args):
+    return subprocess.run(
+        ["git", "-C", path, *args], check=True, capture_output=True, text=True, encoding="utf-8"
+    ).stdout
+
+
+def _origin_matches(path, repo_name):
+    # Sin remote "origin" (mirror local, clone a mano) no hay con qué comparar
+    result = subprocess.run(["git", "-C", path, "remote", "get-url", "origin"], capture_output=True, text=True)
+    if result.returncode != 0:
+        return True
+    url = result.stdout.strip().lower()
+    url = url[:-len(".git")] if url.endswith(".git") else url
+    return url.endswith(f"/{repo_name.lower()}") or url.endswith(f":{repo_name.lower()}")
+
+
+class GitBackend:
+    """Backend de release_utils.get_release_data sobre un clone local."""
+
+    def __init__(self, repo_name, path=None, token=None):
+        self.repo_name = repo_name
+        self.token = token
+        self._repo = None
+        self.path = path or GIT_REPO_PATH
+        if not self.path:
+            if not GIT_REPO_URL:
+                raise ValueError("GITHUB_BACKEND=git necesita GIT_REPO_PATH (checkout del repo) o GIT_REPO_URL")
+            self.path = cache_path(os.path.join("repos", repo_name.replace("/", "__")))
+        if not os.path.exists(self.path) and GIT_REPO_URL:
+            print(f"📥 Clonando {GIT_REPO_URL} (sin blobs) en {self.path}")
+            subprocess.run(
+                ["git", "clone", "--quiet", "--filter=blob:none", "--no-checkout", GIT_REPO_URL, self.path],
+                check=True,
+            )
+        if not os.path.isdir(self.path):
+            raise ValueError(f"GIT_REPO_PATH no existe: {self.path}")
+        if not _origin_matches(self.path, repo_name):
+            raise ValueError(f"El clone en {self.path} no es de {repo_name} (revisar GIT_REPO_PATH)")
+
+    def _check_release(self, version_tag):
+        """Mismo chequeo que REST y GraphQL: el tag tiene que tener un release publicado."""
+        if not self.token:
+            print(f"⚠️ Sin GITHUB_TOKEN no se puede verificar que exista un release para {version_tag}")
+            return
+        if self._repo is None:
+            self._repo = get_github(self.token).get_repo(self.repo_name)
+        if not tag_index.get_release(self._repo, version_tag, revalidate=False):
+            raise ValueError(f"No existe un release para {version_tag}")
+
+    def refresh_tags(self):
+        """Tags locales ({nombre: sha del commit}) al índice compartido; los anotados se resuelven al commit."""
+        tags = {}
+        output = _git(self.path, "for-each-ref", "--format=%(refname:strip=2) %(objectname) %(*objectname)", "refs/tags")
+        for line in output.splitlines():
+            name, sha, peeled = (line.split(" ") + [""])[:3]
+            tags[name] = peeled or sha
+        return tag_index.set_tags(self.repo_name, tags)
+
+    def resolve(self, version_tag, base_tag=None):
+        """(current_sha, previous_tag, previous_sha); relee los tags solo si falta alguno."""
+        index = tag_index.load_index(self.repo_name)
+        if version_tag not in index["tags"] or (base_tag and base_tag not in index["tags"]):
+            if GIT_REPO_URL:
+                _git(self.path, "fetch", "--quiet", "--tags", "--filter=blob:none", "origin")
+            index = self.refresh_tags()
+        if version_tag not in index["tags"]:
+            raise ValueError(f"No existe el tag {version_tag}")
+        self._check_release(version_tag)
+        previous_tag = base_tag or index["previous"].get(version_tag)
+        previous_sha = index["tags"].get(previous_tag) if previous_tag else None
+        return index["tags"][version_tag], previous_tag if previous_sha else None, previous_sha
+
+    def is_ancestor(self, sha, head_sha):
+        """True si sha es ancestro de head_sha (`git merge-base --is-ancestor`)."""
+        result = subprocess.run(["git", "-C", self.path, "merge-base", "--is-ancestor", sha, head_sha], capture_output=True)
+        if result.returncode not in (0, 1):
+            raise RuntimeError(f"git merge-base {sha} {head_sha} falló ({result.returncode})")
+        return result.returncode == 0
+
+    def iter_commits(self, base_sha, head_sha, limit=None):
+        """(sha, message) del más nuevo al más viejo, leyendo `git log` a medida que sale."""
+        args = ["git", "-C", self.path, "log", f"--format={LOG_FORMAT}"]
+        if limit:
+            args.append(f"--max-count={limit}")
+        args.append(f"{base_sha}..{head_sha}" if base_sha else head_sha)
+
+        process = subprocess.Popen(args, stdout=subprocess.PIPE, text=True, encoding="utf-8", errors="replace")
+        try:
+            pending = ""
+            for chunk in iter(lambda: process.stdout.read(65536), ""):
+                records = (pending + chunk).split("\x1e")
+                pending = records.pop()
+                for record in records:
+                    sha, _, message = record.lstrip("\n").partition("\x00")
+                    yield sha, message
+        except GeneratorExit:
+            # El consumidor cortó antes (base encontrada, límite): no hace falta el resto
+            process.kill()
+            raise
+        finally:
+            process.stdout.close()
+            process.wait()
+        if process.returncode != 0:
+            raise RuntimeError(f"git log {base_sha}..{head_sha} falló ({process.returncode})")
@@ -0,0 +1,210 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from github import Github
+from github.Requester import Requester, HTTPRequestsConnectionClass, HTTPSRequestsConnectionClass
+from release_ai_dashboard.cache_utils import cache_path
+
+# Cache HTTP persistente para las llamadas REST de PyGithub (SQLite en RELEASE_CACHE_DIR).
+# Cada GET guarda el ETag / Last-Modified de la respuesta; la próxima vez se manda como
+# If-None-Match / If-Modified-Since y un 304 (que GitHub no descuenta del rate limit)
+# se responde con el cuerpo guardado. Con GITHUB_CACHE_MAX_AGE > 0 las respuestas más
+# nuevas que eso se sirven sin red (ojo: un tag recién creado puede tardar en verse).
+
+# API REST de GitHub (otra para GitHub Enterprise o un stub local)
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+GITHUB_CACHE_MAX_AGE = int(os.getenv("GITHUB_CACHE_MAX_AGE", "0"))
+GITHUB_CACHE_MAX_ENTRIES = int(os.getenv("GITHUB_CACHE_MAX_ENTRIES", "5000"))
+GITHUB_CACHE_DISABLED = os.getenv("GITHUB_CACHE_DISABLED", "false").lower() == "true"
+
+RATE_LIMIT_HEADERS = ("x-ratelimit-limit", "x-ratelimit-remaining", "x-ratelimit-reset", "x-ratelimit-used")
+
+_lock = threading.Lock()
+_conn = None
+
+stats = {"requests": 0, "hits": 0, "revalidated": 0, "misses": 0, "rate_remaining": None, "rate_limit": None}
+
+
+def _get_conn():
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(cache_path("github_http.sqlite"), check_same_thread=False)
+        _conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        _conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)")
+        _conn.commit()
+    return _conn
+
+
+def _cache_key(request):
+    # El token entra en la clave (hasheado): otro token puede ver otros datos
+    parts = [request.url, request.headers.get("Accept", ""), request.headers.get("Authorization", "")]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _load(key):
+    with _lock:
+        row = _get_conn().execute(
+            "SELECT headers, body, fetched_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+    if row is None:
+        return None
+    return {"headers": json.loads(row[0]), "body": row[1], "fetched_at": row[2]}
+
+
+def _store(key, url, headers, body):
+    now = time.time()
+    with _lock:
+        conn = _get_conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, url, headers, body, fetched_at, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, url, json.dumps(headers), body, now, now),
+        )
+        conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (GITHUB_CACHE_MAX_ENTRIES,),
+        )
+        conn.commit()
+
+
+def _touch(key, refreshed):
+    now = time.time()
+    with _lock:
+        conn = _get_conn()
+        if refreshed:
+            conn.execute("UPDATE responses SET last_access = ?, fetched_at = ? WHERE key = ?", (now, now, key))
+        else:
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        conn.commit()
+
+
+def _record_rate_limit(headers):
+    if "x-ratelimit-remaining" in headers:
+        stats["rate_remaining"] = int(float(headers["x-ratelimit-remaining"]))
+    if "x-ratelimit-limit" in headers:
+        stats["rate_limit"] = int(float(headers["x-ratelimit-limit"]))
+
+
+def _cached_response(request, cached, headers):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = cached["body"]
+    response.encoding = "utf-8"
+    response.url = request.url
+    response.request = request
+    return response
+
+
+class ConditionalCacheAdapter(HTTPAdapter):
+    """HTTPAdapter que cachea los GET con validadores (ETag / Last-Modified)."""
+
+    def _send(self, request, **kwargs):
+        # "requests" cuenta solo lo que sale a la red; los hits sin red van en "hits"
+        stats["requests"] += 1
+        response = super().send(request, **kwargs)
+        _record_rate_limit(response.headers)
+        return response
+
+    def send(self, request, stream=False, **kwargs):
+        if request.method != "GET" or stream or GITHUB_CACHE_DISABLED:
+            return self._send(request, stream=stream, **kwargs)
+
+        key = _cache_key(request)
+        cached = _load(key)
+        if cached and GITHUB_CACHE_MAX_AGE and time.time() - cached["fetched_at"] < GITHUB_CACHE_MAX_AGE:
+            stats["hits"] += 1
+            _touch(key, refreshed=False)
+            return _cached_response(request, cached, cached["headers"])
+
+        if cached:
+            if cached["headers"].get("etag"):
+                request.headers["If-None-Match"] = cached["headers"]["etag"]
+            if cached["headers"].get("last-modified"):
+                request.headers["If-Modified-Since"] = cached["headers"]["last-modified"]
+
+        response = self._send(request, stream=stream, **kwargs)
+
+        if response.status_code == 304 and cached:
+            stats["revalidated"] += 1
+            # Se devuelve otra Response: leer la del 304 (sin cuerpo) devuelve la conexión al pool
+            response.content
+            _touch(key, refreshed=True)
+            # El cuerpo es el guardado; los headers de rate limit son los de ahora
+            headers = dict(cached["headers"])
+            headers.update({h: response.headers[h] for h in RATE_LIMIT_HEADERS if h in response.headers})
+            return _cached_response(request, cached, headers)
+
+        if response.status_code == 200:
+            stats["misses"] += 1
+            headers = {k.lower(): v for k, v in response.headers.items()}
+            if headers.get("etag") or headers.get("last-modified"):
+                _store(key, request.url, headers, response.content)
+        return response
+
+
+def _mount_cache(connection):
+    adapter = ConditionalCacheAdapter(
+        max_retries=connection.retry,
+        pool_connections=connection.pool_size,
+        pool_maxsize=connection.pool_size,
+    )
+    connection.adapter = adapter
+    connection.session.mount(f"{connection.protocol}://", adapter)
+
+
+class CachedHTTPSConnection(HTTPSRequestsConnectionClass):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        _mount_cache(self)
+
+
+class CachedHTTPConnection(HTTPRequestsConnectionClass):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        _mount_cache(self)
+
+
+def _install_connection_classes():
+    Requester.injectConnectionClasses(CachedHTTPConnection, CachedHTTPSConnection)
+    # injectConnectionClasses además apaga la conexión persistente del Requester (pensado
+    # para mocks): cada llamada abriría una sesión y un TLS nuevos y cerraría la anterior,
+    # también la que usa otro hilo (prefetch de páginas). Se vuelve a prender para que el
+    # pool keep-alive de la sesión se reutilice entre llamadas.
+    Requester._Requester__persist = True
+
+
+def get_github(token):
+    """Cliente PyGithub con el cache condicional instalado (con GITHUB_CACHE_DISABLED solo cuenta llamadas)."""
+    _install_connection_classes()
+    return Github(token, base_url=GITHUB_API_URL, per_page=100, lazy=True)
+
+
+def reset_stats():
+    stats.update({"requests": 0, "hits": 0, "revalidated": 0, "misses": 0, "rate_remaining": None, "rate_limit": None})
+
+
+def format_stats():
+    rate = (
+        f"{stats['rate_remaining']}/{stats['rate_limit']} requests restantes"
+        if stats["rate_remaining"] is not None else "rate limit desconocido"
+    )
+    return (
+        f"🗃️ Cache de GitHub: {stats['requests']} llamadas a la API ({stats['revalidated']} revalidadas con 304, "
+        f"{stats['misses']} descargas completas), {stats['hits']} servidas del cache sin red; {rate}"
+    )
@@ -0,0 +1,305 @@
+import os
+from release_ai_dashboard import http_utils, tag_index
+
+# Backend GraphQL de GitHub (GITHUB_BACKEND=graphql).
+# Una sola query (resolve) trae el release, el commit de los dos tags y la primera
+# página del rango; las páginas siguientes son una query chica cada una. Con REST eso eran
+# get_release + get_git_ref/get_commit por tag + compare, todo en serie.
+#
+# El rango tag_anterior..tag sale de Ref.compare (igual que compare en REST: los commits
+# de head que no son ancestros de base, con merge-base), no de recorrer `history` hasta
+# el commit del tag anterior: ese recorrido es por fecha, así que perdía commits de ramas
+# mergeadas más viejos que la base y no terminaba nunca si la base no era ancestro de head.
+
+GITHUB_GRAPHQL_URL = os.getenv("GITHUB_GRAPHQL_URL", "https://api.github.com/graphql")
+HISTORY_PAGE_SIZE = 100
+
+stats = {"queries": 0}
+
+# oid del commit al que apunta un ref (tag liviano o anotado)
+TARGET_FIELDS = """
+  target {
+    oid
+    ... on Tag { target { oid } }
+  }
+"""
+
+HISTORY_FIELDS = """
+  history(first: $pageSize, after: $cursor) @skip(if: $hasBase) {
+    pageInfo { hasNextPage endCursor }
+    nodes { oid message }
+  }
+"""
+
+# compare pagina del más viejo al más nuevo: se pide desde el final (last/before)
+COMPARE_FIELDS = """
+  compare(headRef: $headRef) {
+    commits(last: $pageSize, before: $cursor) {
+      pageInfo { hasPreviousPage startCursor }
+      nodes { oid message }
+    }
+  }
+"""
+
+RELEASE_QUERY = """
+query($owner: String!, $name: String!, $tag: String!, $headRef: String!, $previousRef: String!,
+      $hasBase: Boolean!, $pageSize: Int!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    release(tagName: $tag) { description publishedAt }
+    current: ref(qualifiedName: $headRef) {
+      target {
+        oid
+        ... on Commit { %(history)s }
+        ... on Tag { target { oid ... on Commit { %(history)s } } }
+      }
+    }
+    previous: ref(qualifiedName: $previousRef) @include(if: $hasBase) { %(target)s %(compare)s }
+  }
+}
+""" % {"history": HISTORY_FIELDS, "target": TARGET_FIELDS, "compare": COMPARE_FIELDS}
+
+HISTORY_QUERY = """
+query($owner: String!, $name: String!, $oid: GitObjectID!, $pageSize: Int!, $cursor: String, $hasBase: Boolean = false) {
+  repository(owner: $owner, name: $name) {
+    object(oid: $oid) { ... on Commit { %(history)s } }
+  }
+}
+""" % {"history": HISTORY_FIELDS}
+
+COMPARE_QUERY = """
+query($owner: String!, $name: String!, $baseRef: String!, $headRef: String!, $pageSize: Int!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    ref(qualifiedName: $baseRef) { %(compare)s }
+  }
+}
+""" % {"compare": COMPARE_FIELDS}
+
+# status: AHEAD, BEHIND, DIVERGED o IDENTICAL (de headRef respecto del ref)
+STATUS_QUERY = """
+query($owner: String!, $name: String!, $baseRef: String!, $headRef: String!) {
+  repository(owner: $owner, name: $name) {
+    ref(qualifiedName: $baseRef) { compare(headRef: $headRef) { status } }
+  }
+}
+"""
+
+TAGS_QUERY = """
+query($owner: String!, $name: String!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    refs(refPrefix: "refs/tags/", first: 100, after: $cursor) {
+      pageInfo { hasNextPage endCursor }
+      nodes { name %(target)s }
+    }
+  }
+}
+""" % {"target": TARGET_FIELDS}
+
+
+def _query(token, query, variables):
+    stats["queries"] += 1
+    headers = {"Authorization": f"bearer {token}", "Accept": "application/json"}
+    response = http_utils.post(GITHUB_GRAPHQL_URL, headers=headers, json={"query": query, "variables": variables})
+    if response.status_code != 200:
+        raise RuntimeError(f"GraphQL HTTP {response.status_code}: {response.text[:200]}")
+    payload = response.json()
+    if payload.get("errors"):
+        raise RuntimeError(f"GraphQL: {payload['errors'][0].get('message')}")
+    return payload["data"]["repository"]
+
+
+def _commit_oid(target):
+    # Tag anotado: el commit está un nivel más abajo
+    inner = target.get("target")
+    return inner["oid"] if inner else target["oid"]
+
+
+def refresh_tags(token, owner, name):
+    """Lista los tags paginando refs/tags y actualiza el índice local compartido."""
+    tags = {}
+    cursor = None
+    while True:
+        refs = _query(token, TAGS_QUERY, {"owner": owner, "name": name, "cursor": cursor})["refs"]
+        for node in refs["nodes"]:
+            tags[node["name"]] = _commit_oid(node["target"])
+        if not refs["pageInfo"]["hasNextPage"]:
+            break
+        cursor = refs["pageInfo"]["endCursor"]
+    return tag_index.set_tags(f"{owner}/{name}", tags)
+
+
+class GraphqlBackend:
+    """Backend de release_utils.get_release_data sobre la API GraphQL."""
+
+    def __init__(self, token, repo_name):
+        self.token = token
+        self.repo_name = repo_name
+        self.owner, self.name = repo_name.split("/", 1)
+        # Primera página (historial o compare) que ya vino con la query del release
+        self._first_pages = {}
+        # sha -> ref de los tags resueltos (compare pide refs, no SHAs)
+        self._refs = {}
+
+    def resolve(self, version_tag, base_tag=None):
+        """
+        (current_sha, previous_tag, previous_sha) en una sola query, que además trae
+        el release (para validar que existe) y la última página del compare con el tag
+        anterior (o la primera del historial si no hay tag anterior).
+        """
+        index = tag_index.load_index(self.repo_name)
+        if version_tag not in index["tags"]:
+            index = refresh_tags(self.token, self.owner, self.name)
+        previous_tag = base_tag or index["previous"].get(version_tag)
+
+        repository = _query(self.token, RELEASE_QUERY, {
+            "owner": self.owner,
+            "name": self.name,
+            "tag": version_tag,
+            "headRef": f"refs/tags/{version_tag}",
+            "previousRef": f"refs/tags/{previous_tag or version_tag}",
+            "hasBase": bool(previous_tag),
+            "pageSize": HISTORY_PAGE_SIZE,
+            "cursor": None,
+        })
+        if not repository.get("release"):
+            raise ValueError(f"No existe un release para {version_tag}")
+        if not repository.get("current"):
+            raise ValueError(f"No existe el tag {version_tag}")
+
+        target = repository["current"]["target"]
+        commit = target.get("target") or target
+        previous = repository.get("previous")
+        previous_sha = _commit_oid(previous["target"]) if previous else None
+        self._refs[commit["oid"]] = f"refs/tags/{version_tag}"
+        if previous_sha:
+            self._refs[previous_sha] = f"refs/tags/{previous_tag}"
+        if previous_sha and previous.get("compare"):
+            self._first_pages[(previous_sha, commit["oid"])] = previous["compare"]["commits"]
+        elif commit.get("history"):
+            self._first_pages[(None, commit["oid"])] = commit["history"]
+        return commit["oid"], previous_tag if previous_sha else None, previous_sha
+
+    def _tag_ref(self, sha):
+        # Los SHAs de un rango siempre salen de tags (resueltos o del índice)
+        if sha in self._refs:
+            return self._refs[sha]
+        for name, tag_sha in tag_index.load_index(self.repo_name)["tags"].items():
+            if tag_sha == sha:
+                return f"refs/tags/{name}"
+        return None
+
+    def _history_page(self, head_sha, cursor):
+        return _query(self.token, HISTORY_QUERY, {
+            "owner": self.owner,
+            "name": self.name,
+            "oid": head_sha,
+            "pageSize": HISTORY_PAGE_SIZE,
+            "cursor": cursor,
+        })["object"]["history"]
+
+    def _compare_page(self, base_ref, head_ref, cursor):
+        ref = _query(self.token, COMPARE_QUERY, {
+            "owner": self.owner,
+            "name": self.name,
+            "baseRef": base_ref,
+            "headRef": head_ref,
+            "pageSize": HISTORY_PAGE_SIZE,
+            "cursor": cursor,
+        })["ref"]
+        return ref["compare"]["commits"] if ref and ref.get("compare") else None
+
+    def is_ancestor(self, sha, head_sha):
+        """True si sha es ancestro de head_sha (status del compare AHEAD o IDENTICAL)."""
+        base_ref, head_ref = self._tag_ref(sha), self._tag_ref(head_sha)
+        ref = None
+        if base_ref and head_ref:
+            ref = _query(self.token, STATUS_QUERY, {
+                "owner": self.owner,
+                "name": self.name,
+                "baseRef": base_ref,
+                "headRef": head_ref,
+            })["ref"]
+        if not (ref and ref.get("compare")):
+            # Igual que iter_commits: sin refs de tag se pregunta al compare de REST
+            from release_ai_dashboard.release_utils import RestBackend
+            return RestBackend(self.token, self.repo_name).is_ancestor(sha, head_sha)
+        return ref["compare"]["status"] in ("AHEAD", "IDENTICAL")
+
+    def _pages(self, base_sha, head_sha):
+        """
+        Páginas de (sha, message) del más nuevo al más viejo. La página siguiente se pide
+        (con su cursor) antes de entregar la actual. None si el rango no se puede pedir por GraphQL.
+        """
+        page = self._first_pages.pop((base_sha, head_sha), None)
+        if base_sha:
+            base_ref, head_ref = self._tag_ref(base_sha), self._tag_ref(head_sha)
+            if page is None:
+                if not (base_ref and head_ref):
+                    return None
+                page = self._compare_page(base_ref, head_ref, None)
+                if page is None:
+                    return None
+
+            def fetch_next(cursor):
+                page = self._compare_page(base_ref, head_ref, cursor)
+                if page is None:
+                    # A mitad del rango no se puede seguir por otro lado sin repetir commits
+                    raise RuntimeError(f"GraphQL: compare {base_ref}..{head_ref} no disponible")
+                return page
+
+            def next_cursor(page):
+                info = page["pageInfo"]
+                return info["startCursor"] if info["hasPreviousPage"] else None
+
+            def nodes(page):
+                return reversed(page["nodes"])
+        else:
+            page = page or self._history_page(head_sha, None)
+
+            def fetch_next(cursor):
+                return self._history_page(head_sha, cursor)
+
+            def next_cursor(page):
+                info = page["pageInfo"]
+                return info["endCursor"] if info["hasNextPage"] else None
+
+            def nodes(page):
+                return page["nodes"]
+
+        def pages(page):
+            while page:
+                cursor = next_cursor(page)
+                following = http_utils.submit(fetch_next, cursor) if cursor else None
+                try:
+                    yield [(node["oid"], node["message"]) for node in nodes(page)]
+                except GeneratorExit:
+                    if following:
+                        following.cancel()
+                    raise
+                page = following.result() if following else None
+
+        return pages(page)
+
+    def iter_commits(self, base_sha, head_sha, limit=None):
+        """
+        (sha, message) de base_sha..head_sha (semántica de compare), del más nuevo al más
+        viejo, hasta limit commits. Sin base recorre el historial de head_sha.
+        """
+        pages = self._pages(base_sha, head_sha)
+        if pages is None:
+            # Algún extremo no es un tag conocido: el compare de REST acepta SHAs
+            from release_ai_dashboard.release_utils import RestBackend
+            print("ℹ️ Rango sin refs de tag para GraphQL; se usa compare de REST")
+            yield from RestBackend(self.token, self.repo_name).iter_commits(base_sha, head_sha, limit)
+            return
+
+        count = 0
+        try:
+            for page in pages:
+                for commit in page:
+                    if limit and count >= limit:
+                        return
+                    yield commit
+                    count += 1
+        finally:
+            # Cancela la página pedida por adelantado si el consumidor cortó antes
+            pages.close()
@@ -1,5 +1,6 @@
 import os
-from github import Github
+from release_ai_dashboard import tag_index
+from release_ai_dashboard.github_cache import get_github
 
 def get_release_notes(version_tag):
     token = os.getenv("GITHUB_TOKEN")
@@ -20,14 +21,13 @@ def get_release_notes(version_tag):
 """
 
     try:
-        g = Github(token)
+        g = get_github(token)
         repo = g.get_repo(repo_name)
-        releases = repo.get_releases()
+        release = tag_index.get_release(repo, version_tag)
 
-        for r in releases:
-            if r.tag_name == version_tag:
-                print(f"✅ Release encontrado: {r.tag_name}")
-                return r.body or "⚠️ Release sin contenido."
+        if release:
+            print(f"✅ Release encontrado: {version_tag}")
+            return release["body"] or "⚠️ Release sin contenido."
 
         print(f"⚠️ Release con tag {version_tag} no encontrado.")
         return f"⚠️ No se encontró un release publicado para {version_tag}."
@@ -2,10 +2,13 @@ from dotenv import load_dotenv
 import os
 import re
 from openai import OpenAI
-from docx import Document
 from docx.shared import Pt
-from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
+from release_ai_dashboard.llm_cache import chat_completion
+from release_ai_dashboard.chat_context import build_chat_messages
+from release_ai_dashboard import release_index, docx_template
+from release_ai_dashboard.release_store import diff_releases, format_diff
+from release_ai_dashboard.models import Release
+from release_ai_dashboard.docx_template import add_hyperlink
 
 DISABLE_AI = os.getenv("DISABLE_AI", "false").lower() == "true"
 
@@ -59,59 +62,74 @@ Act as a senior technical engineer. Write a professional, clear, and concise Rel
 Generate a professional summary of key changes, followed by detailed sections organized by category. Use Markdown format with headers (#), lists (-), and hyperlinks if needed. Do not include HTML tags.
 """
 
-    response = client.chat.completions.create(
+    response_text = chat_completion(
+        client,
         model="gpt-4",
         messages=[{"role": "user", "content": prompt}],
         temperature=0.2,
-    )
-    response_text = response.choices[0].message.content.strip()
+    ).strip()
     response_text = re.sub(r"\(\s*\[\s*\]\)", "", response_text)    # elimina ([])
     response_text = re.sub(r"\(\s*\[\s*\]\s*\)", "", response_text) # elimina ([ ])
     response_text = re.sub(r"\(\s*\)", "", response_text)           # elimina ()
     response_text = re.sub(r"\s*\.\.+", ".", response_text)         # elimina puntos extra como ".."
     return response_text
 
-def answer_question_with_gpt(question, release_info, history=None):
-    if DISABLE_AI:
-        print("⚠️ AI desactivada. Devolviendo respuesta fija.")
-        return "AI is currently disabled. No answer available."
-        
+def build_answer_messages(question, release_info, history=None):
     if history is None:
         history = []
 
-    version = release_info.get("version", "Unknown")
-    body = release_info.get("body", "").strip()
-    summary = release_info.get("summary", [])
-    details = release_info.get("details", [])
-    known_issues = release_info.get("known_issues", [])
+    version = release_info.version or "Unknown"
+    body = release_info.body.strip()
+    summary = release_info.summary
+    known_issues = release_info.known_issues
 
-    formatted_details = ""
-    if details and isinstance(details[0], dict):
-        formatted_details = "\n".join(f"- {d.get('ticket', '')}: {d.get('description', '')}" for d in details)
-    elif isinstance(details, list):
-        formatted_details = "\n".join(f"- {d}" for d in details)
+    formatted_details = "\n".join(f"- {d.ticket_id}: {d.description}" for d in release_info.items)
+
+    # Solo los fragmentos relevantes (de este release y de los anteriores) van al prompt
+    release_index.add_release(version, body, release_info.items)
+    release_index.refresh_docx()
+    excerpts = release_index.search(question, boost_version=version)
+
+    if excerpts:
+        notes_context = "Relevant excerpts (current and previous releases):\n" + "\n".join(
+            f"- [{e['version']}] {e['text']}" for e in excerpts
+        )
+    else:
+        notes_context = f"""Full Release Notes (from GitHub or commit logs):
+{body or "No notes available."}
+
+Details:
+{formatted_details if formatted_details else 'No detailed tickets provided.'}"""
 
     base_context = f"""
 You are an AI release assistant. You help developers and QA understand software updates clearly.
 
 Release: {version}
 
-Full Release Notes (from GitHub or commit logs):
-{body or "No notes available."}
+{notes_context}
 
 Summary of Changes:
 {', '.join(summary) if summary else 'None'}
 
-Details:
-{formatted_details if formatted_details else 'No detailed tickets provided.'}
-
 Known Issues:
 {', '.join(known_issues) if known_issues else 'None reported.'}
 """
 
-    messages = [{"role": "system", "content": base_context}]
-    messages.extend(history)
-    messages.append({"role": "user", "content": question})
+    # El dashboard ya agrega la pregunta al historial antes de llamarnos
+    if history and history[-1].get("role") == "user" and history[-1].get("content") == question:
+        history = history[:-1]
+
+    # Historial recortado al presupuesto de tokens (ver chat_context)
+    messages = build_chat_messages(client, base_context, history, question)
+
+    return messages
+
+def answer_question_with_gpt(question, release_info, history=None):
+    if DISABLE_AI:
+        print("⚠️ AI desactivada. Devolviendo respuesta fija.")
+        return "AI is currently disabled. No answer available."
+
+    messages = build_answer_messages(question, release_info, history)
 
     response = client.chat.completions.create(
         model="gpt-4",
@@ -121,123 +139,95 @@ Known Issues:
 
     return response.choices[0].message.content
 
-def compare_releases_with_gpt(release_a: dict, release_b: dict) -> str:
+def stream_answer_with_gpt(question, release_info, history=None):
+    """Igual que answer_question_with_gpt pero va devolviendo los chunks a medida que llegan."""
     if DISABLE_AI:
-        print("⚠️ AI desactivada. Devolviendo comparación genérica.")
-        return "AI comparison is currently disabled. Differences not computed."
-    def format_details(details):
-        if details and isinstance(details[0], dict):
-            return "\n".join(f"- {d.get('ticket', '')}: {d.get('description', '')}" for d in details)
-        elif isinstance(details, list):
-            return "\n".join(f"- {d}" for d in details)
-        else:
-            return ""
-
-    prompt = f"""
-Compare the following two software releases.
-
-Release A (version {release_a.get('version')}):
-Summary:
-{', '.join(release_a.get('summary', []))}
+        print("⚠️ AI desactivada. Devolviendo respuesta fija.")
+        yield "AI is currently disabled. No answer available."
+        return
 
-Detailed Notes:
-{format_details(release_a.get('details', []))}
+    messages = build_answer_messages(question, release_info, history)
 
-Known Issues:
-{', '.join(release_a.get('known_issues', [])) or 'None'}
+    stream = client.chat.completions.create(
+        model="gpt-4",
+        messages=messages,
+        temperature=0.3,
+        stream=True,
+    )
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
 
----
+def compare_releases_with_gpt(release_a: Release, release_b: Release) -> str:
+    # El diff de tickets se calcula localmente; GPT solo lo narra
+    diff_text = format_diff(diff_releases(release_a, release_b))
 
-Release B (version {release_b.get('version')}):
-Summary:
-{', '.join(release_b.get('summary', []))}
+    if DISABLE_AI:
+        print("⚠️ AI desactivada. Devolviendo el diff sin narrar.")
+        return diff_text
 
-Detailed Notes:
-{format_details(release_b.get('details', []))}
+    prompt = f"""
+Below is a precomputed, exact diff of the tickets between two software releases
+(A = {release_a.version}, B = {release_b.version}).
 
-Known Issues:
-{', '.join(release_b.get('known_issues', [])) or 'None'}
+{diff_text}
 
 Now produce a clear and structured comparison of the differences between these releases.
-Focus on:
+Use only the data above. Focus on:
 - New features or fixes added in B but not in A
 - Issues resolved or introduced
 - Key differences in ticket scope
 - Any improvements or regressions
 """
 
-    response = client.chat.completions.create(
+    response_text = chat_completion(
+        client,
         model="gpt-4",
         messages=[{"role": "user", "content": prompt}],
         temperature=0.3,
     )
-    return response.choices[0].message.content
+    return response_text
+
+@docx_template.template("professional")
+def _professional_template(doc):
+    font = doc.styles["Normal"].font
+    font.name = "Arial"
+    font.size = Pt(11)
+    doc.add_heading("📘 Release Management Document - {version_tag}", level=1)
+
 
 def generate_professional_word(version_tag, content, path="release_ai_dashboard/static"):
     if not os.path.exists(path):
         os.makedirs(path)
 
-    doc = Document()
-    style = doc.styles["Normal"]
-    font = style.font
-    font.name = "Arial"
-    font.size = Pt(11)
-
-    doc.add_heading(f"📘 Release Management Document - {version_tag}", level=1)
+    doc = docx_template.new_document("professional", version_tag=version_tag)
 
     for line in content.split("\n"):
         line = line.strip()
         if not line:
-            doc.add_paragraph()
+            docx_template.add_paragraph(doc)
             continue
         if line.startswith("# "):
-            doc.add_heading(line[2:].strip(), level=1)
+            docx_template.add_heading(doc, line[2:].strip(), level=1)
         elif line.startswith("## "):
-            doc.add_heading(line[3:].strip(), level=2)
+            docx_template.add_heading(doc, line[3:].strip(), level=2)
         elif line.startswith("### "):
-            doc.add_heading(line[4:].strip(), level=3)
+            docx_template.add_heading(doc, line[4:].strip(), level=3)
         elif line.startswith("- [") and "](" in line:
             match = re.match(r"- \[(.*?)\]\((.*?)\): (.*)", line)
             if match:
                 link_text, url, description = match.groups()
-                p = doc.add_paragraph(style='List Bullet')
+                p = docx_template.add_paragraph(doc, style="List Bullet")
                 add_hyperlink(p, f"{link_text}", url)
                 p.add_run(f": {description}")
             else:
-                doc.add_paragraph(line, style='List Bullet')
+                docx_template.add_paragraph(doc, line, "List Bullet")
         elif line.startswith("- "):
-            doc.add_paragraph(line, style='List Bullet')
+            docx_template.add_paragraph(doc, line, "List Bullet")
         else:
-            doc.add_paragraph(line)
+            docx_template.add_paragraph(doc, line)
 
     filename = f"release_{version_tag.replace('/', '-')}.docx"
     filepath = os.path.join(path, filename)
     doc.save(filepath)
     return filename
-
-def add_hyperlink(paragraph, text, url):
-    part = paragraph.part
-    r_id = part.relate_to(url, "http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink", is_external=True)
-
-    hyperlink = OxmlElement("w:hyperlink")
-    hyperlink.set(qn("r:id"), r_id)
-
-    new_run = OxmlElement("w:r")
-    rPr = OxmlElement("w:rPr")
-
-    color = OxmlElement("w:color")
-    color.set(qn("w:val"), "0000FF")
-    rPr.append(color)
-
-    underline = OxmlElement("w:u")
-    underline.set(qn("w:val"), "single")
-    rPr.append(underline)
-
-    new_run.append(rPr)
-
-    text_elem = OxmlElement("w:t")
-    text_elem.text = text
-    new_run.append(text_elem)
-
-    hyperlink.append(new_run)
-    paragraph._p.append(hyperlink)
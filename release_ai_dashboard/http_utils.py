@@ -0,0 +1,99 @@
+import os
+import threading
+from collections import deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+# Capa de transporte compartida para Jira y GitHub:
+# una Session keep-alive por host, un pool de workers acotado y un límite
+# de requests simultáneos por host para no disparar el rate limit.
+
+HTTP_MAX_WORKERS = int(os.getenv("HTTP_MAX_WORKERS", "8"))
+HTTP_MAX_PER_HOST = int(os.getenv("HTTP_MAX_PER_HOST", "4"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+# Páginas pedidas por adelantado al recorrer listados paginados (ver prefetch)
+HTTP_PREFETCH_PAGES = int(os.getenv("HTTP_PREFETCH_PAGES", "3"))
+
+_lock = threading.Lock()
+_sessions = {}
+_host_limits = {}
+_executor = None
+
+
+def _host(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def get_session(url):
+    """Session reutilizable (conexiones TLS keep-alive) para el host de la URL."""
+    host = _host(url)
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_MAX_PER_HOST)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[host] = session
+            _host_limits[host] = threading.BoundedSemaphore(HTTP_MAX_PER_HOST)
+        return session
+
+
+def request(method, url, **kwargs):
+    """Igual que requests.request pero con Session por host y límite de concurrencia."""
+    session = get_session(url)
+    kwargs.setdefault("timeout", HTTP_TIMEOUT)
+    with _host_limits[_host(url)]:
+        return session.request(method, url, **kwargs)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=HTTP_MAX_WORKERS, thread_name_prefix="http")
+        return _executor
+
+
+def map_concurrently(fn, items):
+    """Ejecuta fn(item) en el pool compartido y devuelve los resultados en orden."""
+    items = list(items)
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+    return list(_get_executor().map(fn, items))
+
+
+def submit(fn, *args):
+    """Ejecuta fn(*args) en el pool compartido y devuelve el Future."""
+    return _get_executor().submit(fn, *args)
+
+
+def prefetch(fn, items, depth=HTTP_PREFETCH_PAGES):
+    """
+    Como map_concurrently pero perezoso: devuelve fn(item) en orden a medida que se
+    consume, con a lo sumo `depth` llamadas en vuelo. items puede ser infinito
+    (itertools.count()); al cortar la iteración se cancela lo pendiente.
+    """
+    items = iter(items)
+    pending = deque(submit(fn, item) for item in islice(items, depth))
+    try:
+        while pending:
+            result = pending.popleft().result()
+            # El siguiente pedido sale antes de que el consumidor procese este resultado
+            pending.extend(submit(fn, item) for item in islice(items, 1))
+            yield result
+    finally:
+        for future in pending:
+            future.cancel()
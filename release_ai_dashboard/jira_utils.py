@@ -1,7 +1,7 @@
 import os
-import requests
-import json
 from dotenv import load_dotenv
+from release_ai_dashboard import http_utils
+from release_ai_dashboard.adf_utils import dumps_adf
 
 load_dotenv()
 
@@ -44,7 +44,7 @@ def create_jira_ticket(version_tag, adf_description):
         }
     }
 
-    response = requests.post(url, headers=headers, auth=auth, data=json.dumps(payload))
+    response = http_utils.post(url, headers=headers, auth=auth, data=dumps_adf(payload))
 
     if response.status_code == 201:
         ticket_key = response.json().get("key")
@@ -0,0 +1,104 @@
+import os
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Cola de jobs en background para el dashboard.
+# Cada job corre en un pool local y va publicando eventos de progreso por etapa;
+# el request HTTP solo recibe el job id y nunca espera a GitHub/GPT/Jira.
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", "3600"))
+
+_executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="job")
+_lock = threading.Lock()
+_jobs = {}
+
+
+def _publish(job, event):
+    with job["cond"]:
+        event["ts"] = time.time()
+        job["events"].append(event)
+        job["cond"].notify_all()
+
+
+def _run(job, fn, args):
+    job["status"] = "running"
+
+    def progress(stage, message):
+        print(f"⏳ [{job['id'][:8]}] {stage}: {message}")
+        _publish(job, {"type": "progress", "stage": stage, "message": message})
+
+    try:
+        job["result"] = fn(*args, progress=progress)
+        job["status"] = "done"
+        _publish(job, {"type": "done", "stage": "done", "message": "Release generado ✅"})
+    except Exception as e:
+        print(f"❌ Job {job['id']} falló: {e}")
+        job["status"] = "error"
+        job["error"] = str(e)
+        _publish(job, {"type": "error", "stage": "error", "message": str(e)})
+
+
+def _cleanup():
+    now = time.time()
+    with _lock:
+        expired = [
+            job_id for job_id, job in _jobs.items()
+            if job["status"] in ("done", "error") and now - job["created_at"] > JOB_TTL_SECONDS
+        ]
+        for job_id in expired:
+            del _jobs[job_id]
+
+
+def submit_job(fn, *args):
+    """
+    Encola fn(*args, progress=callback) y devuelve el job id inmediatamente.
+    fn debe llamar a progress(stage, message) en cada etapa.
+    """
+    _cleanup()
+    job = {
+        "id": uuid.uuid4().hex,
+        "status": "queued",
+        "events": [],
+        "result": None,
+        "error": None,
+        "created_at": time.time(),
+        "cond": threading.Condition(),
+    }
+    with _lock:
+        _jobs[job["id"]] = job
+    _publish(job, {"type": "progress", "stage": "queued", "message": "En cola"})
+    _executor.submit(_run, job, fn, args)
+    return job["id"]
+
+
+def get_job(job_id):
+    with _lock:
+        return _jobs.get(job_id)
+
+
+def iter_events(job_id, start=0, heartbeat=15):
+    """
+    Generador de eventos del job desde el índice `start`. Bloquea esperando eventos
+    nuevos y devuelve None cada `heartbeat` segundos para mantener viva la conexión.
+    Termina después del evento "done" o "error".
+    """
+    job = get_job(job_id)
+    if job is None:
+        return
+    index = start
+    while True:
+        with job["cond"]:
+            if index >= len(job["events"]):
+                job["cond"].wait(timeout=heartbeat)
+            new_events = job["events"][index:]
+        if not new_events:
+            yield None
+            continue
+        for event in new_events:
+            index += 1
+            yield event
+            if event["type"] in ("done", "error"):
+                return
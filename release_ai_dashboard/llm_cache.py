@@ -0,0 +1,107 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from release_ai_dashboard.cache_utils import cache_path
+
+# Cache de respuestas de OpenAI direccionado por contenido:
+# la key es el hash de (model, messages, temperature), así regenerar el mismo
+# release devuelve las respuestas en milisegundos en vez de pagar otra vuelta a GPT.
+# Dos niveles: LRU en memoria + SQLite en RELEASE_CACHE_DIR, ambos con tamaño máximo.
+
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000"))
+LLM_CACHE_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "256"))
+LLM_CACHE_BYPASS = os.getenv("LLM_CACHE_BYPASS", "false").lower() == "true"
+
+_lock = threading.Lock()
+_memory = OrderedDict()
+_conn = None
+
+stats = {"hits": 0, "misses": 0}
+
+
+def _get_conn():
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(cache_path("llm_responses.sqlite"), check_same_thread=False)
+        _conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        _conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)")
+        _conn.commit()
+    return _conn
+
+
+def make_key(model, messages, temperature):
+    raw = json.dumps([model, messages, temperature], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _remember(key, content):
+    _memory[key] = content
+    _memory.move_to_end(key)
+    while len(_memory) > LLM_CACHE_MEMORY_ENTRIES:
+        _memory.popitem(last=False)
+
+
+def get(key):
+    with _lock:
+        if key in _memory:
+            _memory.move_to_end(key)
+            return _memory[key]
+        conn = _get_conn()
+        row = conn.execute("SELECT content FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+        conn.commit()
+        _remember(key, row[0])
+        return row[0]
+
+
+def put(key, content):
+    with _lock:
+        _remember(key, content)
+        conn = _get_conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, content, last_access) VALUES (?, ?, ?)",
+            (key, content, time.time()),
+        )
+        conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (LLM_CACHE_MAX_ENTRIES,),
+        )
+        conn.commit()
+
+
+def chat_completion(client, model, messages, temperature, bypass=False):
+    """
+    Igual que client.chat.completions.create(...).choices[0].message.content,
+    pero memoizado. bypass=True (o LLM_CACHE_BYPASS=true) fuerza la llamada a GPT
+    y guarda la respuesta nueva.
+    """
+    key = make_key(model, messages, temperature)
+    if not (bypass or LLM_CACHE_BYPASS):
+        cached = get(key)
+        if cached is not None:
+            stats["hits"] += 1
+            return cached
+
+    stats["misses"] += 1
+    response = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+    )
+    content = response.choices[0].message.content
+    if content is not None:
+        put(key, content)
+    return content
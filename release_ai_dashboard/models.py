@@ -0,0 +1,118 @@
+from dataclasses import dataclass, replace
+from typing import Tuple
+
+# Tipos compactos (frozen + __slots__) para tickets, items y releases.
+# Circulan así por todo el pipeline; solo se convierten a/desde dict en los bordes
+# (cache SQLite, store de releases, sesión de Flask y prompts).
+
+JIRA_BROWSE_URL = "https://televisaunivision.atlassian.net/browse/"
+UNKNOWN_TICKET = "UNKNOWN"
+
+
+@dataclass(frozen=True, slots=True)
+class Ticket:
+    """Ticket de Jira con los campos que usamos."""
+    key: str
+    summary: str = ""
+    status: str = ""
+    url: str = ""
+    epic: str = "Other"
+
+    @classmethod
+    def from_jira(cls, key, fields, base_url):
+        return cls(
+            key=key,
+            summary=fields.get("summary", "") or "",
+            status=(fields.get("status") or {}).get("name", ""),
+            url=f"{base_url}/browse/{key}",
+            epic=fields.get("customfield_10014", "Other") or "Other",
+        )
+
+    @classmethod
+    def not_found(cls, key, base_url):
+        return cls(key=key, summary="Not found", status="Unknown", url=f"{base_url}/browse/{key}")
+
+    @classmethod
+    def from_dict(cls, data):
+        # Los tickets cacheados antes de este modelo usaban "id" en vez de "key"
+        return cls(
+            key=data.get("key") or data.get("id", ""),
+            summary=data.get("summary", ""),
+            status=data.get("status", ""),
+            url=data.get("url", ""),
+            epic=data.get("epic", "Other"),
+        )
+
+    def to_dict(self):
+        return {"key": self.key, "summary": self.summary, "status": self.status, "url": self.url, "epic": self.epic}
+
+
+@dataclass(frozen=True, slots=True)
+class ReleaseItem:
+    """Una línea de las release notes (feature o bug) asociada a un ticket."""
+    type: str
+    title: str
+    description: str
+    ticket_id: str = UNKNOWN_TICKET
+    status: str = ""
+
+    @property
+    def url(self):
+        return JIRA_BROWSE_URL + self.ticket_id if self.ticket_id != UNKNOWN_TICKET else ""
+
+    def with_status(self, status):
+        return replace(self, status=status)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            type=data.get("type", ""),
+            title=data.get("title", ""),
+            description=data.get("description", ""),
+            ticket_id=data.get("ticket_id") or UNKNOWN_TICKET,
+            status=data.get("status", ""),
+        )
+
+    def to_dict(self):
+        return {
+            "type": self.type,
+            "title": self.title,
+            "description": self.description,
+            "ticket_id": self.ticket_id,
+            "status": self.status,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class Release:
+    """Release estructurado: notas crudas, items por ticket, known issues y resumen."""
+    version: str
+    body: str = ""
+    items: Tuple[ReleaseItem, ...] = ()
+    known_issues: Tuple[str, ...] = ()
+    summary: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            version=data.get("version", ""),
+            body=data.get("body", ""),
+            items=tuple(ReleaseItem.from_dict(d) for d in data.get("details", []) if isinstance(d, dict)),
+            known_issues=tuple(data.get("known_issues", [])),
+            summary=tuple(data.get("summary", [])),
+        )
+
+    def to_dict(self):
+        # "details" se mantiene como nombre de la lista en JSON (sesión, store)
+        return {
+            "version": self.version,
+            "body": self.body,
+            "details": [item.to_dict() for item in self.items],
+            "known_issues": list(self.known_issues),
+            "summary": list(self.summary),
+        }
+
+
+def format_tickets(tickets):
+    """Tickets en texto compacto para prompts: una línea por ticket."""
+    return "\n".join(f"- {t.key} [{t.status or 'n/a'}] {t.summary}" for t in tickets)
@@ -0,0 +1,135 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+from release_ai_dashboard.models import ReleaseItem, UNKNOWN_TICKET
+from release_ai_dashboard.classifier import NOTES_CLASSIFIER
+
+# Parser único de release notes: recorre el body una sola vez con patrones
+# precompilados y deja un modelo reutilizable (secciones, items, tickets,
+# links de PR/commit y URL de compare) para todos los consumidores
+# (extract_sections, parse_github_release_notes, build_rich_adf_description, create_jira_issue).
+
+TRACKED_PROJECTS = ("CWB", "WEBTV")
+
+SECTION_PATTERN = re.compile(r"^(#+\s*)?\**\s*(features|bug fixes|known issues)\b(.*)$", re.IGNORECASE)
+SECTION_NAMES = {"features": "feature", "bug fixes": "bug", "known issues": "known_issues"}
+COMPARE_PATTERN = re.compile(r"\[(.*?)\]\((https://github\.com/[^)]+)\)\s*\((\d{4}-\d{2}-\d{2})\)")
+# Un solo scan por línea: links de GitHub (PR/issue/commit) o IDs de tickets
+LINE_TOKEN_PATTERN = re.compile(
+    r"\((?P<link>https://github\.com/[^\s)]+/(?P<kind>commit|pull|issues)/(?:[a-f0-9]{7,40}|\d+))\)"
+    r"|\b(?P<ticket>[A-Z][A-Z0-9]*-\d+)\b"
+)
+
+
+@dataclass(frozen=True)
+class NoteLine:
+    text: str
+    section: Optional[str]
+    ticket_ids: Tuple[str, ...]
+    first_ticket: Optional[str]
+    pr_links: Tuple[str, ...]
+    commit_links: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class ParsedNotes:
+    first_line: str
+    compare_url: Optional[str]
+    compare_date: Optional[str]
+    lines: Tuple[NoteLine, ...]
+    ticket_ids: Tuple[str, ...]
+
+    def section(self, name):
+        return tuple(line for line in self.lines if line.section == name)
+
+    @property
+    def section_by_ticket(self):
+        sections = {}
+        for line in self.lines:
+            if line.section in ("feature", "bug"):
+                for ticket_id in line.ticket_ids:
+                    sections.setdefault(ticket_id, line.section)
+        return sections
+
+
+def _section_marker(line):
+    """Devuelve la sección si la línea es un encabezado de sección ("### Bug Fixes", "Known Issues:")."""
+    match = SECTION_PATTERN.match(line)
+    if match and (match.group(1) or not match.group(3).strip(" *:")):
+        return SECTION_NAMES[match.group(2).lower()]
+    return None
+
+
+@lru_cache(maxsize=32)
+def parse_release_notes(body):
+    """Parsea el body una sola vez; el resultado es inmutable y se cachea por contenido."""
+    raw_lines = (body or "").splitlines()
+    first_line = raw_lines[0].strip() if raw_lines else ""
+    compare = COMPARE_PATTERN.search(first_line)
+
+    lines = []
+    all_tickets = {}
+    current = None
+    for raw in raw_lines:
+        text = raw.strip()
+        if not text:
+            continue
+        marker = _section_marker(text)
+        if marker:
+            current = marker
+            continue
+        if text.startswith("#"):
+            # Otro encabezado (versión, "Performance Improvements", ...) cierra la sección actual
+            current = None
+            continue
+
+        tickets, prs, commits = [], [], []
+        first_ticket = None
+        for match in LINE_TOKEN_PATTERN.finditer(text):
+            ticket = match.group("ticket")
+            if ticket:
+                if first_ticket is None:
+                    first_ticket = ticket
+                if ticket.split("-", 1)[0] in TRACKED_PROJECTS and ticket not in tickets:
+                    tickets.append(ticket)
+                    all_tickets[ticket] = None
+            elif match.group("kind") == "commit":
+                commits.append(match.group("link"))
+            else:
+                prs.append(match.group("link"))
+
+        lines.append(NoteLine(
+            text=text,
+            section=current,
+            ticket_ids=tuple(tickets),
+            first_ticket=first_ticket,
+            pr_links=tuple(prs),
+            commit_links=tuple(commits),
+        ))
+
+    return ParsedNotes(
+        first_line=first_line,
+        compare_url=compare.group(2) if compare else None,
+        compare_date=compare.group(3) if compare else None,
+        lines=tuple(lines),
+        ticket_ids=tuple(all_tickets),
+    )
+
+
+def release_items(parsed):
+    """Items estructurados (ReleaseItem) para GPT, el docx y el ticket de Jira."""
+    items = []
+    for line in parsed.lines:
+        if line.section in ("feature", "bug"):
+            item_type = line.section
+        else:
+            # Sin sección detectada: heurística por palabras clave
+            item_type = NOTES_CLASSIFIER.classify(line.text)
+        items.append(ReleaseItem(
+            type=item_type,
+            title=line.text[:80],
+            description=line.text,
+            ticket_id=line.first_ticket or UNKNOWN_TICKET
+        ))
+    return items
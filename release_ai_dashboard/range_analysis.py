@@ -0,0 +1,155 @@
+import os
+import re
+import hashlib
+from release_ai_dashboard import tag_index
+from release_ai_dashboard.cache_utils import load_json, save_json
+from release_ai_dashboard.classifier import COMMIT_CLASSIFIER
+
+# Análisis incremental de rangos de commits.
+# Cada rango analizado (base_sha..head_sha) se guarda en disco con sus commits ya
+# clasificados. Un rango nuevo se arma encadenando segmentos guardados y solo se
+# piden y clasifican los commits que ningún segmento cubre: si beta.1..rc.1 ya está
+# analizado, v1.0.0..v1.1.0 solo baja rc.1..v1.1.0.
+#
+# Los segmentos se invalidan solos si cambian las reglas del clasificador o el patrón
+# de tickets (fingerprint distinto).
+
+TICKET_PATTERN = re.compile(r"\b(?:CWB|WEBTV)-\d+\b")
+
+# Sin tag anterior se recorre el historial hasta el primer commit con tag conocido,
+# con este tope por si no hay ninguno (no se guarda: no es un rango)
+FALLBACK_COMMITS = int(os.getenv("RANGE_FALLBACK_COMMITS", "500"))
+MAX_SEGMENTS = 500
+
+FORMAT_VERSION = 1
+FINGERPRINT = hashlib.sha256(
+    f"{FORMAT_VERSION}|{COMMIT_CLASSIFIER.fingerprint}|{TICKET_PATTERN.pattern}".encode("utf-8")
+).hexdigest()[:16]
+
+_stores = {}
+
+
+def classify_commit(sha, message):
+    """{"sha", "tickets", "type", "line"} de un commit, o None si no menciona tickets."""
+    message = message.strip()
+    tickets = TICKET_PATTERN.findall(message)
+    if not tickets:
+        return None
+    return {
+        "sha": sha,
+        "tickets": tickets,
+        "type": COMMIT_CLASSIFIER.classify(message),
+        "line": f"- [{tickets[0]}] {message.splitlines()[0]}",
+    }
+
+
+def _store_filename(repo_name):
+    return f"range_analysis_{repo_name.replace('/', '__')}.json"
+
+
+def _load_store(repo_name):
+    if repo_name in _stores:
+        return _stores[repo_name]
+    data = load_json(_store_filename(repo_name), default={}) or {}
+    if data.get("fingerprint") != FINGERPRINT:
+        data = {"fingerprint": FINGERPRINT, "segments": {}}
+    _stores[repo_name] = data
+    return data
+
+
+def _save_segment(repo_name, store, base_sha, head_sha, tag, records):
+    # segments: {head_sha: {"tag": ..., "ranges": {base_sha: [records...]}}}
+    segments = store["segments"]
+    entry = segments.pop(head_sha, None) or {"tag": tag, "ranges": {}}
+    entry["ranges"][base_sha] = records
+    segments[head_sha] = entry
+    # Los dicts mantienen el orden de inserción: se descartan los más viejos
+    while len(segments) > MAX_SEGMENTS:
+        segments.pop(next(iter(segments)))
+    save_json(_store_filename(repo_name), store)
+
+
+def _coverage(segments, base_sha, head_sha, seen=None):
+    """Registros de base_sha..head_sha encadenando segmentos guardados, o None si hay huecos."""
+    if head_sha == base_sha:
+        return []
+    seen = seen or {head_sha}
+    entry = segments.get(head_sha)
+    if not entry:
+        return None
+    for from_sha, records in entry["ranges"].items():
+        if from_sha in seen:
+            continue
+        older = _coverage(segments, base_sha, from_sha, seen | {from_sha})
+        if older is not None:
+            return older + records
+    return None
+
+
+def _walk(backend, base_sha, head_sha, stop_sha=None):
+    """(registros en orden cronológico, commits recorridos) de base_sha..head_sha; None si aparece stop_sha."""
+    records = []
+    walked = 0
+    for sha, message in backend.iter_commits(base_sha, head_sha):
+        if sha == stop_sha:
+            return None
+        walked += 1
+        record = classify_commit(sha, message)
+        if record:
+            records.append(record)
+    records.reverse()
+    return records, walked
+
+
+def analyze_range(backend, repo_name, version_tag, head_sha, base_tag, base_sha):
+    """
+    Commits clasificados de base_sha..head_sha, en orden cronológico.
+    backend expone iter_commits(base_sha, head_sha, limit) -> (sha, message) del más nuevo al más viejo
+    e is_ancestor(sha, head_sha).
+    """
+    if not base_sha:
+        tagged = set(tag_index.load_index(repo_name)["tags"].values()) - {head_sha}
+        records = []
+        for sha, message in backend.iter_commits(None, head_sha, FALLBACK_COMMITS):
+            if sha in tagged:
+                break
+            record = classify_commit(sha, message)
+            if record:
+                records.append(record)
+        records.reverse()
+        return records
+
+    store = _load_store(repo_name)
+    segments = store["segments"]
+
+    cached = _coverage(segments, base_sha, head_sha)
+    if cached is not None:
+        print(f"♻️ Rango {base_tag}..{version_tag} ya analizado: {len(cached)} commits con tickets, 0 pedidos")
+        return cached
+
+    # El tag analizado más nuevo entre base y head que sea ancestro de head: desde ahí
+    # solo falta el delta. Un tag de otra rama (beta que no se mergeó) no sirve: sus
+    # commits propios no son parte del rango.
+    start_sha, start_tag, reused = base_sha, base_tag, []
+    tags = tag_index.load_index(repo_name)["tags"]
+    for tag in tag_index.tags_between(repo_name, base_tag, version_tag):
+        covered = _coverage(segments, base_sha, tags.get(tag)) if tags.get(tag) else None
+        if covered is not None and backend.is_ancestor(tags[tag], head_sha):
+            start_sha, start_tag, reused = tags[tag], tag, covered
+            break
+
+    walk = _walk(backend, start_sha, head_sha, stop_sha=base_sha if start_sha != base_sha else None)
+    if walk is None:
+        # El tag reutilizado es ancestro de head pero la base no es ancestro del tag (su
+        # rango llega a la base): se pide el rango completo, que el backend resuelve con merge-base
+        start_sha, start_tag, reused = base_sha, base_tag, []
+        walk = _walk(backend, base_sha, head_sha)
+    new, walked = walk
+
+    _save_segment(repo_name, store, start_sha, head_sha, version_tag, new)
+    if reused:
+        print(f"♻️ Reutilizado {base_tag}..{start_tag} ({len(reused)} commits con tickets); "
+              f"nuevos {start_tag}..{version_tag}: {walked} commits")
+    else:
+        print(f"🔎 Analizados {walked} commits de {base_tag}..{version_tag}")
+    return reused + new
@@ -0,0 +1,280 @@
+import os
+import re
+import math
+import hashlib
+import threading
+from collections import Counter
+from docx import Document
+from release_ai_dashboard.cache_utils import load_json, save_json
+from release_ai_dashboard.models import ReleaseItem, UNKNOWN_TICKET
+
+# Índice local BM25 sobre todos los releases generados:
+# líneas de release notes, resúmenes de tickets y el texto de los .docx en static/releases.
+# El chat manda a GPT solo los top-k fragmentos relevantes en vez del release completo,
+# y así también se puede preguntar por releases anteriores.
+
+RELEASES_DIR = os.getenv("RELEASES_DIR") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "static", "releases"
+)
+INDEX_FILENAME = "release_chunks.json"
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "8"))
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r"[a-z]+-\d+|[a-z0-9]+(?:\.[0-9]+)*", re.IGNORECASE)
+DOCX_SECTION_PATTERN = re.compile(r"^(\d+)\.\s")
+STOPWORDS = {
+    "the", "a", "an", "and", "or", "of", "to", "in", "on", "for", "with", "is", "are",
+    "was", "were", "be", "by", "at", "as", "it", "this", "that", "which", "what", "who",
+    "when", "how", "did", "does", "do", "from", "into", "release", "version",
+    "el", "la", "los", "las", "de", "del", "en", "y", "que", "para", "con", "por",
+}
+
+STEM_VOWELS = set("aeiouy")
+
+_lock = threading.Lock()
+_state = None
+
+
+def stem(token):
+    """
+    Normalización mínima de inflexiones en inglés, igual para el índice y la consulta:
+    "issue"/"issues"/"issued" -> "issu", "fix"/"fixes"/"fixed" -> "fix",
+    "query"/"queries" -> "query", "stop"/"stopped" -> "stop".
+    """
+    if "-" in token or token[0].isdigit() or len(token) <= 3:
+        return token
+    # Plurales y tercera persona
+    if token.endswith("ies") and len(token) > 4:
+        token = token[:-3] + "y"
+    elif token.endswith(("sses", "shes", "ches", "xes", "zes")):
+        token = token[:-2]
+    elif token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        token = token[:-1]
+    # Pasado y gerundio, solo si queda una raíz con vocal ("string" y "speed" no se tocan)
+    for suffix in ("ing", "ed"):
+        if token.endswith(suffix) and not token.endswith("eed"):
+            base = token[:-len(suffix)]
+            if len(base) >= 2 and STEM_VOWELS & set(base):
+                token = base
+                if len(token) > 3 and token[-1] == token[-2] and token[-1] not in "lsz":
+                    token = token[:-1]
+            break
+    # La "e" final se saca siempre: "issue" e "issu(es)" quedan iguales
+    if token.endswith("e") and len(token) > 3:
+        token = token[:-1]
+    return token
+
+
+def tokenize(text):
+    return [stem(token) for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def _version_from_filename(filename):
+    name = os.path.splitext(os.path.basename(filename))[0].strip()
+    return name[len("release_"):] if name.startswith("release_") else name
+
+
+def _docx_chunks(path):
+    """Texto útil de un .docx generado: secciones 1-3 (resumen, notas, known issues) y filas de tablas."""
+    doc = Document(path)
+    chunks = []
+    section = 0
+    for paragraph in doc.paragraphs:
+        text = paragraph.text.strip()
+        if not text:
+            continue
+        match = DOCX_SECTION_PATTERN.match(text)
+        if match:
+            section = int(match.group(1))
+            continue
+        if 1 <= section <= 3:
+            chunks.append(text)
+    for table in doc.tables:
+        for row in table.rows[1:]:
+            text = " ".join(cell.text.strip() for cell in row.cells if cell.text.strip())
+            if text:
+                chunks.append(text)
+    return chunks
+
+
+def _load_state():
+    global _state
+    if _state is None:
+        data = load_json(INDEX_FILENAME, default={}) or {}
+        _state = {
+            # releases: version -> {"hash", "chunks": [{"text", "source"}]}
+            "releases": data.get("releases", {}),
+            # docx: path -> {"mtime", "version"}; sus chunks viven en releases
+            "docx": data.get("docx", {}),
+            # carpeta -> mtime del último recorrido (en memoria: al reiniciar se vuelve a recorrer)
+            "dir_mtimes": {},
+            "index": None,
+        }
+    return _state
+
+
+def _save_state(state):
+    save_json(INDEX_FILENAME, {"releases": state["releases"], "docx": state["docx"]})
+
+
+def _set_release_chunks(state, version, source, texts):
+    entry = state["releases"].setdefault(version, {"hash": {}, "chunks": []})
+    entry["chunks"] = [c for c in entry["chunks"] if c["source"] != source]
+    entry["chunks"].extend({"text": t, "source": source} for t in texts)
+    state["index"] = None
+
+
+def _ticket_chunks(tickets, details):
+    # Un fragmento por ticket de Jira: summary real con tipo (del item) y status
+    types = {d.ticket_id: d.type for d in details if isinstance(d, ReleaseItem)}
+    chunks = []
+    for t in tickets:
+        if not t.summary or t.summary == "Not found":
+            continue
+        labels = ", ".join(label for label in (types.get(t.key), t.status) if label)
+        chunks.append(f"{t.key} ({labels}): {t.summary}" if labels else f"{t.key}: {t.summary}")
+    return chunks
+
+
+def _set_if_changed(state, version, source, texts):
+    content_hash = hashlib.sha256("\n".join(texts).encode("utf-8")).hexdigest()
+    entry = state["releases"].get(version)
+    if entry and entry["hash"].get(source) == content_hash:
+        return False
+    _set_release_chunks(state, version, source, texts)
+    state["releases"][version]["hash"][source] = content_hash
+    return True
+
+
+def add_release(version, body="", details=None, tickets=None):
+    """
+    Registra (o actualiza) las notas, los items (ReleaseItem o texto) y los tickets de Jira
+    (Ticket) de un release. Idempotente; sin tickets se conservan los ya indexados.
+    """
+    details = details or []
+    lines = [line.strip(" -*•\t") for line in (body or "").splitlines()]
+    notes = [line for line in lines if line and not line.startswith("#")]
+    items = []
+    for d in details:
+        if isinstance(d, ReleaseItem):
+            ticket_id = d.ticket_id if d.ticket_id != UNKNOWN_TICKET else ""
+            items.append(f"{ticket_id}: {d.description or d.title}".strip(": "))
+        elif isinstance(d, str):
+            items.append(d)
+
+    with _lock:
+        state = _load_state()
+        changed = _set_if_changed(state, version, "notes", notes + items)
+        if tickets is not None:
+            changed = _set_if_changed(state, version, "tickets", _ticket_chunks(tickets, details)) or changed
+        if changed:
+            _save_state(state)
+
+
+def _index_docx(state, path):
+    try:
+        texts = _docx_chunks(path)
+    except Exception as e:
+        print(f"⚠️ No se pudo indexar {os.path.basename(path)}: {e}")
+        return False
+    version = _version_from_filename(path)
+    _set_release_chunks(state, version, "docx", texts)
+    state["docx"][path] = {"mtime": os.path.getmtime(path), "version": version}
+    return True
+
+
+def index_docx(path):
+    """Indexa (o reindexa) un .docx recién generado."""
+    with _lock:
+        state = _load_state()
+        if _index_docx(state, os.path.abspath(path)):
+            _save_state(state)
+
+
+def refresh_docx(directory=None):
+    """
+    Indexa los .docx nuevos o modificados de static/releases. Solo recorre la carpeta
+    si cambió su mtime (se agregó, borró o renombró algún archivo); los documentos que
+    se regeneran en el lugar los reindexa index_docx al generarlos.
+    """
+    directory = directory or RELEASES_DIR
+    try:
+        dir_mtime = os.stat(directory).st_mtime_ns
+    except OSError:
+        return
+    with _lock:
+        state = _load_state()
+        if state["dir_mtimes"].get(directory) == dir_mtime:
+            return
+        changed = False
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith(".docx"):
+                continue
+            path = os.path.join(directory, filename)
+            known = state["docx"].get(path)
+            if known and known["mtime"] == os.path.getmtime(path):
+                continue
+            changed = _index_docx(state, path) or changed
+        state["dir_mtimes"][directory] = dir_mtime
+        if changed:
+            _save_state(state)
+
+
+def _build_index(state):
+    docs = []
+    for version, entry in state["releases"].items():
+        seen = set()
+        for chunk in entry["chunks"]:
+            if chunk["text"] in seen:
+                continue
+            seen.add(chunk["text"])
+            # La versión también es buscable ("qué cambió en v1.110.0")
+            tokens = tokenize(f"{version} {chunk['text']}")
+            if tokens:
+                docs.append({"version": version, "text": chunk["text"], "source": chunk["source"], "tf": Counter(tokens), "length": len(tokens)})
+
+    postings = {}
+    for doc_id, doc in enumerate(docs):
+        for term, tf in doc["tf"].items():
+            postings.setdefault(term, []).append((doc_id, tf))
+
+    n = len(docs)
+    avg_length = sum(d["length"] for d in docs) / n if n else 0
+    idf = {term: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for term, p in postings.items()}
+    return {"docs": docs, "postings": postings, "idf": idf, "avg_length": avg_length}
+
+
+def search(query, k=None, version=None, boost_version=None):
+    """
+    Devuelve los k fragmentos más relevantes: [{"version", "text", "source", "score"}].
+    version filtra a un solo release; boost_version da un pequeño empujón al release actual.
+    """
+    k = k or RETRIEVAL_TOP_K
+    with _lock:
+        state = _load_state()
+        if state["index"] is None:
+            state["index"] = _build_index(state)
+        index = state["index"]
+
+    docs = index["docs"]
+    scores = {}
+    for term in set(tokenize(query)):
+        for doc_id, tf in index["postings"].get(term, ()):
+            doc = docs[doc_id]
+            if version and doc["version"] != version:
+                continue
+            norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * doc["length"] / (index["avg_length"] or 1))
+            scores[doc_id] = scores.get(doc_id, 0.0) + index["idf"][term] * tf * (BM25_K1 + 1) / norm
+
+    if boost_version:
+        for doc_id in scores:
+            if docs[doc_id]["version"] == boost_version:
+                scores[doc_id] *= 1.2
+
+    best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+    return [
+        {"version": docs[i]["version"], "text": docs[i]["text"], "source": docs[i]["source"], "score": round(score, 3)}
+        for i, score in best
+    ]
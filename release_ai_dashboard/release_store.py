@@ -0,0 +1,134 @@
+import json
+import time
+import sqlite3
+import threading
+from release_ai_dashboard.cache_utils import cache_path
+from release_ai_dashboard.models import Release, UNKNOWN_TICKET
+
+# Store local de releases estructurados (items por ticket) para comparar releases
+# sin volver a GitHub/Jira, y diff determinístico entre dos releases.
+
+COMPARE_MAX_ITEMS = 40
+
+_lock = threading.Lock()
+_conn = None
+
+
+def _get_conn():
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(cache_path("releases.sqlite"), check_same_thread=False)
+        _conn.execute("""
+            CREATE TABLE IF NOT EXISTS releases (
+                version TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                saved_at REAL NOT NULL
+            )
+        """)
+        _conn.commit()
+    return _conn
+
+
+def save_release(release):
+    """Guarda un Release (reemplaza si existe)."""
+    with _lock:
+        conn = _get_conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO releases (version, data, saved_at) VALUES (?, ?, ?)",
+            (release.version, json.dumps(release.to_dict(), ensure_ascii=False), time.time()),
+        )
+        conn.commit()
+
+
+def get_release(version):
+    with _lock:
+        row = _get_conn().execute("SELECT data FROM releases WHERE version = ?", (version,)).fetchone()
+    return Release.from_dict(json.loads(row[0])) if row else None
+
+
+def _items_by_ticket(release):
+    items = {}
+    for item in release.items:
+        if item.ticket_id == UNKNOWN_TICKET:
+            continue
+        # Si un ticket aparece varias veces nos quedamos con el primero
+        items.setdefault(item.ticket_id, {
+            "ticket_id": item.ticket_id,
+            "type": item.type,
+            "title": (item.title or item.description)[:120],
+            "status": item.status,
+        })
+    return items
+
+
+def diff_releases(release_a, release_b):
+    """
+    Diferencias de tickets de A -> B, calculadas localmente:
+    added (solo en B), removed (solo en A), carried_over (en ambos) y
+    status_changes (en ambos con distinto status o tipo).
+    """
+    items_a = _items_by_ticket(release_a)
+    items_b = _items_by_ticket(release_b)
+
+    added = [items_b[t] for t in items_b if t not in items_a]
+    removed = [items_a[t] for t in items_a if t not in items_b]
+    carried_over = [items_b[t] for t in items_b if t in items_a]
+    status_changes = [
+        {
+            "ticket_id": t,
+            "title": items_b[t]["title"],
+            "status_a": items_a[t]["status"],
+            "status_b": items_b[t]["status"],
+            "type_a": items_a[t]["type"],
+            "type_b": items_b[t]["type"],
+        }
+        for t in items_b
+        if t in items_a and (
+            items_a[t]["status"] != items_b[t]["status"] or items_a[t]["type"] != items_b[t]["type"]
+        )
+    ]
+
+    known_a = set(release_a.known_issues)
+    known_b = set(release_b.known_issues)
+
+    return {
+        "version_a": release_a.version,
+        "version_b": release_b.version,
+        "added": added,
+        "removed": removed,
+        "carried_over": carried_over,
+        "status_changes": status_changes,
+        "known_issues_resolved": sorted(known_a - known_b),
+        "known_issues_introduced": sorted(known_b - known_a),
+    }
+
+
+def format_diff(diff, max_items=COMPARE_MAX_ITEMS):
+    """Texto compacto del diff (para el prompt de GPT o como respuesta sin AI)."""
+    def section(title, items, render):
+        lines = [f"{title} ({len(items)}):"]
+        lines += [f"- {render(i)}" for i in items[:max_items]]
+        if len(items) > max_items:
+            lines.append(f"- ... and {len(items) - max_items} more")
+        return "\n".join(lines)
+
+    def render_item(i):
+        return f"{i['ticket_id']} [{i['type'] or 'n/a'}] {i['title']}"
+
+    def render_change(c):
+        parts = []
+        if c["status_a"] != c["status_b"]:
+            parts.append(f"status {c['status_a'] or 'n/a'} -> {c['status_b'] or 'n/a'}")
+        if c["type_a"] != c["type_b"]:
+            parts.append(f"type {c['type_a'] or 'n/a'} -> {c['type_b'] or 'n/a'}")
+        return f"{c['ticket_id']} {c['title']} ({', '.join(parts)})"
+
+    return "\n\n".join([
+        f"Comparison {diff['version_a']} -> {diff['version_b']}",
+        section("Added in B", diff["added"], render_item),
+        section("Removed (only in A)", diff["removed"], render_item),
+        section("Carried over", diff["carried_over"], lambda i: i["ticket_id"]),
+        section("Status/type changes", diff["status_changes"], render_change),
+        section("Known issues resolved", diff["known_issues_resolved"], str),
+        section("Known issues introduced", diff["known_issues_introduced"], str),
+    ])
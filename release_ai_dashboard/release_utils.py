@@ -1,77 +1,134 @@
 import os
-import re
-from github import Github
+from math import ceil
+from itertools import chain, count, islice
+from release_ai_dashboard import http_utils, tag_index, github_cache, github_graphql, git_local, range_analysis
+from release_ai_dashboard.github_cache import get_github
+
+# Backend para descubrir tags y commits: "rest" (PyGithub), "graphql" (ver github_graphql)
+# o "git" (clone local, ver git_local)
+GITHUB_BACKEND = os.getenv("GITHUB_BACKEND", "rest").lower()
+COMMIT_PAGE_SIZE = 100
+
+
+class RestBackend:
+    """Tags, release y commits vía PyGithub; SHAs y tag anterior salen del índice local."""
+
+    def __init__(self, token, repo_name):
+        self.repo = get_github(token).get_repo(repo_name)
+
+    def resolve(self, version_tag, base_tag=None):
+        """(current_sha, previous_tag, previous_sha); sin llamadas tras el warm-up."""
+        if not tag_index.get_release(self.repo, version_tag, revalidate=False):
+            raise ValueError(f"No existe un release para {version_tag}")
+        current_sha = tag_index.get_tag_sha(self.repo, version_tag)
+        # Tag anterior por semver (beta < rc < GA, series separadas)
+        previous_tag = base_tag or tag_index.get_previous_tag(self.repo, version_tag)
+        previous_sha = tag_index.get_tag_sha(self.repo, previous_tag) if previous_tag else None
+        return current_sha, previous_tag, previous_sha
+
+    def is_ancestor(self, sha, head_sha):
+        """True si sha es ancestro de head_sha (compare sha...head_sha sin commits propios de sha)."""
+        return self.repo.compare(sha, head_sha).status in ("ahead", "identical")
+
+    def iter_commits(self, base_sha, head_sha, limit=None):
+        """
+        (sha, message) del más nuevo al más viejo, página por página con prefetch
+        acotado (http_utils.prefetch): se clasifica mientras bajan las siguientes.
+        """
+        if not base_sha:
+            # Historial desde head; no se sabe cuántas páginas hay, se piden de a una por delante
+            pages = http_utils.prefetch(self.repo.get_commits(sha=head_sha).get_page, count())
+        else:
+            # compare pagina del más viejo al más nuevo: la primera llamada trae la página 1
+            # y el total, el resto se recorre desde la última hacia atrás. Sin paginar,
+            # GitHub corta la respuesta en 250 commits.
+            comparison = self.repo.compare(base_sha, head_sha, comparison_commits_per_page=COMMIT_PAGE_SIZE)
+            last_page = max(1, ceil(comparison.total_commits / COMMIT_PAGE_SIZE))
+            commits = comparison.commits
+            pages = chain(
+                http_utils.prefetch(commits.get_page, range(last_page - 1, 0, -1)),
+                # La página 1 ya vino con la comparación (islice no pide la siguiente)
+                [list(islice(commits, COMMIT_PAGE_SIZE))],
+            )
+            pages = (page[::-1] for page in pages)
+
+        yielded = 0
+        for page in pages:
+            if not page:
+                return
+            for commit in page:
+                yield commit.sha, commit.commit.message
+                yielded += 1
+                if limit and yielded >= limit:
+                    return
+
+
+def get_backend(token, repo_name):
+    """Backend configurado en GITHUB_BACKEND (resolve + iter_commits)."""
+    if GITHUB_BACKEND == "graphql":
+        return github_graphql.GraphqlBackend(token, repo_name)
+    if GITHUB_BACKEND == "git":
+        return git_local.GitBackend(repo_name, token=token)
+    return RestBackend(token, repo_name)
+
+
+def github_api_calls():
+    """Llamadas a la API de GitHub que salieron a la red en este proceso (REST vía PyGithub + queries GraphQL)."""
+    return github_cache.stats["requests"] + github_graphql.stats["queries"]
+
+
+def build_release_body(records):
+    """Arma las release notes (Features / Bug Fixes) y los tickets a partir de commits clasificados."""
+    features = []
+    bugs = []
+    ticket_ids = set()
+
+    for record in records:
+        ticket_ids.update(record["tickets"])
+        # Bug si apareció alguna palabra de bug; si no, feature (default)
+        if record["type"] == "bug":
+            bugs.append(record["line"])
+        else:
+            features.append(record["line"])
+
+    # Armar release notes
+    release_body = ""
+
+    if features:
+        release_body += "### Features\n" + "\n".join(features) + "\n\n"
+    if bugs:
+        release_body += "### Bug Fixes\n" + "\n".join(bugs) + "\n"
+
+    if not release_body:
+        release_body = "### No changes found in this release."
+
+    return release_body, ticket_ids
 
-def get_release_data(version_tag):
+
+def get_release_data(version_tag, base_tag=None):
+    """
+    Release notes (Features / Bug Fixes) y tickets de los commits entre el tag anterior
+    (o base_tag, p.ej. el GA anterior) y version_tag.
+    """
     token = os.getenv("GITHUB_TOKEN")
     repo_name = os.getenv("REPO_GITHUB") or "televisa-univision/client-web"
 
-    if not token:
+    # El backend git trabaja sobre el clone local y no necesita token
+    if not token and GITHUB_BACKEND != "git":
         print("❌ No GITHUB_TOKEN configurado.")
         return "⚠️ Error de configuración", []
 
-    g = Github(token)
-    repo = g.get_repo(repo_name)
-
     try:
-        release = repo.get_release(version_tag)
-        current_tag = version_tag
-        current_sha = repo.get_git_ref(f"tags/{current_tag}").object.sha
-        current_commit = repo.get_commit(current_sha)
-
-        # Buscar tag anterior por fecha
-        all_tags = sorted(repo.get_tags(), key=lambda t: t.commit.commit.author.date)
-        prev_tag = None
-        for i in range(1, len(all_tags)):
-            if all_tags[i].name == current_tag:
-                prev_tag = all_tags[i - 1].name
-                break
-
-        if not prev_tag:
-            print("⚠️ No se encontró un tag anterior. Usando últimos 50 commits.")
-            commits = repo.get_commits(sha=current_sha)[:50]
-        else:
+        backend = get_backend(token, repo_name)
+        current_sha, prev_tag, prev_sha = backend.resolve(version_tag, base_tag)
+        if prev_tag:
             print(f"ℹ️ Comparando con tag anterior: {prev_tag}")
-            prev_sha = repo.get_git_ref(f"tags/{prev_tag}").object.sha
-            prev_commit = repo.get_commit(prev_sha)
-            commits = repo.compare(prev_commit.sha, current_commit.sha).commits
-
-        feature_keywords = ["add", "implement", "migrate", "refactor", "feature", "create"]
-        bug_keywords = ["fix", "bug", "resolve", "patch", "error", "issue", "correct"]
-
-        features = []
-        bugs = []
-        ticket_ids = set()
-
-        for commit in commits:
-            msg = commit.commit.message.strip()
-            matches = re.findall(r"\[?(CWB|WEBTV)-\d+\]?", msg)
-            full_ticket_ids = re.findall(r"(CWB-\d+|WEBTV-\d+)", msg)
-
-            if not full_ticket_ids:
-                continue
-
-            ticket_ids.update(full_ticket_ids)
-
-            line = f"- [{full_ticket_ids[0]}] {msg.splitlines()[0]}"
-            lowered = msg.lower()
-            if any(kw in lowered for kw in bug_keywords):
-                bugs.append(line)
-            elif any(kw in lowered for kw in feature_keywords):
-                features.append(line)
-            else:
-                features.append(line)  # Default to feature
-
-        # Armar release notes
-        release_body = ""
-
-        if features:
-            release_body += "### Features\n" + "\n".join(features) + "\n\n"
-        if bugs:
-            release_body += "### Bug Fixes\n" + "\n".join(bugs) + "\n"
-
-        if not release_body:
-            release_body = "### No changes found in this release."
+        else:
+            print(f"⚠️ No se encontró un tag anterior. Usando commits hasta el último tag (máx. {range_analysis.FALLBACK_COMMITS}).")
+
+        # Solo se piden y clasifican los commits que no cubre un análisis anterior
+        records = range_analysis.analyze_range(backend, repo_name, version_tag, current_sha, prev_tag, prev_sha)
+        release_body, ticket_ids = build_release_body(records)
 
         print(f"✅ Release notes generados automáticamente. Tickets: {len(ticket_ids)}")
 
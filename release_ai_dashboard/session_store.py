@@ -0,0 +1,110 @@
+import time
+import sqlite3
+import secrets
+import threading
+from flask.sessions import SessionInterface, SessionMixin
+from flask.json.tag import TaggedJSONSerializer
+from werkzeug.datastructures import CallbackDict
+from release_ai_dashboard.cache_utils import cache_path
+
+# Sesiones del lado del servidor (SQLite en RELEASE_CACHE_DIR).
+# La cookie solo lleva un id aleatorio; el release, el historial y el chat
+# quedan en disco, así no viajan en cada request ni chocan con el límite de ~4 KB.
+# La expiración se corre en cada request (sesión deslizante), pero para no escribir
+# en disco en cada GET solo se actualiza si pasaron SESSION_TOUCH_SECONDS desde la última vez.
+
+SESSION_TOUCH_SECONDS = 60
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, new=False, expires_at=0.0):
+        def on_update(session):
+            session.modified = True
+
+        CallbackDict.__init__(self, initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+        self.expires_at = expires_at
+
+
+class SqliteSessionInterface(SessionInterface):
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, filename="sessions.sqlite"):
+        self.path = cache_path(filename)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                sid TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions (expires_at)")
+        self._conn.commit()
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT data, expires_at FROM sessions WHERE sid = ? AND expires_at > ?", (sid, time.time())
+                ).fetchone()
+            if row:
+                return ServerSideSession(self.serializer.loads(row[0]), sid=sid, expires_at=row[1])
+        return ServerSideSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if not session:
+            if session.modified:
+                with self._lock:
+                    self._conn.execute("DELETE FROM sessions WHERE sid = ?", (session.sid,))
+                    self._conn.commit()
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        now = time.time()
+        expires_at = now + app.permanent_session_lifetime.total_seconds()
+        if session.modified or session.new:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sessions (sid, data, expires_at) VALUES (?, ?, ?)",
+                    (session.sid, self.serializer.dumps(dict(session)), expires_at),
+                )
+                self._conn.execute("DELETE FROM sessions WHERE expires_at < ?", (now,))
+                self._conn.commit()
+        elif expires_at - session.expires_at > SESSION_TOUCH_SECONDS:
+            # Sin cambios: solo extender la expiración (como mucho una vez por SESSION_TOUCH_SECONDS)
+            with self._lock:
+                self._conn.execute("UPDATE sessions SET expires_at = ? WHERE sid = ?", (expires_at, session.sid))
+                self._conn.commit()
+
+        if self.should_set_cookie(app, session) or session.new:
+            response.set_cookie(
+                name,
+                session.sid,
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+            )
+
+    def update_session(self, app, sid, changes):
+        """Actualiza claves de una sesión fuera del ciclo del request (p. ej. al final de un stream)."""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM sessions WHERE sid = ?", (sid,)).fetchone()
+            data = self.serializer.loads(row[0]) if row else {}
+            data.update(changes)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions (sid, data, expires_at) VALUES (?, ?, ?)",
+                (sid, self.serializer.dumps(data), time.time() + app.permanent_session_lifetime.total_seconds()),
+            )
+            self._conn.commit()
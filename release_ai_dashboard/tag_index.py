@@ -0,0 +1,187 @@
+import os
+import re
+import time
+import datetime
+from github import UnknownObjectException
+from release_ai_dashboard.cache_utils import load_json, save_json
+
+# Índice local de tags y releases de GitHub.
+# Se guarda en disco y se refresca solo cuando piden un tag/release que no conocemos,
+# así después del primer run las búsquedas no gastan llamadas a la API.
+# El body de un release se puede editar después de publicado: pasado RELEASE_INDEX_TTL
+# segundos se vuelve a pedir ese release (con el cache de github_cache es un 304 gratis
+# si no cambió).
+
+RELEASE_INDEX_TTL = int(os.getenv("RELEASE_INDEX_TTL", "300"))
+
+SEMVER_PATTERN = re.compile(
+    r"^(?P<series>.*?)v?(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+)"
+    r"(?:-(?P<stage>alpha|beta|rc)\.?(?P<pre>\d+)?)?$",
+    re.IGNORECASE,
+)
+
+# Precedencia de prereleases: alpha < beta < rc < GA
+STAGE_RANK = {"alpha": 0, "beta": 1, "rc": 2, None: 3}
+
+_indexes = {}
+
+
+def parse_tag(tag_name):
+    """
+    Devuelve (serie, clave_de_orden) para un tag semver o None si no es semver.
+    La serie es el prefijo antes de la versión ("tvapp-" o ""), así cada producto
+    se ordena por separado.
+    """
+    match = SEMVER_PATTERN.match(tag_name.strip())
+    if not match:
+        return None
+    stage = match.group("stage").lower() if match.group("stage") else None
+    key = (
+        int(match.group("major")),
+        int(match.group("minor")),
+        int(match.group("patch")),
+        STAGE_RANK[stage],
+        int(match.group("pre") or 0),
+    )
+    return match.group("series").lower(), key
+
+
+def _index_filename(repo_name):
+    return f"tag_index_{repo_name.replace('/', '__')}.json"
+
+
+def _build_previous_map(tags):
+    # Agrupar por serie y ordenar una sola vez; luego cada búsqueda es O(1)
+    series = {}
+    for name in tags:
+        parsed = parse_tag(name)
+        if parsed:
+            series.setdefault(parsed[0], []).append((parsed[1], name))
+
+    previous = {}
+    for entries in series.values():
+        entries.sort()
+        for i in range(1, len(entries)):
+            previous[entries[i][1]] = entries[i - 1][1]
+    return previous
+
+
+def load_index(repo_name):
+    if repo_name in _indexes:
+        return _indexes[repo_name]
+
+    data = load_json(_index_filename(repo_name), default={}) or {}
+    index = {
+        "tags": data.get("tags", {}),
+        "releases": data.get("releases", {}),
+        "updated_at": data.get("updated_at"),
+    }
+    index["previous"] = _build_previous_map(index["tags"])
+    _indexes[repo_name] = index
+    return index
+
+
+def _save_index(repo_name, index):
+    index["updated_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    save_json(_index_filename(repo_name), {
+        "tags": index["tags"],
+        "releases": index["releases"],
+        "updated_at": index["updated_at"],
+    })
+
+
+def set_tags(repo_name, tags):
+    """Reemplaza el listado de tags ({nombre: sha}) venga de REST, GraphQL o git."""
+    index = load_index(repo_name)
+    index["tags"] = tags
+    index["previous"] = _build_previous_map(tags)
+    _save_index(repo_name, index)
+    print(f"🗂️ Índice de tags actualizado: {len(tags)} tags")
+    return index
+
+
+def refresh_tags(repo):
+    """Relee el listado de tags (una llamada por página, sin pedir cada commit)."""
+    return set_tags(repo.full_name, {t.name: t.commit.sha for t in repo.get_tags()})
+
+
+def _release_entry(r):
+    return {
+        "id": r.id,
+        "body": r.body or "",
+        "published_at": r.published_at.isoformat() if r.published_at else None,
+        "updated_at": r.updated_at.isoformat() if r.updated_at else None,
+        "checked_at": time.time(),
+    }
+
+
+def refresh_releases(repo):
+    """
+    Trae releases nuevos. La API los devuelve del más nuevo al más viejo,
+    así que paramos en cuanto encontramos uno que ya está en el índice.
+    Los releases viejos editados no aparecen acá: los revalida get_release.
+    """
+    index = load_index(repo.full_name)
+    known_ids = {r["id"] for r in index["releases"].values()}
+    added = 0
+    for r in repo.get_releases():
+        if r.id in known_ids:
+            break
+        index["releases"][r.tag_name] = _release_entry(r)
+        added += 1
+    _save_index(repo.full_name, index)
+    print(f"🗂️ Índice de releases actualizado: {added} nuevos")
+    return index
+
+
+def get_tag_sha(repo, tag_name):
+    index = load_index(repo.full_name)
+    if tag_name not in index["tags"]:
+        index = refresh_tags(repo)
+    return index["tags"].get(tag_name)
+
+
+def get_previous_tag(repo, tag_name):
+    """Tag anterior dentro de la misma serie según semver (beta < rc < GA)."""
+    index = load_index(repo.full_name)
+    if tag_name not in index["tags"]:
+        index = refresh_tags(repo)
+    return index["previous"].get(tag_name)
+
+
+def tags_between(repo_name, older_tag, newer_tag):
+    """Tags de la serie estrictamente entre older_tag y newer_tag, del más nuevo al más viejo."""
+    previous = load_index(repo_name)["previous"]
+    result = []
+    tag = previous.get(newer_tag)
+    while tag and tag != older_tag:
+        result.append(tag)
+        tag = previous.get(tag)
+    return result if tag == older_tag else []
+
+
+def _revalidate_release(repo, index, tag_name):
+    # Un solo release por tag: trae el body editado o lo saca si lo borraron
+    try:
+        r = repo.get_release(tag_name)
+    except UnknownObjectException:
+        index["releases"].pop(tag_name, None)
+    else:
+        entry = index["releases"].get(tag_name)
+        if entry and entry.get("updated_at") and entry["updated_at"] != _release_entry(r)["updated_at"]:
+            print(f"🗂️ Release {tag_name} editado en GitHub: se actualiza el índice")
+        index["releases"][tag_name] = _release_entry(r)
+    _save_index(repo.full_name, index)
+
+
+def get_release(repo, tag_name, revalidate=True):
+    """
+    Devuelve {"id", "body", "published_at", "updated_at"} del release o None si no existe.
+    Con revalidate=False alcanza con saber que existe y no se revalida un body viejo.
+    """
+    index = load_index(repo.full_name)
+    if tag_name not in index["releases"]:
+        index = refresh_releases(repo)
+    elif revalidate and time.time() - index["releases"][tag_name].get("checked_at", 0) > RELEASE_INDEX_TTL:
+        _revalidate_release(repo, index, tag_name)
+    return index["releases"].get(tag_name)
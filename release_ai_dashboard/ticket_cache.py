@@ -0,0 +1,123 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from release_ai_dashboard.cache_utils import cache_path
+from release_ai_dashboard.models import Ticket
+
+# Cache persistente de tickets de Jira (SQLite en RELEASE_CACHE_DIR).
+# - Dentro del TTL el ticket se sirve directo del cache.
+# - Pasado el TTL se revalida comparando el campo `updated` en una sola búsqueda.
+# - Con más de JIRA_CACHE_MAX_ENTRIES se desalojan los menos usados (LRU).
+
+JIRA_CACHE_TTL = int(os.getenv("JIRA_CACHE_TTL", "3600"))
+JIRA_CACHE_MAX_ENTRIES = int(os.getenv("JIRA_CACHE_MAX_ENTRIES", "5000"))
+JIRA_CACHE_DISABLED = os.getenv("JIRA_CACHE_DISABLED", "false").lower() == "true"
+
+_lock = threading.Lock()
+_conn = None
+
+stats = {"hits": 0, "revalidated": 0, "misses": 0}
+
+
+def _get_conn():
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(cache_path("jira_tickets.sqlite"), check_same_thread=False)
+        _conn.execute("""
+            CREATE TABLE IF NOT EXISTS tickets (
+                key TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                updated TEXT,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        _conn.execute("CREATE INDEX IF NOT EXISTS idx_tickets_last_access ON tickets (last_access)")
+        _conn.commit()
+    return _conn
+
+
+def lookup(keys):
+    """
+    Separa las keys en (fresh, stale, missing):
+    fresh = {key: Ticket} dentro del TTL, stale = {key: updated} a revalidar,
+    missing = keys que no están en el cache.
+    """
+    fresh, stale, missing = {}, {}, []
+    if not keys:
+        return fresh, stale, missing
+
+    now = time.time()
+    rows = {}
+    with _lock:
+        conn = _get_conn()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for row in conn.execute(
+                f"SELECT key, data, updated, fetched_at FROM tickets WHERE key IN ({placeholders})", chunk
+            ):
+                rows[row[0]] = row
+
+    for key in keys:
+        row = rows.get(key)
+        if row is None:
+            missing.append(key)
+        elif now - row[3] <= JIRA_CACHE_TTL:
+            fresh[key] = Ticket.from_dict(json.loads(row[1]))
+        else:
+            stale[key] = row[2]
+
+    touch(fresh.keys())
+    return fresh, stale, missing
+
+
+def touch(keys, refreshed=False):
+    """Marca acceso (LRU); con refreshed=True además reinicia el TTL."""
+    keys = list(keys)
+    if not keys:
+        return
+    now = time.time()
+    with _lock:
+        conn = _get_conn()
+        if refreshed:
+            conn.executemany(
+                "UPDATE tickets SET last_access = ?, fetched_at = ? WHERE key = ?",
+                [(now, now, k) for k in keys],
+            )
+        else:
+            conn.executemany("UPDATE tickets SET last_access = ? WHERE key = ?", [(now, k) for k in keys])
+        conn.commit()
+
+
+def store(tickets_with_updated):
+    """Guarda [(Ticket, updated)] y aplica el desalojo LRU."""
+    now = time.time()
+    with _lock:
+        conn = _get_conn()
+        conn.executemany(
+            "INSERT OR REPLACE INTO tickets (key, data, updated, fetched_at, last_access) VALUES (?, ?, ?, ?, ?)",
+            [(t.key, json.dumps(t.to_dict()), updated, now, now) for t, updated in tickets_with_updated],
+        )
+        conn.execute(
+            "DELETE FROM tickets WHERE key IN ("
+            "SELECT key FROM tickets ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (JIRA_CACHE_MAX_ENTRIES,),
+        )
+        conn.commit()
+
+
+def reset_stats():
+    for k in stats:
+        stats[k] = 0
+
+
+def format_stats():
+    served = stats["hits"] + stats["revalidated"]
+    total = served + stats["misses"]
+    return (
+        f"🗃️ Cache de Jira: {stats['hits']} hits, {stats['revalidated']} revalidados, "
+        f"{stats['misses']} misses ({served}/{total} tickets sin volver a descargarse)"
+    )
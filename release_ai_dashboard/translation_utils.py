@@ -0,0 +1,109 @@
+import re
+import json
+import threading
+from release_ai_dashboard.cache_utils import load_json, save_json
+from release_ai_dashboard.llm_cache import chat_completion
+
+# Traducción al inglés en lote:
+# 1. un detector local descarta las líneas que ya están en inglés,
+# 2. lo que queda se manda en UNA sola request estructurada a GPT,
+# 3. cada línea traducida se guarda en un memo persistente, así los textos fijos
+#    ("Pruebas pasadas en staging", etc.) se traducen una sola vez.
+
+MEMO_FILENAME = "translation_memo.json"
+
+SPANISH_WORDS = {
+    "el", "la", "los", "las", "de", "del", "en", "y", "que", "para", "con", "por",
+    "una", "un", "es", "se", "al", "su", "sus", "como", "pero", "sin", "rama",
+    "pruebas", "lanzamiento", "código", "confirmado", "mergeado", "pasadas", "cambios",
+    "mejoras", "nuevo", "nueva", "error", "corrección", "usuario", "página",
+}
+ENGLISH_WORDS = {
+    "the", "and", "of", "to", "in", "for", "with", "on", "is", "are", "was", "by",
+    "from", "this", "that", "new", "added", "fixed", "update", "updated", "release",
+    "passed", "merged", "confirmed", "tests", "branch", "production", "owner", "lead",
+}
+WORD_PATTERN = re.compile(r"[^\W\d_]+", re.UNICODE)
+SPANISH_CHARS = re.compile(r"[áéíóúñ¿¡]")
+
+_memo_lock = threading.Lock()
+_memo = None
+
+
+def looks_english(text):
+    """Heurística local y barata: ¿la línea ya está en inglés?"""
+    spanish, english = 0, 0
+    for word in WORD_PATTERN.findall(text):
+        lowered = word.lower()
+        if lowered in SPANISH_WORDS:
+            spanish += 1
+        elif lowered in ENGLISH_WORDS:
+            english += 1
+        # Acentos en palabras en minúscula (no en nombres propios como "Pérez")
+        elif word.islower() and SPANISH_CHARS.search(word):
+            spanish += 1
+    return spanish == 0 or english > spanish
+
+
+def _get_memo():
+    global _memo
+    if _memo is None:
+        _memo = load_json(MEMO_FILENAME, default={}) or {}
+    return _memo
+
+
+def translate_lines_to_english(client, groups):
+    """
+    groups = {label: [líneas]} → {label: [líneas en inglés]}, con el mismo orden.
+    Hace como máximo una llamada a GPT para todas las etiquetas juntas.
+    """
+    with _memo_lock:
+        memo = dict(_get_memo())
+
+    pending = []
+    for lines in groups.values():
+        for line in lines:
+            if isinstance(line, str) and line.strip() and line not in memo and not looks_english(line):
+                pending.append(line)
+    pending = list(dict.fromkeys(pending))
+
+    if pending:
+        prompt = f"""
+You are an assistant that ensures technical content is written in clear, professional English.
+
+Translate each item of the following JSON array from Spanish to English. Keep names, ticket IDs and emojis unchanged.
+Return ONLY a JSON array of strings with exactly {len(pending)} items, in the same order.
+
+{json.dumps(pending, ensure_ascii=False)}
+"""
+        response_text = chat_completion(
+            client,
+            model="gpt-4",
+            messages=[
+                {"role": "system", "content": "You are a translation assistant."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0
+        )
+        try:
+            translated = json.loads(response_text)
+        except (TypeError, ValueError):
+            translated = None
+
+        if isinstance(translated, list) and len(translated) == len(pending):
+            with _memo_lock:
+                current = _get_memo()
+                for original, english in zip(pending, translated):
+                    current[original] = str(english).strip()
+                save_json(MEMO_FILENAME, current)
+                memo = dict(current)
+        else:
+            print("⚠️ Respuesta de traducción inválida. Se dejan los textos originales.")
+
+    result = {}
+    for label, lines in groups.items():
+        result[label] = [
+            memo.get(line, line) if isinstance(line, str) else ""
+            for line in lines
+        ]
+    return result
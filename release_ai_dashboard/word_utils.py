@@ -1,13 +1,19 @@
-from docx import Document
 from docx.shared import Pt
+from release_ai_dashboard import docx_template
+
+
+@docx_template.template("plain_text")
+def _plain_text_template(doc):
+    doc.styles["Normal"].font.size = Pt(11)
+
 
 def save_word_from_text(text, filename):
-    doc = Document()
+    doc = docx_template.new_document("plain_text")
     for line in text.splitlines():
         if line.strip().startswith("# "):
-            doc.add_heading(line.replace("# ", "").strip(), level=1)
+            docx_template.add_heading(doc, line.replace("# ", "").strip(), level=1)
         elif line.strip().startswith("## "):
-            doc.add_heading(line.replace("## ", "").strip(), level=2)
+            docx_template.add_heading(doc, line.replace("## ", "").strip(), level=2)
         elif line.strip():
-            doc.add_paragraph(line.strip()).style.font.size = Pt(11)
+            docx_template.add_paragraph(doc, line.strip())
     doc.save(filename)
@@ -0,0 +1,63 @@
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import pytest
+from github import Auth, Github
+from release_ai_dashboard import cache_utils, github_cache
+
+# Cliente PyGithub de get_github contra un servidor local que cuenta conexiones TCP y
+# responde 304 cuando llega el ETag guardado.
+
+REPO = {"id": 1, "name": "client-web", "full_name": "televisa-univision/client-web",
+        "url": "/repos/televisa-univision/client-web"}
+ETAG = '"v1"'
+
+
+class RepoStub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    wbufsize = 65536
+    connections = 0
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        RepoStub.connections += 1
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        payload = json.dumps(REPO).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@pytest.fixture
+def base_url(tmp_path, monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RepoStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(cache_utils, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(github_cache, "_conn", None)
+    RepoStub.connections = 0
+    github_cache.reset_stats()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def test_calls_reuse_one_connection(base_url):
+    github_cache.get_github("token")  # instala las clases de conexión con el cache
+    github = Github(auth=Auth.Token("token"), base_url=base_url, lazy=False, seconds_between_requests=0)
+    for _ in range(5):
+        assert github.get_repo("televisa-univision/client-web").name == "client-web"
+    assert github_cache.stats["requests"] == 5
+    assert github_cache.stats["revalidated"] == 4
+    assert RepoStub.connections == 1
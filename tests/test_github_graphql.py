@@ -0,0 +1,199 @@
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import pytest
+from release_ai_dashboard import cache_utils, github_graphql, range_analysis, release_utils, tag_index
+
+# Backend GraphQL contra un servidor local que imita la API de GitHub sobre un DAG chico:
+#
+#   m1 - m2 - m3 - m4 (v1.0.0) - m5 ----- M - m6 (v1.1.0)
+#          \                        \   /
+#           f1 (fecha anterior a m4)  \ /
+#                                     b1 (v1.1.0-beta.1, rama aparte)
+#
+# f1 es de una rama mergeada en M con fecha anterior a v1.0.0: un recorrido de `history`
+# por fecha que corta en v1.0.0 la pierde. b1 no es ancestro de v1.1.0.
+
+COMMITS = {
+    "m1": ([], 1, "chore: init"),
+    "m2": (["m1"], 2, "feat: [CWB-2] add guide"),
+    "f1": (["m2"], 3, "feat: [CWB-10] add profile modal"),
+    "m3": (["m2"], 4, "fix: [CWB-3] fix player crash"),
+    "m4": (["m3"], 5, "feat: [CWB-4] add login flow"),
+    "m5": (["m4"], 6, "fix: [CWB-5] fix deep link"),
+    "b1": (["m5"], 7, "feat: [CWB-20] beta only change"),
+    "M": (["m5", "f1"], 8, "Merge branch 'feature/profile'"),
+    "m6": (["M"], 9, "feat: [CWB-6] add carousel"),
+}
+TAGS = {"v1.0.0": "m4", "v1.1.0-beta.1": "b1", "v1.1.0": "m6"}
+
+
+def oid(name):
+    return name.ljust(40, "0")
+
+
+def ancestors(name):
+    seen, stack = set(), [name]
+    while stack:
+        current = stack.pop()
+        if current not in seen:
+            seen.add(current)
+            stack.extend(COMMITS[current][0])
+    return seen
+
+
+def by_date(names, newest_first):
+    return sorted(names, key=lambda n: COMMITS[n][1], reverse=newest_first)
+
+
+def node(name):
+    return {"oid": oid(name), "message": COMMITS[name][2]}
+
+
+def history_page(head, size, cursor):
+    names = by_date(ancestors(head), newest_first=True)
+    start = int(cursor or 0)
+    page = names[start:start + size]
+    return {"pageInfo": {"hasNextPage": start + size < len(names), "endCursor": str(start + size)},
+            "nodes": [node(n) for n in page]}
+
+
+def compare_page(base, head, size, cursor):
+    # Como compare de GitHub: commits de head que no son ancestros de base, del más viejo al más nuevo
+    names = by_date(ancestors(head) - ancestors(base), newest_first=False)
+    end = int(cursor) if cursor else len(names)
+    start = max(0, end - size)
+    return {"commits": {"pageInfo": {"hasPreviousPage": start > 0, "startCursor": str(start)},
+                        "nodes": [node(n) for n in names[start:end]]}}
+
+
+def tag_of(ref):
+    return TAGS.get(ref.rsplit("/", 1)[-1])
+
+
+class GraphqlStub(BaseHTTPRequestHandler):
+    wbufsize = 65536
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        query, v = body["query"], body["variables"]
+        if "refs(refPrefix" in query:
+            repository = {"refs": {"pageInfo": {"hasNextPage": False, "endCursor": None},
+                                   "nodes": [{"name": t, "target": {"oid": oid(n)}} for t, n in TAGS.items()]}}
+        elif "release(tagName" in query:
+            head = TAGS.get(v["tag"])
+            repository = {"release": {"description": "", "publishedAt": None} if head else None, "current": None}
+            if head:
+                target = {"oid": oid(head)}
+                if not v["hasBase"]:
+                    target["history"] = history_page(head, v["pageSize"], None)
+                repository["current"] = {"target": target}
+            if v["hasBase"]:
+                base = tag_of(v["previousRef"])
+                repository["previous"] = {"target": {"oid": oid(base)}, "compare": compare_page(base, head, v["pageSize"], None)}
+        elif "status" in query:
+            base, head = tag_of(v["baseRef"]), tag_of(v["headRef"])
+            if base == head:
+                status = "IDENTICAL"
+            elif base in ancestors(head):
+                status = "AHEAD"
+            else:
+                status = "BEHIND" if head in ancestors(base) else "DIVERGED"
+            repository = {"ref": {"compare": {"status": status}}}
+        elif "compare(headRef" in query:
+            base, head = tag_of(v["baseRef"]), tag_of(v["headRef"])
+            repository = {"ref": {"compare": compare_page(base, head, v["pageSize"], v["cursor"])} if base else None}
+        else:
+            head = next(n for n in COMMITS if oid(n) == v["oid"])
+            repository = {"object": {"history": history_page(head, v["pageSize"], v["cursor"])}}
+
+        payload = json.dumps({"data": {"repository": repository}}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), GraphqlStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(github_graphql, "GITHUB_GRAPHQL_URL", f"http://127.0.0.1:{server.server_port}/graphql")
+    monkeypatch.setattr(github_graphql, "HISTORY_PAGE_SIZE", 2)
+    monkeypatch.setattr(cache_utils, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(tag_index, "_indexes", {})
+    monkeypatch.setattr(range_analysis, "_stores", {})
+    github_graphql.stats["queries"] = 0
+    yield github_graphql.GraphqlBackend("token", "televisa-univision/client-web")
+    server.shutdown()
+
+
+def shas(commits):
+    return [sha[:2].rstrip("0") for sha, _ in commits]
+
+
+def test_range_keeps_merged_commits_older_than_base(backend):
+    current, previous_tag, previous = backend.resolve("v1.1.0", "v1.0.0")
+    assert previous_tag == "v1.0.0"
+    # f1 tiene fecha anterior a v1.0.0 pero entra por el merge, igual que con compare de REST
+    assert sorted(shas(backend.iter_commits(previous, current))) == sorted(["m6", "M", "m5", "f1"])
+
+
+def test_previous_tag_off_the_branch_is_bounded(backend):
+    # Por semver el anterior de v1.1.0 es v1.1.0-beta.1, que no es ancestro: rango desde el merge-base
+    current, previous_tag, previous = backend.resolve("v1.1.0")
+    assert previous_tag == "v1.1.0-beta.1"
+    assert sorted(shas(backend.iter_commits(previous, current))) == sorted(["m6", "M", "f1"])
+    # tags + release/compare (página 1) + página 2; el historial no se recorre
+    assert github_graphql.stats["queries"] == 3
+
+
+def test_range_is_newest_first_across_pages(backend):
+    current, _, previous = backend.resolve("v1.1.0", "v1.0.0")
+    assert shas(backend.iter_commits(previous, current)) == ["m6", "M", "m5", "f1"]
+    assert shas(backend.iter_commits(previous, current, limit=3)) == ["m6", "M", "m5"]
+
+
+def test_resolve_and_small_range_in_one_query(backend, monkeypatch):
+    backend.resolve("v1.1.0", "v1.0.0")
+    monkeypatch.setattr(github_graphql, "HISTORY_PAGE_SIZE", 100)
+    github_graphql.stats["queries"] = 0
+    current, _, previous = backend.resolve("v1.1.0", "v1.0.0")
+    list(backend.iter_commits(previous, current))
+    assert github_graphql.stats["queries"] == 1
+
+
+def test_without_previous_tag_walks_history_up_to_limit(backend):
+    current, previous_tag, previous = backend.resolve("v1.0.0")
+    assert previous_tag is None and previous is None
+    assert shas(backend.iter_commits(None, current, limit=3)) == ["m4", "m3", "m2"]
+
+
+def test_missing_release(backend):
+    with pytest.raises(ValueError, match="No existe un release"):
+        backend.resolve("v9.9.9")
+
+
+def test_release_body_matches_range(backend, monkeypatch):
+    monkeypatch.setenv("GITHUB_TOKEN", "token")
+    monkeypatch.setenv("REPO_GITHUB", "televisa-univision/client-web")
+    monkeypatch.setattr(release_utils, "GITHUB_BACKEND", "graphql")
+    body, tickets = release_utils.get_release_data("v1.1.0", base_tag="v1.0.0")
+    assert sorted(tickets) == ["CWB-10", "CWB-5", "CWB-6"]
+    assert body.index("[CWB-10]") < body.index("[CWB-6]")
+
+
+def test_prerelease_off_the_branch_is_not_reused(backend, monkeypatch):
+    # v1.0.0..v1.1.0-beta.1 queda guardado, pero b1 no es ancestro de v1.1.0: CWB-20 (solo
+    # de la beta) no puede entrar en las notas de la GA
+    monkeypatch.setenv("GITHUB_TOKEN", "token")
+    monkeypatch.setenv("REPO_GITHUB", "televisa-univision/client-web")
+    monkeypatch.setattr(release_utils, "GITHUB_BACKEND", "graphql")
+    _, beta_tickets = release_utils.get_release_data("v1.1.0-beta.1", base_tag="v1.0.0")
+    assert sorted(beta_tickets) == ["CWB-20", "CWB-5"]
+    _, tickets = release_utils.get_release_data("v1.1.0", base_tag="v1.0.0")
+    assert sorted(tickets) == ["CWB-10", "CWB-5", "CWB-6"]